@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Profiler de alocações das estruturas de dados.
+
+Tira snapshots do tracemalloc antes e depois da construção de uma estrutura e
+agrupa as alocações por linha de código; em paralelo, percorre a estrutura
+construída e agrupa os bytes por componente (nós, atributos de instância,
+listas e sua sobra pré-alocada). O relatório ranqueado mostra onde a memória
+de cada estrutura realmente vai e quais mudanças de representação compensam.
+"""
+
+import os
+import linecache
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+from tabulate import tabulate
+from models import DataGenerator, Record
+from metrics import build_structure, deep_sizeof_by_type
+
+
+# Alocações do próprio profiler e do tracemalloc não entram no relatório
+_IGNORED_FILES = [tracemalloc.__file__, __file__, linecache.__file__, "<frozen importlib._bootstrap>"]
+
+# Linhas com participação menor que esta fração do total são omitidas
+MIN_SHARE = 0.001
+
+
+@dataclass
+class AllocationProfile:
+    structure_name: str
+    data_size: int
+    total_bytes: int
+    by_line: List[Dict[str, Any]] = field(default_factory=list)
+    by_component: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'structure': self.structure_name,
+            'data_size': self.data_size,
+            'total_bytes': self.total_bytes,
+            'by_line': self.by_line,
+            'by_component': self.by_component
+        }
+
+
+def profile_build(name: str, factory: Callable[[], Any], data: List[Record],
+                  top: int = 10) -> AllocationProfile:
+    """Constrói a estrutura sob tracemalloc e ranqueia as alocações retidas."""
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start(1)
+    
+    before = tracemalloc.take_snapshot()
+    structure = build_structure(factory, data)
+    after = tracemalloc.take_snapshot()
+    
+    if not already_tracing:
+        tracemalloc.stop()
+    
+    # Filtra só depois dos dois snapshots: a compilação dos filtros também aloca
+    filters = [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES]
+    stats = [stat for stat in after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+             if stat.size_diff > 0]
+    total_bytes = sum(stat.size_diff for stat in stats)
+    
+    by_line = []
+    for stat in stats[:top]:
+        if stat.size_diff < MIN_SHARE * total_bytes:
+            break
+        frame = stat.traceback[0]
+        by_line.append({
+            'location': f"{os.path.basename(frame.filename)}:{frame.lineno}",
+            'code': linecache.getline(frame.filename, frame.lineno).strip(),
+            'bytes': stat.size_diff,
+            'blocks': stat.count_diff,
+            'bytes_per_record': stat.size_diff / len(data),
+            'share': stat.size_diff / total_bytes if total_bytes else 0.0
+        })
+    
+    components = deep_sizeof_by_type(structure, exclude=(Record,))
+    component_total = sum(group['bytes'] for group in components.values())
+    by_component = []
+    for component, group in sorted(components.items(), key=lambda item: -item[1]['bytes'])[:top]:
+        by_component.append({
+            'component': component,
+            'objects': group['count'],
+            'bytes': group['bytes'],
+            'bytes_per_record': group['bytes'] / len(data),
+            'share': group['bytes'] / component_total if component_total else 0.0
+        })
+    
+    return AllocationProfile(name, len(data), total_bytes, by_line, by_component)
+
+
+def print_allocation_profile(profile: AllocationProfile):
+    print(f"\n### {profile.structure_name} (N={profile.data_size}) — "
+          f"{profile.total_bytes / profile.data_size:.1f} bytes/registro retidos ###")
+    
+    print("\nPor componente:")
+    rows = [{
+        'Componente': c['component'],
+        'Objetos': c['objects'],
+        'Bytes': c['bytes'],
+        'B/registro': f"{c['bytes_per_record']:.1f}",
+        '%': f"{c['share'] * 100:.1f}"
+    } for c in profile.by_component]
+    print(tabulate(rows, headers='keys', tablefmt='grid'))
+    
+    print("\nPor linha de código:")
+    rows = [{
+        'Linha': line['location'],
+        'Código': line['code'][:50],
+        'Blocos': line['blocks'],
+        'B/registro': f"{line['bytes_per_record']:.1f}",
+        '%': f"{line['share'] * 100:.1f}"
+    } for line in profile.by_line]
+    print(tabulate(rows, headers='keys', tablefmt='grid'))
+
+
+def print_allocation_report(results):
+    """Imprime os perfis de alocação anexados aos resultados de inserção."""
+    profiles = [r.artifacts['allocations'] for r in results if 'allocations' in r.artifacts]
+    if not profiles:
+        return
+    
+    print("\n" + "=" * 80)
+    print(" PERFIL DE ALOCAÇÕES POR ESTRUTURA ".center(80))
+    print("=" * 80)
+    for profile in sorted(profiles, key=lambda p: -p.total_bytes / p.data_size):
+        print_allocation_profile(profile)
+
+
+def main():
+    from mixed_workloads import default_structures
+    
+    data = DataGenerator(use_realistic_data=False).generate_records(100000, seed=42)
+    profiles = [profile_build(name, factory, data) for name, factory in default_structures().items()]
+    for profile in sorted(profiles, key=lambda p: -p.total_bytes):
+        print_allocation_profile(profile)
+
+
+if __name__ == "__main__":
+    main()
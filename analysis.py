@@ -5,6 +5,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from typing import List, Dict, Any
 from experiments import ExperimentResult
+from baselines import BASELINES, BASELINE_FOR_STRUCTURE
 
 
 class ResultAnalyzer:
@@ -70,6 +71,87 @@ class ResultAnalyzer:
                         growth_rate = self._calculate_growth_rate(sizes, times)
                         print(f"    Taxa de crescimento observada: {growth_rate}")
     
+    def baseline_overhead_table(self) -> pd.DataFrame:
+        """Overhead (razão de tempo) de cada estrutura manual sobre os baselines nativos."""
+        baseline_times = {}
+        for result in self.results:
+            if result.structure_name in BASELINES:
+                key = (result.structure_name, result.data_size, result.operation)
+                baseline_times[key] = result.get_statistics().get('mean_time', 0)
+        
+        rows = []
+        for result in self.results:
+            if result.structure_name in BASELINES:
+                continue
+            mean_time = result.get_statistics().get('mean_time', 0)
+            params = {k: v for k, v in result.parameters.items()
+                      if k in ('M', 'hash_function', 'balanced')}
+            row = {
+                'Estrutura': result.structure_name,
+                'Parâmetros': ", ".join(f"{k}={v}" for k, v in params.items()) or "-",
+                'N': result.data_size,
+                'Operação': result.operation,
+                'Tempo Médio (s)': mean_time
+            }
+            for baseline in BASELINES:
+                base_time = baseline_times.get((baseline, result.data_size, result.operation))
+                row[f'× {baseline}'] = mean_time / base_time if base_time else np.nan
+            reference = BASELINE_FOR_STRUCTURE.get(result.structure_name)
+            row['Overhead (×)'] = row.get(f'× {reference}', np.nan)
+            rows.append(row)
+        
+        return pd.DataFrame(rows)
+    
+    def print_baseline_overhead(self):
+        df = self.baseline_overhead_table()
+        if df.empty or df['Overhead (×)'].isna().all():
+            return
+        
+        print("\nOverhead das Estruturas Manuais vs. Baselines Nativos:")
+        print("-" * 60)
+        print("(razão entre tempos médios; 'Overhead' usa o baseline que faz o mesmo trabalho:")
+        print(" lista nativa para Array, dict para Hash, lista ordenada com bisect para BST/AVL)")
+        
+        for operation in ['insert', 'search']:
+            op_df = df[df['Operação'] == operation]
+            if op_df.empty:
+                continue
+            print(f"\n### Operação: {operation.upper()} ###")
+            print(op_df.to_string(index=False, float_format=lambda v: f"{v:.3g}"))
+    
+    def counting_overhead_table(self) -> pd.DataFrame:
+        """Tempos instrumentado vs. modo rápido (sem contagem de iterações)."""
+        rows = []
+        for result in self.results:
+            if 'avg_fast_execution_time' not in result.metrics:
+                continue
+            params = {k: v for k, v in result.parameters.items() if k in ('M', 'hash_function')}
+            rows.append({
+                'Estrutura': result.structure_name,
+                'Parâmetros': ", ".join(f"{k}={v}" for k, v in params.items()) or "-",
+                'N': result.data_size,
+                'Operação': result.operation,
+                'Instrumentado (s)': result.metrics['avg_execution_time'],
+                'Rápido (s)': result.metrics['avg_fast_execution_time'],
+                # Ausente quando a execução teve profiler ou linha do tempo de memória
+                'Custo da Contagem (%)': result.metrics.get('avg_counting_overhead', np.nan) * 100
+            })
+        return pd.DataFrame(rows)
+    
+    def print_counting_overhead(self):
+        df = self.counting_overhead_table()
+        if df.empty:
+            return
+        
+        print("\nCusto da Contagem de Iterações (instrumentado vs. modo rápido):")
+        print("-" * 60)
+        for operation in ['insert', 'search']:
+            op_df = df[df['Operação'] == operation]
+            if op_df.empty:
+                continue
+            print(f"\n### Operação: {operation.upper()} ###")
+            print(op_df.to_string(index=False, float_format=lambda v: f"{v:.3g}"))
+    
     def _calculate_growth_rate(self, sizes, times):
         if len(sizes) < 2:
             return "N/A"
@@ -11,10 +11,18 @@ class AVLNode:
 
 
 class AVLTree:
-    def __init__(self):
+    def __init__(self, fast: bool = False):
+        """
+        Args:
+            fast: Modo rápido, sem contagem de iterações (retorna sempre 0)
+        """
         self.root: Optional[AVLNode] = None
         self.iterations = 0
         self.size_count = 0
+        self.fast = fast
+        if fast:
+            self.insert = self._insert_fast
+            self.search = self._search_fast
     
     def insert(self, record: Record) -> int:
         self.iterations = 0
@@ -81,6 +89,22 @@ class AVLTree:
         
         return y
     
+    def _rotate_left_fast(self, z: AVLNode) -> AVLNode:
+        y = z.right
+        T2 = y.left
+        
+        # Realiza rotação
+        y.left = z
+        z.right = T2
+        
+        # Atualiza alturas
+        z.height = 1 + max(self._get_height(z.left), 
+                          self._get_height(z.right))
+        y.height = 1 + max(self._get_height(y.left), 
+                          self._get_height(y.right))
+        
+        return y
+    
     def _rotate_right(self, z: AVLNode) -> AVLNode:
         self.iterations += 1
         y = z.left
@@ -98,6 +122,22 @@ class AVLTree:
         
         return y
     
+    def _rotate_right_fast(self, z: AVLNode) -> AVLNode:
+        y = z.left
+        T3 = y.right
+        
+        # Realiza rotação
+        y.right = z
+        z.left = T3
+        
+        # Atualiza alturas
+        z.height = 1 + max(self._get_height(z.left), 
+                          self._get_height(z.right))
+        y.height = 1 + max(self._get_height(y.left), 
+                          self._get_height(y.right))
+        
+        return y
+    
     def _get_height(self, node: Optional[AVLNode]) -> int:
         if node is None:
             return 0
@@ -125,6 +165,53 @@ class AVLTree:
         else:
             return self._search_recursive(node.right, matricula)
     
+    # Caminhos rápidos: mesma recursão, sem escrita de self.iterations por nível
+    def _insert_fast(self, record: Record) -> int:
+        self.root = self._insert_recursive_fast(self.root, record)
+        self.size_count += 1
+        return 0
+    
+    def _insert_recursive_fast(self, node: Optional[AVLNode], record: Record) -> AVLNode:
+        if node is None:
+            return AVLNode(record)
+        
+        if record.matricula < node.record.matricula:
+            node.left = self._insert_recursive_fast(node.left, record)
+        elif record.matricula > node.record.matricula:
+            node.right = self._insert_recursive_fast(node.right, record)
+        else:
+            return node  # Duplicata não permitida
+        
+        node.height = 1 + max(self._get_height(node.left), 
+                             self._get_height(node.right))
+        balance = self._get_balance(node)
+        
+        if balance > 1 and record.matricula < node.left.record.matricula:
+            return self._rotate_right_fast(node)
+        if balance < -1 and record.matricula > node.right.record.matricula:
+            return self._rotate_left_fast(node)
+        if balance > 1 and record.matricula > node.left.record.matricula:
+            node.left = self._rotate_left_fast(node.left)
+            return self._rotate_right_fast(node)
+        if balance < -1 and record.matricula < node.right.record.matricula:
+            node.right = self._rotate_right_fast(node.right)
+            return self._rotate_left_fast(node)
+        
+        return node
+    
+    def _search_fast(self, matricula: int) -> tuple[Optional[Record], int]:
+        return self._search_recursive_fast(self.root, matricula), 0
+    
+    def _search_recursive_fast(self, node: Optional[AVLNode], matricula: int) -> Optional[Record]:
+        if node is None:
+            return None
+        if matricula == node.record.matricula:
+            return node.record
+        elif matricula < node.record.matricula:
+            return self._search_recursive_fast(node.left, matricula)
+        else:
+            return self._search_recursive_fast(node.right, matricula)
+    
     def size(self) -> int:
         return self.size_count
     
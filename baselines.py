@@ -0,0 +1,174 @@
+import bisect
+import math
+import numpy as np
+from typing import Callable, Dict, List, Optional
+from models import Record
+
+
+class DictBaseline:
+    """Baseline com dict nativo indexado por matrícula (tabela hash em C)."""
+
+    def __init__(self):
+        self.data: Dict[int, Record] = {}
+        self.iterations = 0
+
+    def insert(self, record: Record) -> int:
+        self.iterations = 1
+        self.data.setdefault(record.matricula, record)
+        return self.iterations
+
+    def search(self, matricula: int) -> tuple[Optional[Record], int]:
+        self.iterations = 1
+        return self.data.get(matricula), self.iterations
+
+    def size(self) -> int:
+        return len(self.data)
+
+    def clear(self):
+        self.data.clear()
+        self.iterations = 0
+
+
+class PlainListBaseline:
+    """Baseline com lista nativa: ``append`` e busca sequencial com ``list.index`` (em C).
+
+    Faz o mesmo trabalho do LinearArray (sem checar duplicatas na inserção); as
+    iterações da busca são as comparações da varredura, como no LinearArray.
+    """
+
+    def __init__(self):
+        self.keys: List[int] = []
+        self.records: List[Record] = []
+        self.iterations = 0
+
+    def insert(self, record: Record) -> int:
+        self.iterations = 1
+        self.keys.append(record.matricula)
+        self.records.append(record)
+        return self.iterations
+
+    def search(self, matricula: int) -> tuple[Optional[Record], int]:
+        try:
+            index = self.keys.index(matricula)
+        except ValueError:
+            self.iterations = len(self.keys)
+            return None, self.iterations
+        self.iterations = index + 1
+        return self.records[index], self.iterations
+
+    def size(self) -> int:
+        return len(self.keys)
+
+    def clear(self):
+        self.keys.clear()
+        self.records.clear()
+        self.iterations = 0
+
+
+class BisectListBaseline:
+    """Baseline com listas ordenadas mantidas via ``bisect`` + ``list.insert``.
+
+    As iterações reportadas são o número teórico de comparações da busca
+    binária, já que o ``bisect`` roda em C e não expõe a contagem.
+    """
+
+    def __init__(self):
+        self.keys: List[int] = []
+        self.records: List[Record] = []
+        self.iterations = 0
+
+    def insert(self, record: Record) -> int:
+        index = bisect.bisect_left(self.keys, record.matricula)
+        self.iterations = max(1, math.ceil(math.log2(len(self.keys) + 1)))
+        if index < len(self.keys) and self.keys[index] == record.matricula:
+            return self.iterations  # Já existe, não insere
+        self.keys.insert(index, record.matricula)
+        self.records.insert(index, record)
+        return self.iterations
+
+    def search(self, matricula: int) -> tuple[Optional[Record], int]:
+        index = bisect.bisect_left(self.keys, matricula)
+        self.iterations = max(1, math.ceil(math.log2(len(self.keys) + 1)))
+        if index < len(self.keys) and self.keys[index] == matricula:
+            return self.records[index], self.iterations
+        return None, self.iterations
+
+    def size(self) -> int:
+        return len(self.keys)
+
+    def clear(self):
+        self.keys.clear()
+        self.records.clear()
+        self.iterations = 0
+
+
+class SortedNumpyBaseline:
+    """Baseline com array NumPy ordenado e ``np.searchsorted``.
+
+    Inserções são acumuladas e o array é ordenado uma única vez em ``finalize``,
+    chamado ao fim da construção, que é como um array ordenado seria construído
+    em lote na prática.
+    """
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.records: List[Record] = []
+        self._pending: List[Record] = []
+        self.iterations = 0
+
+    def insert(self, record: Record) -> int:
+        self.iterations = 1
+        self._pending.append(record)
+        return self.iterations
+
+    def finalize(self):
+        """Ordena as inserções pendentes (fim da fase de construção)."""
+        if self._pending:
+            self._merge_pending()
+
+    def _merge_pending(self):
+        records = self.records + self._pending
+        keys = np.fromiter((r.matricula for r in records), dtype=np.int64, count=len(records))
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+
+        # Descarta duplicatas, mantendo a primeira inserção
+        unique = np.ones(len(keys), dtype=bool)
+        unique[1:] = keys[1:] != keys[:-1]
+        self.keys = keys[unique]
+        self.records = [records[i] for i in order[unique]]
+        self._pending = []
+
+    def search(self, matricula: int) -> tuple[Optional[Record], int]:
+        # Inserções sem ``finalize`` ainda não são encontradas
+        index = int(np.searchsorted(self.keys, matricula))
+        self.iterations = max(1, math.ceil(math.log2(len(self.keys) + 1)))
+        if index < len(self.keys) and self.keys[index] == matricula:
+            return self.records[index], self.iterations
+        return None, self.iterations
+
+    def size(self) -> int:
+        self.finalize()
+        return len(self.keys)
+
+    def clear(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.records = []
+        self._pending = []
+        self.iterations = 0
+
+
+# Baselines nativos e a estrutura manual que cada um substitui diretamente
+BASELINES: Dict[str, Callable[[], object]] = {
+    'PlainList': PlainListBaseline,
+    'DictBaseline': DictBaseline,
+    'BisectList': BisectListBaseline,
+    'SortedNumpy': SortedNumpyBaseline,
+}
+
+BASELINE_FOR_STRUCTURE = {
+    'LinearArray': 'PlainList',
+    'HashTable': 'DictBaseline',
+    'BST': 'BisectList',
+    'AVL': 'BisectList',
+}
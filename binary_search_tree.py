@@ -10,10 +10,18 @@ class BSTNode:
 
 
 class BinarySearchTree:
-    def __init__(self):
+    def __init__(self, fast: bool = False):
+        """
+        Args:
+            fast: Modo rápido, sem contagem de iterações (retorna sempre 0)
+        """
         self.root: Optional[BSTNode] = None
         self.iterations = 0
         self.size_count = 0
+        self.fast = fast
+        if fast:
+            self.insert = self._insert_fast
+            self.search = self._search_fast
     
     def insert(self, record: Record) -> int:
         self.iterations = 0
@@ -58,6 +66,40 @@ class BinarySearchTree:
         else:
             return self._search_recursive(node.right, matricula)
     
+    # Caminhos rápidos: mesma recursão, sem escrita de self.iterations por nível
+    def _insert_fast(self, record: Record) -> int:
+        if self.root is None:
+            self.root = BSTNode(record)
+        else:
+            self._insert_recursive_fast(self.root, record)
+        self.size_count += 1
+        return 0
+    
+    def _insert_recursive_fast(self, node: BSTNode, record: Record):
+        if record.matricula < node.record.matricula:
+            if node.left is None:
+                node.left = BSTNode(record)
+            else:
+                self._insert_recursive_fast(node.left, record)
+        elif record.matricula > node.record.matricula:
+            if node.right is None:
+                node.right = BSTNode(record)
+            else:
+                self._insert_recursive_fast(node.right, record)
+    
+    def _search_fast(self, matricula: int) -> tuple[Optional[Record], int]:
+        return self._search_recursive_fast(self.root, matricula), 0
+    
+    def _search_recursive_fast(self, node: Optional[BSTNode], matricula: int) -> Optional[Record]:
+        if node is None:
+            return None
+        if matricula == node.record.matricula:
+            return node.record
+        elif matricula < node.record.matricula:
+            return self._search_recursive_fast(node.left, matricula)
+        else:
+            return self._search_recursive_fast(node.right, matricula)
+    
     def size(self) -> int:
         return self.size_count
     
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Benchmark cruzado entre a implementação Python (experiments.py) e a versão C++
+(trabalho_completo.cpp).
+
+1. Exporta um dataset compartilhado (registros + chaves de busca) em CSV, para
+   que as duas implementações consumam exatamente os mesmos bytes de entrada;
+2. Compila (via Makefile) e executa o binário C++ sobre esse dataset;
+3. Executa o ExperimentRunner Python sobre o mesmo dataset;
+4. Junta os dois CSVs em tabelas de speedup por estrutura e valida que as
+   contagens de iterações são idênticas.
+
+Com o dataset compartilhado, BST e AVL inserem na ordem do arquivo (sem
+embaralhar) em ambas as implementações, o que torna as iterações determinísticas.
+"""
+
+import os
+import sys
+import csv
+import subprocess
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from tabulate import tabulate
+from models import DataGenerator, Record
+from experiments import ExperimentRunner, ExperimentResult
+from workloads import SearchWorkload
+
+
+MERGE_KEYS = ['structure', 'data_size', 'operation', 'hash_table_size', 'hash_function']
+
+
+def dataset_path(directory: str, size: int) -> str:
+    return os.path.join(directory, f"dataset_{size}.csv")
+
+
+def search_keys_path(directory: str, size: int) -> str:
+    return os.path.join(directory, f"search_keys_{size}.csv")
+
+
+def export_shared_dataset(sizes: List[int], directory: str = "shared_dataset",
+                          num_searches: int = 1000, workload: SearchWorkload = None,
+                          seed: int = 42):
+    """Exporta ``dataset_<N>.csv`` e ``search_keys_<N>.csv`` para cada tamanho."""
+    os.makedirs(directory, exist_ok=True)
+    generator = DataGenerator(use_realistic_data=False)
+    workload = workload or SearchWorkload(seed=seed)
+
+    for size in sizes:
+        records = generator.generate_records(size, seed=seed)
+
+        # O leitor C++ separa campos por vírgula sem suporte a aspas
+        with open(dataset_path(directory, size), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(['matricula', 'nome', 'salario', 'codigo_setor'])
+            for r in records:
+                writer.writerow([r.matricula, r.nome.replace(',', ' '), f"{r.salario:.2f}", r.codigo_setor])
+
+        keys = workload.generate_keys(records, min(num_searches, size))
+        with open(search_keys_path(directory, size), 'w', newline='', encoding='utf-8') as f:
+            f.write("matricula\n")
+            f.writelines(f"{key}\n" for key in keys)
+
+    print(f"Dataset compartilhado exportado em: {directory}/")
+
+
+class SharedDatasetGenerator(DataGenerator):
+    """DataGenerator que lê os registros do dataset compartilhado."""
+
+    def __init__(self, directory: str):
+        super().__init__(use_realistic_data=False)
+        self.directory = directory
+
+    def generate_records(self, n: int, seed: Optional[int] = None) -> List[Record]:
+        records = []
+        with open(dataset_path(self.directory, n), newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                records.append(Record(int(row['matricula']), row['nome'],
+                                      float(row['salario']), int(row['codigo_setor'])))
+        print(f"Carregados {len(records)} registros de {dataset_path(self.directory, n)}")
+        return records
+
+
+class SharedKeysWorkload(SearchWorkload):
+    """Workload que devolve as chaves de busca exportadas para cada tamanho."""
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+
+    def describe(self) -> Dict[str, object]:
+        return {'workload': 'shared_file', 'miss_ratio': self.miss_ratio}
+
+    def generate_keys(self, data, n: int) -> List[int]:
+        with open(search_keys_path(self.directory, len(data)), encoding='utf-8') as f:
+            next(f)  # Cabeçalho
+            return [int(line) for line in f if line.strip()]
+
+
+def build_cpp(binary: str = "trabalho_completo"):
+    """Compila o binário C++ usando o Makefile do projeto."""
+    print("Compilando versão C++...")
+    subprocess.run(['make', f'TARGET={binary}'], check=True)
+
+
+def run_cpp(sizes: List[int], directory: str, num_rounds: int,
+            binary: str = "trabalho_completo",
+            output: str = "cpp_experiment_results.csv",
+            details: str = "cpp_experiment_details.csv") -> pd.DataFrame:
+    """Executa o binário C++ sobre o dataset compartilhado e lê seu CSV de resumo."""
+    print("Executando versão C++...")
+    binary_path = binary if os.path.dirname(binary) else os.path.join('.', binary)
+    subprocess.run([binary_path,
+                    '--dataset-dir', directory,
+                    '--sizes', ','.join(str(s) for s in sizes),
+                    '--rounds', str(num_rounds),
+                    '--output', output,
+                    '--details', details],
+                   check=True, stdout=subprocess.DEVNULL)
+
+    df = pd.read_csv(output)
+
+    # O C++ reporta o tempo e as iterações totais da fase de busca; normaliza por busca
+    df['mean_iterations'] = df['mean_iterations'].astype(float)
+    for size in sizes:
+        with open(search_keys_path(directory, size), encoding='utf-8') as f:
+            num_keys = sum(1 for line in f) - 1
+        mask = (df['operation'] == 'search') & (df['data_size'] == size)
+        df.loc[mask, 'mean_time'] = df.loc[mask, 'mean_time'] / num_keys
+        df.loc[mask, 'mean_iterations'] = df.loc[mask, 'mean_iterations'] / num_keys
+
+    return df
+
+
+def run_python(sizes: List[int], directory: str, num_rounds: int) -> List[ExperimentResult]:
+    """Executa o ExperimentRunner Python sobre o dataset compartilhado."""
+    print("Executando versão Python...")
+    runner = ExperimentRunner(
+        data_sizes=sizes,
+        num_rounds=num_rounds,
+        data_generator=SharedDatasetGenerator(directory),
+        workload=SharedKeysWorkload(directory),
+        include_baselines=False,
+        shuffle_tree_inserts=False,
+        measure_fast=False
+    )
+    return runner.run_all_experiments()
+
+
+def python_results_to_dataframe(results: List[ExperimentResult]) -> pd.DataFrame:
+    rows = []
+    for result in results:
+        stats = result.get_statistics()
+        rows.append({
+            'structure': result.structure_name,
+            'data_size': result.data_size,
+            'operation': result.operation,
+            'mean_time': stats.get('mean_time', 0.0),
+            'mean_iterations': stats.get('mean_iterations', 0.0),
+            'hash_table_size': result.parameters.get('M'),
+            'hash_function': result.parameters.get('hash_function')
+        })
+    return pd.DataFrame(rows)
+
+
+# Tolerância relativa na comparação das médias de iterações: os totais são
+# inteiros idênticos e as médias só diferem por arredondamento de ponto flutuante
+ITERATIONS_RTOL = 1e-9
+
+
+def merge_results(py_df: pd.DataFrame, cpp_df: pd.DataFrame) -> pd.DataFrame:
+    """Junta os resultados, calcula speedup e valida as iterações.
+
+    Inserção compara o total de iterações da rodada; busca compara a média por
+    chave (total / número de chaves) dos dois lados, com ``ITERATIONS_RTOL``.
+    """
+    py_df = py_df.copy()
+    cpp_df = cpp_df[MERGE_KEYS + ['mean_time', 'mean_iterations']].copy()
+
+    for df in (py_df, cpp_df):
+        df['hash_table_size'] = df['hash_table_size'].fillna(0).astype(int)
+        df['hash_function'] = df['hash_function'].fillna('-')
+
+    merged = py_df.merge(cpp_df, on=MERGE_KEYS, suffixes=('_py', '_cpp'))
+    merged['speedup_cpp'] = merged['mean_time_py'] / merged['mean_time_cpp'].replace(0, np.nan)
+
+    merged['iterations_match'] = np.isclose(merged['mean_iterations_py'],
+                                            merged['mean_iterations_cpp'],
+                                            rtol=ITERATIONS_RTOL, atol=0.0)
+    return merged
+
+
+def print_speedup_tables(merged: pd.DataFrame):
+    for operation in ['insert', 'search']:
+        op_df = merged[merged['operation'] == operation]
+        if op_df.empty:
+            continue
+        print(f"\n### Speedup C++ vs Python — {operation.upper()} ###")
+        rows = []
+        for _, row in op_df.iterrows():
+            params = "-" if row['hash_function'] == '-' else f"M={row['hash_table_size']}, {row['hash_function']}"
+            rows.append({
+                'Estrutura': row['structure'],
+                'Parâmetros': params,
+                'N': row['data_size'],
+                'Python (s)': f"{row['mean_time_py']:.3e}",
+                'C++ (s)': f"{row['mean_time_cpp']:.3e}",
+                'Speedup': f"{row['speedup_cpp']:.1f}x",
+                'Iterações Py': f"{row['mean_iterations_py']:.1f}",
+                'Iterações C++': f"{row['mean_iterations_cpp']:.1f}",
+                'Iguais': "sim" if row['iterations_match'] else "NÃO"
+            })
+        print(tabulate(rows, headers='keys', tablefmt='grid'))
+
+    mismatches = merged[~merged['iterations_match']]
+    if mismatches.empty:
+        print("\n✓ Contagens de iterações idênticas entre Python e C++")
+    else:
+        print(f"\n✗ {len(mismatches)} combinações com contagens de iterações divergentes")
+
+
+def main():
+    sizes = [1000, 5000, 10000]
+    num_rounds = 3
+    directory = "shared_dataset"
+
+    export_shared_dataset(sizes, directory)
+    build_cpp()
+    cpp_df = run_cpp(sizes, directory, num_rounds)
+    py_df = python_results_to_dataframe(run_python(sizes, directory, num_rounds))
+
+    merged = merge_results(py_df, cpp_df)
+    merged.to_csv("cross_impl_results.csv", index=False)
+    print_speedup_tables(merged)
+    print("\nResultados combinados salvos em: cross_impl_results.csv")
+
+    if not merged['iterations_match'].all():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
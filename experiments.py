@@ -1,15 +1,24 @@
+import os
 import time
 import random
 import json
+from contextlib import contextmanager, nullcontext
 import numpy as np
-from typing import Dict, List, Any
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass, field
 from models import DataGenerator, Record
 from linear_array import LinearArray
 from binary_search_tree import BinarySearchTree
 from avl_tree import AVLTree
 from hash_table import HashTable
-from metrics import MetricsCollector, PerformanceMetrics
+from metrics import (MetricsCollector, PerformanceMetrics, MemoryTimeline, MemoryTimelineSampler,
+                     build_structure, deep_sizeof, traced_build_peak)
+from workloads import SearchWorkload
+from baselines import BASELINES
+from allocation_profiler import profile_build
+from sampling_profiler import SamplingProfiler
+from metrics_registry import MetricsRegistry, publish_results, published_structure
+from tracing import TRACER, traced
 
 
 @dataclass
@@ -20,6 +29,8 @@ class ExperimentResult:
     metrics: Dict[str, float]
     rounds: List[Dict[str, float]]
     parameters: Dict[str, Any]
+    # Saídas de diagnóstico opcionais (ex.: perfil de alocações)
+    artifacts: Dict[str, Any] = field(default_factory=dict)
     
     def get_statistics(self) -> Dict[str, float]:
         if not self.rounds:
@@ -39,11 +50,46 @@ class ExperimentResult:
         }
 
 
+def _artifact_to_json(artifact: Any) -> Any:
+    if hasattr(artifact, 'to_dict'):
+        return artifact.to_dict()
+    if isinstance(artifact, list):
+        return [_artifact_to_json(item) for item in artifact]
+    return artifact
+
+
 class ExperimentRunner:
-    def __init__(self, data_sizes: List[int] = None, num_rounds: int = 5, data_generator: DataGenerator = None):
+    def __init__(self, data_sizes: List[int] = None, num_rounds: int = 5, data_generator: DataGenerator = None,
+                 workload: SearchWorkload = None, num_searches: int = 1000,
+                 include_baselines: bool = True, shuffle_tree_inserts: bool = True,
+                 measure_fast: bool = True, measure_memory: bool = True,
+                 profile_allocations: bool = False, sampling_profile_dir: Optional[str] = None,
+                 sampling_interval: float = 0.001, metrics_registry: Optional[MetricsRegistry] = None,
+                 memory_timeline_interval: Optional[float] = None):
         self.data_sizes = data_sizes or [10000, 50000, 100000]
         self.num_rounds = num_rounds
         self.data_generator = data_generator or DataGenerator(use_realistic_data=False)
+        self.workload = workload or SearchWorkload()
+        self.num_searches = num_searches
+        self.include_baselines = include_baselines
+        self.shuffle_tree_inserts = shuffle_tree_inserts
+        # Repete cada rodada com a estrutura em modo rápido (sem contagem de iterações)
+        self.measure_fast = measure_fast
+        # Memória profunda da estrutura e pico do tracemalloc na construção
+        self.measure_memory = measure_memory
+        # Perfil de alocações por linha/componente anexado ao resultado de inserção
+        self.profile_allocations = profile_allocations
+        # Profiler por amostragem: um arquivo .folded por célula (estrutura, N, operação)
+        self.sampling_profile_dir = sampling_profile_dir
+        self.sampling_interval = sampling_interval
+        self._cell_profilers: Dict[str, SamplingProfiler] = {}
+        # Linha do tempo de RSS/tracemalloc em cada região medida (None = desligado).
+        # O tracemalloc ligado deixa os tempos dessas execuções mais altos
+        self.memory_timeline_interval = memory_timeline_interval
+        self._cell_timelines: Dict[str, List[MemoryTimeline]] = {}
+        # Cada célula concluída é publicada no registro (acompanhamento de execuções longas):
+        # médias da célula e contadores/histogramas de uma instância publicada
+        self.metrics_registry = metrics_registry
         self.collector = MetricsCollector()
         self.results: List[ExperimentResult] = []
     
@@ -53,27 +99,86 @@ class ExperimentRunner:
         print("=" * 60)
         
         for size in self.data_sizes:
-            print(f"\n--- Tamanho do Dataset: {size} registros ---")
+            with TRACER.span('dataset', N=size):
+                print(f"\n--- Tamanho do Dataset: {size} registros ---")
+            
+                # Gera dados para este tamanho usando o gerador configurado
+                data = self.data_generator.generate_records(size, seed=42)
             
-            # Gera dados para este tamanho usando o gerador configurado
-            data = self.data_generator.generate_records(size, seed=42)
+                # Experimentos com Array Linear
+                self._run_profiled(self._run_linear_array_experiment, data, size)
             
-            # Experimentos com Array Linear
-            self._run_linear_array_experiment(data, size)
+                # Experimentos com BST
+                self._run_profiled(self._run_bst_experiment, data, size)
             
-            # Experimentos com BST
-            self._run_bst_experiment(data, size)
+                # Experimentos com AVL
+                self._run_profiled(self._run_avl_experiment, data, size)
             
-            # Experimentos com AVL
-            self._run_avl_experiment(data, size)
+                # Experimentos com Hash Table (diferentes M e funções)
+                for m_size in [100, 1000, 5000]:
+                    for hash_func in ['division', 'multiplication', 'folding']:
+                        self._run_profiled(self._run_hash_table_experiment, data, size, m_size, hash_func)
             
-            # Experimentos com Hash Table (diferentes M e funções)
-            for m_size in [100, 1000, 5000]:
-                for hash_func in ['division', 'multiplication', 'folding']:
-                    self._run_hash_table_experiment(data, size, m_size, hash_func)
+                # Baselines nativos (dict, lista com bisect, array NumPy ordenado)
+                if self.include_baselines:
+                    for name, factory in BASELINES.items():
+                        self._run_profiled(self._run_baseline_experiment, data, size, name, factory)
         
         return self.results
     
+    def _run_profiled(self, experiment, *args):
+        """Executa um experimento, anexa pilhas amostradas e linhas do tempo de memória
+        e publica os resultados gerados."""
+        first_result = len(self.results)
+        self._cell_profilers = {}
+        self._cell_timelines = {}
+        # args = (data, size, parâmetros...); fábricas dos baselines ficam fora do nome do span
+        labels = [str(arg) for arg in args[2:] if not callable(arg)]
+        with TRACER.span(" ".join([experiment.__name__[len('_run_'):-len('_experiment')], *labels]),
+                         N=args[1]):
+            experiment(*args)
+        
+        for result in self.results[first_result:]:
+            timelines = self._cell_timelines.get(result.operation)
+            if timelines:
+                result.artifacts['memory_timeline'] = timelines
+            
+            profiler = self._cell_profilers.get(result.operation)
+            if profiler is None or profiler.total_samples == 0:
+                continue
+            params = [str(v) for k, v in result.parameters.items() if k in ('M', 'hash_function')]
+            filename = os.path.join(self.sampling_profile_dir, "_".join(
+                [result.structure_name, *params, result.operation, f"N{result.data_size}"]) + ".folded")
+            profiler.write_folded(filename)
+            result.artifacts['folded_stacks'] = filename
+            result.artifacts['top_functions'] = profiler.top_functions(10)
+        self._cell_profilers = {}
+        self._cell_timelines = {}
+        
+        if self.metrics_registry is not None:
+            publish_results(self.results[first_result:], self.metrics_registry)
+    
+    @contextmanager
+    def _measured_region(self, operation: str, fast: bool = False):
+        """Contexto da região medida de ``operation`` numa rodada.
+        
+        Abre um span no trace e, se configurado, amostra a pilha e a memória da região.
+        A passada rápida (``fast=True``) roda sob os mesmos amostradores, descartando
+        o que eles coletam, para que ``counting_overhead`` compare execuções com o
+        mesmo custo de amostragem.
+        """
+        profiler = nullcontext()
+        if self.sampling_profile_dir:
+            profiler = (SamplingProfiler(self.sampling_interval) if fast else
+                        self._cell_profilers.setdefault(operation, SamplingProfiler(self.sampling_interval)))
+        timeline = nullcontext()
+        if self.memory_timeline_interval:
+            timeline = MemoryTimelineSampler(self.memory_timeline_interval)
+            if not fast:
+                self._cell_timelines.setdefault(operation, []).append(timeline.timeline)
+        with TRACER.span(f"{operation}:fast" if fast else operation, cat='round'), timeline, profiler:
+            yield
+    
     def _run_linear_array_experiment(self, data: List[Record], size: int):
         print(f"  Array Linear...")
         
@@ -83,37 +188,26 @@ class ExperimentRunner:
         for round_num in range(self.num_rounds):
             # Inserção
             array = LinearArray()
-            start_time = time.perf_counter()
-            total_iterations = 0
+            with self._measured_region('insert'):
+                start_time = time.perf_counter()
+                total_iterations = 0
             
-            for record in data:
-                iterations = array.insert(record)
-                total_iterations += iterations
+                for record in data:
+                    iterations = array.insert(record)
+                    total_iterations += iterations
             
-            insert_time = time.perf_counter() - start_time
+                insert_time = time.perf_counter() - start_time
             
             insert_rounds.append({
                 'execution_time': insert_time,
                 'memory_usage': 0,  # Simplificado
                 'iterations': total_iterations
             })
+            self._add_memory_metrics(insert_rounds, array, LinearArray, data)
+            fast_array = self._run_fast_insert(lambda: LinearArray(fast=True), data, insert_rounds[-1])
             
-            # Busca (amostra aleatória)
-            search_sample = random.sample(data, min(1000, len(data)))
-            start_time = time.perf_counter()
-            total_iterations = 0
-            
-            for record in search_sample:
-                _, iterations = array.search(record.matricula)
-                total_iterations += iterations
-            
-            search_time = time.perf_counter() - start_time
-            
-            search_rounds.append({
-                'execution_time': search_time / len(search_sample),
-                'memory_usage': 0,
-                'iterations': total_iterations / len(search_sample)
-            })
+            # Busca (chaves geradas pelo workload configurado)
+            search_rounds.append(self._run_search_round(array, data, fast_array))
         
         # Registra resultados
         self.results.append(ExperimentResult(
@@ -122,7 +216,8 @@ class ExperimentRunner:
             operation="insert",
             metrics=self._calculate_avg_metrics(insert_rounds),
             rounds=insert_rounds,
-            parameters={}
+            parameters={},
+            artifacts=self._allocation_artifacts("LinearArray", LinearArray, data)
         ))
         
         self.results.append(ExperimentResult(
@@ -131,8 +226,9 @@ class ExperimentRunner:
             operation="search",
             metrics=self._calculate_avg_metrics(search_rounds),
             rounds=search_rounds,
-            parameters={}
+            parameters=self.workload.describe()
         ))
+        self._publish_structure("LinearArray", LinearArray, data)
     
     def _run_bst_experiment(self, data: List[Record], size: int):
         print(f"  BST...")
@@ -143,18 +239,20 @@ class ExperimentRunner:
         for round_num in range(self.num_rounds):
             # Embaralha dados para diferentes ordens de inserção
             shuffled_data = data.copy()
-            random.shuffle(shuffled_data)
+            if self.shuffle_tree_inserts:
+                random.shuffle(shuffled_data)
             
             # Inserção
             bst = BinarySearchTree()
-            start_time = time.perf_counter()
-            total_iterations = 0
+            with self._measured_region('insert'):
+                start_time = time.perf_counter()
+                total_iterations = 0
             
-            for record in shuffled_data:
-                iterations = bst.insert(record)
-                total_iterations += iterations
+                for record in shuffled_data:
+                    iterations = bst.insert(record)
+                    total_iterations += iterations
             
-            insert_time = time.perf_counter() - start_time
+                insert_time = time.perf_counter() - start_time
             height = bst.height()
             
             insert_rounds.append({
@@ -163,23 +261,11 @@ class ExperimentRunner:
                 'iterations': total_iterations,
                 'height': height
             })
+            self._add_memory_metrics(insert_rounds, bst, BinarySearchTree, shuffled_data)
+            fast_bst = self._run_fast_insert(lambda: BinarySearchTree(fast=True), shuffled_data, insert_rounds[-1])
             
-            # Busca
-            search_sample = random.sample(data, min(1000, len(data)))
-            start_time = time.perf_counter()
-            total_iterations = 0
-            
-            for record in search_sample:
-                _, iterations = bst.search(record.matricula)
-                total_iterations += iterations
-            
-            search_time = time.perf_counter() - start_time
-            
-            search_rounds.append({
-                'execution_time': search_time / len(search_sample),
-                'memory_usage': 0,
-                'iterations': total_iterations / len(search_sample)
-            })
+            # Busca (chaves geradas pelo workload configurado)
+            search_rounds.append(self._run_search_round(bst, data, fast_bst))
         
         self.results.append(ExperimentResult(
             structure_name="BST",
@@ -187,7 +273,8 @@ class ExperimentRunner:
             operation="insert",
             metrics=self._calculate_avg_metrics(insert_rounds),
             rounds=insert_rounds,
-            parameters={'balanced': False}
+            parameters={'balanced': False},
+            artifacts=self._allocation_artifacts("BST", BinarySearchTree, shuffled_data)
         ))
         
         self.results.append(ExperimentResult(
@@ -196,8 +283,9 @@ class ExperimentRunner:
             operation="search",
             metrics=self._calculate_avg_metrics(search_rounds),
             rounds=search_rounds,
-            parameters={'balanced': False}
+            parameters={'balanced': False, **self.workload.describe()}
         ))
+        self._publish_structure("BST", BinarySearchTree, shuffled_data)
     
     def _run_avl_experiment(self, data: List[Record], size: int):
         print(f"  AVL...")
@@ -208,18 +296,20 @@ class ExperimentRunner:
         for round_num in range(self.num_rounds):
             # Embaralha dados
             shuffled_data = data.copy()
-            random.shuffle(shuffled_data)
+            if self.shuffle_tree_inserts:
+                random.shuffle(shuffled_data)
             
             # Inserção
             avl = AVLTree()
-            start_time = time.perf_counter()
-            total_iterations = 0
+            with self._measured_region('insert'):
+                start_time = time.perf_counter()
+                total_iterations = 0
             
-            for record in shuffled_data:
-                iterations = avl.insert(record)
-                total_iterations += iterations
+                for record in shuffled_data:
+                    iterations = avl.insert(record)
+                    total_iterations += iterations
             
-            insert_time = time.perf_counter() - start_time
+                insert_time = time.perf_counter() - start_time
             height = avl.height()
             
             insert_rounds.append({
@@ -228,23 +318,11 @@ class ExperimentRunner:
                 'iterations': total_iterations,
                 'height': height
             })
+            self._add_memory_metrics(insert_rounds, avl, AVLTree, shuffled_data)
+            fast_avl = self._run_fast_insert(lambda: AVLTree(fast=True), shuffled_data, insert_rounds[-1])
             
-            # Busca
-            search_sample = random.sample(data, min(1000, len(data)))
-            start_time = time.perf_counter()
-            total_iterations = 0
-            
-            for record in search_sample:
-                _, iterations = avl.search(record.matricula)
-                total_iterations += iterations
-            
-            search_time = time.perf_counter() - start_time
-            
-            search_rounds.append({
-                'execution_time': search_time / len(search_sample),
-                'memory_usage': 0,
-                'iterations': total_iterations / len(search_sample)
-            })
+            # Busca (chaves geradas pelo workload configurado)
+            search_rounds.append(self._run_search_round(avl, data, fast_avl))
         
         self.results.append(ExperimentResult(
             structure_name="AVL",
@@ -252,7 +330,8 @@ class ExperimentRunner:
             operation="insert",
             metrics=self._calculate_avg_metrics(insert_rounds),
             rounds=insert_rounds,
-            parameters={'balanced': True}
+            parameters={'balanced': True},
+            artifacts=self._allocation_artifacts("AVL", AVLTree, shuffled_data)
         ))
         
         self.results.append(ExperimentResult(
@@ -261,8 +340,9 @@ class ExperimentRunner:
             operation="search",
             metrics=self._calculate_avg_metrics(search_rounds),
             rounds=search_rounds,
-            parameters={'balanced': True}
+            parameters={'balanced': True, **self.workload.describe()}
         ))
+        self._publish_structure("AVL", AVLTree, shuffled_data)
     
     def _run_hash_table_experiment(self, data: List[Record], size: int, 
                                   m_size: int, hash_func: str):
@@ -274,14 +354,15 @@ class ExperimentRunner:
         for round_num in range(self.num_rounds):
             # Inserção
             hash_table = HashTable(size=m_size, hash_function=hash_func)
-            start_time = time.perf_counter()
-            total_iterations = 0
+            with self._measured_region('insert'):
+                start_time = time.perf_counter()
+                total_iterations = 0
             
-            for record in data:
-                iterations = hash_table.insert(record)
-                total_iterations += iterations
+                for record in data:
+                    iterations = hash_table.insert(record)
+                    total_iterations += iterations
             
-            insert_time = time.perf_counter() - start_time
+                insert_time = time.perf_counter() - start_time
             
             # Métricas específicas da tabela hash
             load_factor = hash_table.get_load_factor()
@@ -298,42 +379,203 @@ class ExperimentRunner:
                 'avg_chain_length': avg_chain,
                 'max_chain_length': max_chain
             })
+            self._add_memory_metrics(insert_rounds, hash_table,
+                                     lambda: HashTable(size=m_size, hash_function=hash_func), data)
+            fast_table = self._run_fast_insert(
+                lambda: HashTable(size=m_size, hash_function=hash_func, fast=True), data, insert_rounds[-1])
             
-            # Busca
-            search_sample = random.sample(data, min(1000, len(data)))
-            start_time = time.perf_counter()
-            total_iterations = 0
+            # Busca (chaves geradas pelo workload configurado)
+            search_rounds.append(self._run_search_round(hash_table, data, fast_table))
+        
+        self.results.append(ExperimentResult(
+            structure_name="HashTable",
+            data_size=size,
+            operation="insert",
+            metrics=self._calculate_avg_metrics(insert_rounds),
+            rounds=insert_rounds,
+            parameters={'M': m_size, 'hash_function': hash_func},
+            artifacts=self._allocation_artifacts(
+                "HashTable", lambda: HashTable(size=m_size, hash_function=hash_func), data)
+        ))
+        
+        self.results.append(ExperimentResult(
+            structure_name="HashTable",
+            data_size=size,
+            operation="search",
+            metrics=self._calculate_avg_metrics(search_rounds),
+            rounds=search_rounds,
+            parameters={'M': m_size, 'hash_function': hash_func, **self.workload.describe()}
+        ))
+        self._publish_structure("HashTable", lambda: HashTable(size=m_size, hash_function=hash_func),
+                                data, M=m_size, hash_function=hash_func)
+    
+    def _run_baseline_experiment(self, data: List[Record], size: int, name: str, factory):
+        print(f"  Baseline {name}...")
+        
+        insert_rounds = []
+        search_rounds = []
+        
+        for round_num in range(self.num_rounds):
+            # Inserção (inclui a ordenação final dos baselines construídos em lote)
+            baseline = factory()
+            with self._measured_region('insert'):
+                start_time = time.perf_counter()
+                total_iterations = 0
             
-            for record in search_sample:
-                _, iterations = hash_table.search(record.matricula)
-                total_iterations += iterations
+                for record in data:
+                    iterations = baseline.insert(record)
+                    total_iterations += iterations
+                if hasattr(baseline, 'finalize'):
+                    baseline.finalize()
             
-            search_time = time.perf_counter() - start_time
+                insert_time = time.perf_counter() - start_time
             
-            search_rounds.append({
-                'execution_time': search_time / len(search_sample),
+            insert_rounds.append({
+                'execution_time': insert_time,
                 'memory_usage': 0,
-                'iterations': total_iterations / len(search_sample)
+                'iterations': total_iterations
             })
+            self._add_memory_metrics(insert_rounds, baseline, factory, data)
+            
+            # Busca (chaves geradas pelo workload configurado)
+            search_rounds.append(self._run_search_round(baseline, data))
         
         self.results.append(ExperimentResult(
-            structure_name="HashTable",
+            structure_name=name,
             data_size=size,
             operation="insert",
             metrics=self._calculate_avg_metrics(insert_rounds),
             rounds=insert_rounds,
-            parameters={'M': m_size, 'hash_function': hash_func}
+            parameters={'baseline': True},
+            artifacts=self._allocation_artifacts(name, factory, data)
         ))
         
         self.results.append(ExperimentResult(
-            structure_name="HashTable",
+            structure_name=name,
             data_size=size,
             operation="search",
             metrics=self._calculate_avg_metrics(search_rounds),
             rounds=search_rounds,
-            parameters={'M': m_size, 'hash_function': hash_func}
+            parameters={'baseline': True, **self.workload.describe()}
         ))
     
+    def _add_memory_metrics(self, insert_rounds: List[Dict[str, float]], structure, factory,
+                            data: List[Record]):
+        """Anota a memória da estrutura na última rodada de inserção (fora do tempo medido).
+        
+        ``bytes_per_record`` vem do walker profundo, sem contar os Records
+        compartilhados com o dataset; ``build_peak_bytes_per_record`` é o pico do
+        tracemalloc numa construção separada, que inclui realocações temporárias.
+        A memória não depende da ordem de inserção, então é medida só na primeira
+        rodada e repetida nas demais.
+        """
+        if not self.measure_memory:
+            return
+        
+        if len(insert_rounds) > 1:
+            first = insert_rounds[0]
+            insert_rounds[-1].update({key: first[key] for key in
+                                      ('memory_usage', 'structure_bytes', 'bytes_per_record',
+                                       'build_peak_bytes_per_record')})
+            return
+        
+        with TRACER.span('memory', cat='round'):
+            structure_bytes = deep_sizeof(structure, exclude=(Record,))
+            _, build_peak = traced_build_peak(lambda: build_structure(factory, data))
+        insert_rounds[-1].update({
+            'memory_usage': structure_bytes / 1024 / 1024,  # MB
+            'structure_bytes': structure_bytes,
+            'bytes_per_record': structure_bytes / len(data),
+            'build_peak_bytes_per_record': build_peak / len(data)
+        })
+    
+    def _allocation_artifacts(self, name: str, factory, data: List[Record]) -> Dict[str, Any]:
+        if not self.profile_allocations:
+            return {}
+        with TRACER.span('allocation_profile'):
+            return {'allocations': profile_build(name, factory, data)}
+    
+    def _publish_structure(self, name: str, factory, data: List[Record], **labels):
+        """Com registro de métricas, repete a célula numa instância publicada.
+        
+        Contadores e histogramas por operação (sondagens, rotações) e o estado
+        final (altura, cadeias, profundidades) vão para o registro sem que os
+        embrulhos de ``publish_structure`` entrem nas rodadas medidas.
+        """
+        if self.metrics_registry is None:
+            return
+        keys = self.workload.generate_keys(data, min(self.num_searches, len(data)))
+        with TRACER.span('publish_structure'), published_structure(
+                factory(), name, self.metrics_registry, n=len(data), **labels) as structure:
+            for record in data:
+                structure.insert(record)
+            for key in keys:
+                structure.search(key)
+    
+    def _run_fast_insert(self, factory, data: List[Record], insert_round: Dict[str, float]):
+        """Repete a inserção em modo rápido e anota o tempo na rodada instrumentada.
+        
+        Returns:
+            A estrutura rápida construída (ou None se ``measure_fast`` estiver desligado)
+        """
+        if not self.measure_fast:
+            return None
+        
+        structure = factory()
+        with self._measured_region('insert', fast=True):
+            start_time = time.perf_counter()
+            for record in data:
+                structure.insert(record)
+            fast_time = time.perf_counter() - start_time
+        self._add_fast_timing(insert_round, fast_time)
+        return structure
+    
+    def _add_fast_timing(self, round_data: Dict[str, float], fast_time: float):
+        round_data['fast_execution_time'] = fast_time
+        # Com amostradores ligados (tracemalloc rastreia cada int criado pela contagem,
+        # a thread de amostragem disputa o GIL) a razão mede os amostradores, não a contagem
+        if self.sampling_profile_dir or self.memory_timeline_interval:
+            return
+        # Custo relativo da contagem de iterações (instrumentado / rápido - 1)
+        round_data['counting_overhead'] = round_data['execution_time'] / fast_time - 1 if fast_time > 0 else 0.0
+    
+    def _run_search_round(self, structure, data: List[Record], fast_structure=None) -> Dict[str, float]:
+        """Executa uma rodada de buscas com as chaves geradas pelo workload.
+        
+        Se ``fast_structure`` for informada, as mesmas chaves são buscadas nela
+        para medir o tempo sem instrumentação.
+        """
+        search_keys = self.workload.generate_keys(data, min(self.num_searches, len(data)))
+        with self._measured_region('search'):
+            search_time, total_iterations, hits = self._time_searches(structure, search_keys)
+        
+        round_data = {
+            'execution_time': search_time / len(search_keys),
+            'memory_usage': 0,
+            'iterations': total_iterations / len(search_keys),
+            'hit_ratio': hits / len(search_keys)
+        }
+        
+        if fast_structure is not None:
+            with self._measured_region('search', fast=True):
+                fast_time, _, _ = self._time_searches(fast_structure, search_keys)
+            self._add_fast_timing(round_data, fast_time / len(search_keys))
+        
+        return round_data
+    
+    def _time_searches(self, structure, search_keys: List[int]) -> tuple:
+        start_time = time.perf_counter()
+        total_iterations = 0
+        hits = 0
+        
+        for matricula in search_keys:
+            found, iterations = structure.search(matricula)
+            total_iterations += iterations
+            if found is not None:
+                hits += 1
+        
+        return time.perf_counter() - start_time, total_iterations, hits
+    
     def _calculate_avg_metrics(self, rounds: List[Dict]) -> Dict[str, float]:
         if not rounds:
             return {}
@@ -349,6 +591,7 @@ class ExperimentRunner:
         
         return metrics
     
+    @traced('save_results', cat='io')
     def save_results(self, filename: str = "experiment_results.json"):
         results_dict = []
         for result in self.results:
@@ -360,6 +603,10 @@ class ExperimentRunner:
                 'statistics': result.get_statistics(),
                 'metrics': result.metrics
             })
+            if result.artifacts:
+                results_dict[-1]['artifacts'] = {
+                    name: _artifact_to_json(artifact) for name, artifact in result.artifacts.items()
+                }
         
         with open(filename, 'w') as f:
             json.dump(results_dict, f, indent=2)
@@ -3,7 +3,13 @@ from models import Record
 
 
 class HashTable:
-    def __init__(self, size: int = 100, hash_function: str = 'division'):
+    def __init__(self, size: int = 100, hash_function: str = 'division', fast: bool = False):
+        """
+        Args:
+            size: Número de buckets (M)
+            hash_function: 'division', 'multiplication' ou 'folding'
+            fast: Modo rápido, sem contagem de iterações (retorna sempre 0)
+        """
         self.size = size
         self.table: List[List[Record]] = [[] for _ in range(size)]
         self.hash_function_name = hash_function
@@ -20,6 +26,11 @@ class HashTable:
             self.hash_func = self._hash_folding
         else:
             self.hash_func = self._hash_division
+        
+        self.fast = fast
+        if fast:
+            self.insert = self._insert_fast
+            self.search = self._search_fast
     
     def _hash_division(self, key: int) -> int:
         return key % self.size
@@ -65,6 +76,23 @@ class HashTable:
         
         return None, self.iterations
     
+    def _insert_fast(self, record: Record) -> int:
+        bucket = self.table[self.hash_func(record.matricula)]
+        if bucket:
+            self.collisions += 1
+            for existing_record in bucket:
+                if existing_record.matricula == record.matricula:
+                    return 0  # Já existe, não insere
+        bucket.append(record)
+        self.total_elements += 1
+        return 0
+    
+    def _search_fast(self, matricula: int) -> tuple[Optional[Record], int]:
+        for record in self.table[self.hash_func(matricula)]:
+            if record.matricula == matricula:
+                return record, 0
+        return None, 0
+    
     def get_load_factor(self) -> float:
         return self.total_elements / self.size
     
@@ -3,9 +3,17 @@ from models import Record
 
 
 class LinearArray:
-    def __init__(self):
+    def __init__(self, fast: bool = False):
+        """
+        Args:
+            fast: Modo rápido, sem contagem de iterações (retorna sempre 0)
+        """
         self.data: List[Record] = []
         self.iterations = 0
+        self.fast = fast
+        if fast:
+            self.insert = self._insert_fast
+            self.search = self._search_fast
     
     def insert(self, record: Record) -> int:
         self.iterations = 1  # Uma operação de inserção
@@ -20,6 +28,16 @@ class LinearArray:
                 return record, self.iterations
         return None, self.iterations
     
+    def _insert_fast(self, record: Record) -> int:
+        self.data.append(record)
+        return 0
+    
+    def _search_fast(self, matricula: int) -> tuple[Optional[Record], int]:
+        for record in self.data:
+            if record.matricula == matricula:
+                return record, 0
+        return None, 0
+    
     def size(self) -> int:
         return len(self.data)
     
@@ -17,6 +17,10 @@ from tabulate import tabulate
 from experiments import ExperimentRunner
 from analysis import ResultAnalyzer
 from models import DataGenerator
+from scaling import ScalingSweep, print_scaling_table
+from allocation_profiler import print_allocation_report
+from metrics_registry import REGISTRY
+from tracing import TRACER, traced
 
 
 def print_header(data_type: str = "basic"):
@@ -54,12 +58,17 @@ def print_summary_table(results):
             'Desvio Tempo': f"{stats.get('std_time', 0):.6f}",
             'Iterações Médias': f"{stats.get('mean_iterations', 0):.1f}"
         }
+        if 'avg_bytes_per_record' in result.metrics:
+            row['Bytes/Registro'] = f"{result.metrics['avg_bytes_per_record']:.1f}"
+            row['Pico Construção (B/reg)'] = f"{result.metrics['avg_build_peak_bytes_per_record']:.1f}"
         
         # Adiciona parâmetros específicos
         if result.structure_name == "HashTable":
             row['Parâmetros'] = f"M={result.parameters['M']}, {result.parameters['hash_function']}"
         elif result.structure_name in ["BST", "AVL"]:
             row['Parâmetros'] = f"balanced={result.parameters.get('balanced', False)}"
+        elif result.parameters.get('baseline'):
+            row['Parâmetros'] = "baseline nativo"
         else:
             row['Parâmetros'] = "-"
         
@@ -208,6 +217,7 @@ def _save_and_show(fig, filepath: str):
     plt.close(fig)
 
 
+@traced('plot_summary', cat='plot')
 def plot_summary(df: pd.DataFrame, outdir="plots"):
     """Gráficos de resumo comparando estruturas por operação."""
     for op in sorted(df["operation"].dropna().unique()):
@@ -238,6 +248,7 @@ def plot_summary(df: pd.DataFrame, outdir="plots"):
         _save_and_show(fig, os.path.join(outdir, f"resumo_iter_{op}.png"))
 
 
+@traced('plot_hash', cat='plot')
 def plot_hash(df: pd.DataFrame, outdir="plots"):
     """Gráficos exclusivos da HashTable: tempo, load factor, colisões e tamanho de cadeia."""
     h = df[(df["structure"] == "HashTable") & (df["operation"] == "insert")].copy()
@@ -295,6 +306,7 @@ def plot_hash(df: pd.DataFrame, outdir="plots"):
             _save_and_show(fig, os.path.join(outdir, f"hash_{func}_cadeias.png"))
 
 
+@traced('plot_trees', cat='plot')
 def plot_trees(df: pd.DataFrame, outdir="plots"):
     """Gráficos exclusivos de BST e AVL: tempo, iterações, altura vs N."""
     for struct in ["BST", "AVL"]:
@@ -336,11 +348,14 @@ def _complexity_model(structure: str, operation: str):
     - BST: insert/search O(log n) (média)
     - AVL: insert/search O(log n)
     - HashTable: insert/search O(1) (média)
+    - Baselines: lista nativa O(n) na busca; dict O(1); lista com bisect e NumPy ordenado O(log n) na busca
     """
     s = (structure or "").lower()
     op = (operation or "").lower()
-    if "hash" in s:
+    if "hash" in s or "dict" in s:
         return "O(1)"
+    if "bisect" in s or "numpy" in s:
+        return "O(log n)" if op == "search" else "O(n)"
     if "avl" in s or "bst" in s:
         return "O(log n)"
     if "array" in s:
@@ -349,6 +364,7 @@ def _complexity_model(structure: str, operation: str):
     return "O(n)"
 
 
+@traced('plot_complexity_overlay', cat='plot')
 def plot_complexity_overlay(df: pd.DataFrame, outdir="plots"):
     """
     Para cada combinação estrutura-operação, plota a curva experimental (tempo médio vs N)
@@ -389,6 +405,40 @@ def plot_complexity_overlay(df: pd.DataFrame, outdir="plots"):
         _save_and_show(fig, os.path.join(outdir, f"complexidade_{struct.lower()}_{op}.png"))
 
 
+@traced('plot_memory_timelines', cat='plot')
+def plot_memory_timelines(results, outdir="plots"):
+    """Curvas de RSS e heap (tracemalloc) durante a inserção, uma por estrutura.
+
+    Usa a primeira rodada de cada célula; picos acima da curva final indicam
+    alocações transitórias.
+    """
+    for n in sorted({r.data_size for r in results}):
+        cells = [r for r in results if r.data_size == n and r.operation == "insert"
+                 and r.artifacts.get("memory_timeline")]
+        if not cells:
+            continue
+
+        fig, (ax_rss, ax_heap) = plt.subplots(1, 2, figsize=(12, 5))
+        for r in cells:
+            timeline = r.artifacts["memory_timeline"][0]
+            params = [str(v) for k, v in r.parameters.items() if k in ("M", "hash_function")]
+            label = " ".join([r.structure_name, *params])
+            times_ms = [t * 1000 for t in timeline.timestamps]
+            ax_rss.plot(times_ms, [(b - timeline.rss_bytes[0]) / 1024 / 1024 for b in timeline.rss_bytes],
+                        label=label)
+            if timeline.heap_bytes:
+                ax_heap.plot(times_ms, [(b - timeline.heap_bytes[0]) / 1024 / 1024 for b in timeline.heap_bytes],
+                             label=label)
+        ax_rss.set_title(f"RSS durante a inserção (N={n})")
+        ax_heap.set_title(f"Heap rastreado durante a inserção (N={n})")
+        for ax in (ax_rss, ax_heap):
+            ax.set_xlabel("Tempo (ms)")
+            ax.set_ylabel("Variação (MB)")
+        ax_heap.legend(fontsize="small")
+        _save_and_show(fig, os.path.join(outdir, f"memoria_timeline_N{n}.png"))
+
+
+@traced('generate_all_plots', cat='plot')
 def generate_all_plots(results):
     """Pipeline de gráficos com dados reais gerados pelos experimentos."""
     outdir = _ensure_plots_dir("plots")
@@ -406,6 +456,21 @@ def generate_all_plots(results):
     # 4) Complexidade: overlay teórico vs experimental
     plot_complexity_overlay(df, outdir=outdir)
 
+    # 5) Memória ao longo da construção (só com --memory-timeline)
+    plot_memory_timelines(results, outdir=outdir)
+
+
+def run_scaling_mode():
+    """Varredura de escalabilidade de 10k a 10M registros com orçamentos por célula."""
+    sweep = ScalingSweep()
+    try:
+        results = sweep.run()
+    except KeyboardInterrupt:
+        print("\n\nVarredura interrompida pelo usuário. Salvando resultados parciais...")
+        results = sweep.results
+    sweep.save_results("scaling_results.json")
+    print_scaling_table(results)
+
 
 def main():
     # Configuração dos experimentos
@@ -422,6 +487,19 @@ def main():
             use_realistic_data = False
         elif sys.argv[1] == "--generate":
             data_source = "generate"
+        elif sys.argv[1] == "--scaling":
+            run_scaling_mode()
+            return
+    # Pode ser combinado com os demais modos
+    profile_allocations = "--alloc-profile" in sys.argv
+    sampling_profile_dir = "profiles" if "--sample-profile" in sys.argv else None
+    if "--trace" in sys.argv:
+        TRACER.enable()
+    memory_timeline_interval = 0.001 if "--memory-timeline" in sys.argv else None
+    metrics_registry = None
+    if "--metrics-port" in sys.argv:
+        REGISTRY.serve(int(sys.argv[sys.argv.index("--metrics-port") + 1]))
+        metrics_registry = REGISTRY
     
     # Configura gerador de dados
     generator = DataGenerator(use_realistic_data=use_realistic_data, data_source=data_source)
@@ -439,7 +517,11 @@ def main():
     runner = ExperimentRunner(
         data_sizes=data_sizes, 
         num_rounds=num_rounds,
-        data_generator=generator  # Passa o gerador personalizado
+        data_generator=generator,  # Passa o gerador personalizado
+        profile_allocations=profile_allocations,
+        sampling_profile_dir=sampling_profile_dir,
+        metrics_registry=metrics_registry,
+        memory_timeline_interval=memory_timeline_interval
     )
     
     try:
@@ -462,6 +544,9 @@ def main():
         
         analyzer = ResultAnalyzer(results)
         analyzer.print_complexity_analysis()
+        analyzer.print_baseline_overhead()
+        analyzer.print_counting_overhead()
+        print_allocation_report(results)
         
         # Gera gráficos integrados
         print("\nGerando gráficos com dados reais...")
@@ -525,6 +610,12 @@ def main():
         print("  python main.py           # Dados realísticos (padrão)")
         print("  python main.py --basic   # Dados sintéticos básicos")
         print("  python main.py --generate # Gera novos dados realísticos")
+        print("  python main.py --scaling  # Varredura de escalabilidade até 10M registros")
+        print("  python main.py --alloc-profile # Inclui o perfil de alocações por estrutura")
+        print("  python main.py --sample-profile # Grava pilhas amostradas (.folded) em profiles/")
+        print("  python main.py --metrics-port 9100 # Serve as métricas das células em /metrics")
+        print("  python main.py --trace   # Grava a linha do tempo das fases em trace.json")
+        print("  python main.py --memory-timeline # Amostra RSS/heap durante cada região medida")
         
     except KeyboardInterrupt:
         print("\n\nExperimento interrompido pelo usuário.")
@@ -534,6 +625,9 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        if TRACER.enabled:
+            TRACER.save("trace.json")
 
 
 if __name__ == "__main__":
@@ -1,97 +1,517 @@
+import gc
+import sys
 import time
+import functools
+import types
 import tracemalloc
+import threading
 import psutil
 import os
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, Iterable, List, Tuple
 from dataclasses import dataclass, field
 
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage
+    resource = None
+
+
+RESOURCE_FIELDS = ('thread_cpu_time', 'process_cpu_time', 'voluntary_ctx_switches',
+                   'involuntary_ctx_switches', 'minor_page_faults', 'major_page_faults')
+
+
+def resource_snapshot() -> Tuple[float, ...]:
+    """Leitura dos contadores de CPU, trocas de contexto e page faults do processo."""
+    times = os.times()
+    thread_time = time.thread_time_ns() / 1e9
+    if resource is None:
+        return (thread_time, times.user + times.system, 0, 0, 0, 0)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return (thread_time, times.user + times.system,
+            usage.ru_nvcsw, usage.ru_nivcsw, usage.ru_minflt, usage.ru_majflt)
+
+
+def resource_delta(before: Tuple[float, ...], after: Tuple[float, ...]) -> Dict[str, float]:
+    """Diferença entre dois ``resource_snapshot`` da região medida."""
+    return {name: a - b for name, b, a in zip(RESOURCE_FIELDS, before, after)}
+
+
+# Objetos que não pertencem a nenhuma estrutura (classes, módulos, funções)
+_NOT_OWNED = (type, types.ModuleType, types.FunctionType, types.MethodType,
+              types.BuiltinFunctionType)
+_ATOMIC = (int, float, complex, bool, str, bytes, type(None))
+
+
+# A partir do 3.11 os atributos de instância ficam num array de valores separado
+# e o __dict__ só é criado se alguém o acessar; o walker nunca acessa __dict__
+# (isso alteraria a memória medida) e estima o array por calibração
+_MANAGED_DICT = sys.version_info >= (3, 11)
+_TPFLAGS_MANAGED_DICT = 1 << 4
+
+
+def _is_interned(obj: Any) -> bool:
+    """None, booleanos e inteiros pequenos são singletons do interpretador."""
+    return obj is None or isinstance(obj, bool) or (type(obj) is int and -5 <= obj <= 256)
+
+
+def _referents(obj: Any) -> Iterable[Any]:
+    if isinstance(obj, _ATOMIC):
+        return ()
+    if isinstance(obj, dict):
+        return [*obj.keys(), *obj.values()]
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return obj
+    return [ref for ref in gc.get_referents(obj) if not isinstance(ref, type)]
+
+
+@functools.lru_cache(maxsize=None)
+def _inline_values_bytes(num_attrs: int, count: int = 2000) -> int:
+    """Bytes do array de valores de uma instância com ``num_attrs`` atributos."""
+    # __init__ compilado com atribuições diretas, como nas classes reais: o
+    # interpretador dimensiona as chaves compartilhadas a partir delas
+    body = "".join(f"        self.a{i} = None\n" for i in range(num_attrs)) or "        pass\n"
+    namespace = {}
+    exec(f"class _Probe:\n    def __init__(self):\n{body}", namespace)
+    probe = namespace['_Probe']
+    probe()  # Inicializa as chaves compartilhadas fora da medição
+    instances = [None] * (2 * count)
+    
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    # A inclinação entre dois lotes descarta custos fixos (pools do alocador)
+    for i in range(count):
+        instances[i] = probe()
+    middle, _ = tracemalloc.get_traced_memory()
+    for i in range(count, 2 * count):
+        instances[i] = probe()
+    after, _ = tracemalloc.get_traced_memory()
+    if not already_tracing:
+        tracemalloc.stop()
+    
+    return max(round((after - middle) / count) - sys.getsizeof(instances[0]), 0)
+
+
+def _object_bytes(obj: Any, refs: Iterable[Any]) -> int:
+    size = sys.getsizeof(obj)
+    if _MANAGED_DICT and type(obj).__flags__ & _TPFLAGS_MANAGED_DICT:
+        refs = list(refs)
+        # Um único dict referenciado indica __dict__ já materializado (contado à parte)
+        if not (len(refs) == 1 and isinstance(refs[0], dict)):
+            size += _inline_values_bytes(len(refs))
+    return size
+
+
+def _owned_objects(obj: Any, exclude: Tuple[type, ...] = ()) -> Dict[int, Tuple[Any, Iterable[Any]]]:
+    """Objetos alcançáveis a partir de ``obj`` que pertencem a ele (id -> (objeto, referências))."""
+    owned = {}
+    shared = set()
+    stack = [obj]
+    
+    while stack:
+        current = stack.pop()
+        current_id = id(current)
+        if current_id in owned or current_id in shared:
+            continue
+        if isinstance(current, _NOT_OWNED) or _is_interned(current):
+            continue
+        refs = _referents(current)
+        if exclude and isinstance(current, exclude):
+            shared.add(current_id)
+            shared.update(id(value) for value in refs)
+            continue
+        owned[current_id] = (current, refs)
+        stack.extend(refs)
+    
+    return {object_id: entry for object_id, entry in owned.items() if object_id not in shared}
+
+
+def deep_sizeof(obj: Any, exclude: Tuple[type, ...] = ()) -> int:
+    """Bytes ocupados por ``obj`` e por tudo o que ele referencia (nós, listas, dicts).
+    
+    Instâncias dos tipos em ``exclude`` (ex.: Record, compartilhados com o
+    dataset) não são contadas, nem os atributos delas que a estrutura também
+    referencie (ex.: a matrícula usada como chave). Arrays NumPy contam o
+    próprio buffer via ``sys.getsizeof``.
+    """
+    return sum(_object_bytes(o, refs) for o, refs in _owned_objects(obj, exclude).values())
+
+
+def deep_sizeof_by_type(obj: Any, exclude: Tuple[type, ...] = ()) -> Dict[str, Dict[str, int]]:
+    """Como ``deep_sizeof``, mas agrupado por componente.
+    
+    Além do tipo, separa o array de atributos das instâncias (o equivalente ao
+    ``__dict__``) e a sobra pré-alocada das listas.
+    
+    Returns:
+        Dicionário componente -> {'count': objetos, 'bytes': bytes}
+    """
+    groups: Dict[str, Dict[str, int]] = {}
+    
+    def add(name: str, size: int, count: int = 1):
+        group = groups.setdefault(name, {'count': 0, 'bytes': 0})
+        group['count'] += count
+        group['bytes'] += size
+    
+    for o, refs in _owned_objects(obj, exclude).values():
+        type_name = type(o).__name__
+        total = _object_bytes(o, refs)
+        base = sys.getsizeof(o)
+        
+        if isinstance(o, list):
+            used = sys.getsizeof([]) + 8 * len(o)
+            add('list', used)
+            if total > used:
+                add('list (sobra pré-alocada)', total - used, 0)
+        elif total > base:
+            add(type_name, base)
+            add(f'{type_name} (atributos / __dict__)', total - base, 0)
+        else:
+            add(type_name, total)
+    
+    return groups
+
+
+def build_structure(factory: Callable[[], Any], records: Iterable[Any]) -> Any:
+    """Constrói a estrutura de ``factory`` com ``records``.
+    
+    Chama ``finalize`` quando a estrutura o tem (baselines construídos em lote),
+    para que a construção medida inclua a ordenação final.
+    """
+    structure = factory()
+    for record in records:
+        structure.insert(record)
+    if hasattr(structure, 'finalize'):
+        structure.finalize()
+    return structure
+
+
+def traced_build_peak(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """Executa ``build`` sob tracemalloc e retorna (resultado, pico em bytes).
+    
+    O pico é relativo à memória já rastreada no início, então inclui apenas o
+    que foi alocado durante a construção (nós, buckets, realocações).
+    """
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    current_before, _ = tracemalloc.get_traced_memory()
+    
+    result = build()
+    
+    _, peak = tracemalloc.get_traced_memory()
+    if not already_tracing:
+        tracemalloc.stop()
+    return result, peak - current_before
+
+
+@dataclass
+class MemoryTimeline:
+    """Série temporal de memória de uma região medida."""
+    interval: float
+    timestamps: List[float] = field(default_factory=list)  # s desde o início da região
+    rss_bytes: List[int] = field(default_factory=list)
+    heap_bytes: List[int] = field(default_factory=list)  # tracemalloc atual (vazio se desligado)
+
+    @property
+    def peak_rss_delta(self) -> int:
+        """Maior RSS observado acima do RSS inicial (picos transitórios incluídos)."""
+        return max(self.rss_bytes) - self.rss_bytes[0] if self.rss_bytes else 0
+
+    @property
+    def peak_heap_delta(self) -> int:
+        return max(self.heap_bytes) - self.heap_bytes[0] if self.heap_bytes else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'interval': self.interval,
+            'timestamps': self.timestamps,
+            'rss_bytes': self.rss_bytes,
+            'heap_bytes': self.heap_bytes,
+            'peak_rss_delta': self.peak_rss_delta,
+            'peak_heap_delta': self.peak_heap_delta
+        }
+
+
+class MemoryTimelineSampler:
+    """Thread em segundo plano que amostra RSS e tracemalloc atual a cada ``interval``.
+
+    Ao contrário das leituras antes/depois, captura picos transitórios durante a
+    região (realocação de listas, rebalanceamentos). Com ``trace_heap`` o
+    tracemalloc fica ligado na região, o que deixa o código medido mais lento;
+    use só em execuções de diagnóstico.
+    """
+
+    def __init__(self, interval: float = 0.001, trace_heap: bool = True):
+        self.interval = interval
+        self.trace_heap = trace_heap
+        self.timeline = MemoryTimeline(interval)
+        self._process = psutil.Process(os.getpid())
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_tracing = False
+        self._switch_interval = None
+        self._origin = 0.0
+
+    def _sample(self):
+        self.timeline.timestamps.append(time.perf_counter() - self._origin)
+        self.timeline.rss_bytes.append(self._process.memory_info().rss)
+        if self.trace_heap:
+            self.timeline.heap_bytes.append(tracemalloc.get_traced_memory()[0])
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        if self.trace_heap and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        # Sem reduzir o intervalo de troca do GIL a thread só roda a cada 5 ms
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._origin = time.perf_counter()
+        self._sample()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="memory-timeline")
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        sys.setswitchinterval(self._switch_interval)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
 
 @dataclass
 class PerformanceMetrics:
     execution_time: float = 0.0
     memory_usage: float = 0.0  # Em MB
     peak_memory: float = 0.0  # Em MB
-    cpu_percent: float = 0.0
+    thread_cpu_time: float = 0.0  # CPU da thread medida (s)
+    process_cpu_time: float = 0.0  # CPU usuário + sistema do processo (s)
+    voluntary_ctx_switches: int = 0  # Bloqueios (E/S, locks)
+    involuntary_ctx_switches: int = 0  # Preempção pelo escalonador
+    minor_page_faults: int = 0
+    major_page_faults: int = 0
     iterations: int = 0
     additional_metrics: Dict[str, Any] = field(default_factory=dict)
     
+    @property
+    def cpu_ratio(self) -> float:
+        """Fração do tempo de parede gasta em CPU (≈1 indica CPU-bound)."""
+        return self.thread_cpu_time / self.execution_time if self.execution_time > 0 else 0.0
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             'execution_time': self.execution_time,
             'memory_usage': self.memory_usage,
             'peak_memory': self.peak_memory,
-            'cpu_percent': self.cpu_percent,
+            'thread_cpu_time': self.thread_cpu_time,
+            'process_cpu_time': self.process_cpu_time,
+            'cpu_ratio': self.cpu_ratio,
+            'voluntary_ctx_switches': self.voluntary_ctx_switches,
+            'involuntary_ctx_switches': self.involuntary_ctx_switches,
+            'minor_page_faults': self.minor_page_faults,
+            'major_page_faults': self.major_page_faults,
             'iterations': self.iterations,
             **self.additional_metrics
         }
 
 
 class MetricsCollector:
-    def __init__(self):
+    def __init__(self, sample_every: int = 1, batch_memory: bool = False):
+        """
+        Args:
+            sample_every: Captura memória e CPU em 1 de cada N chamadas
+                (1 = todas, comportamento original); as demais só medem tempo
+            batch_memory: Em measure_batch_operations, mede memória uma única
+                vez sobre o lote inteiro em vez de por operação (os tempos
+                individuais passam a incluir o custo do tracemalloc ativo)
+        """
         self.process = psutil.Process(os.getpid())
+        self.sample_every = max(1, sample_every)
+        self.batch_memory = batch_memory
+        self._calls = 0
+        self._overhead = None
         
     def measure_operation(self, operation: Callable, *args, **kwargs) -> tuple[Any, PerformanceMetrics]:
-        metrics = PerformanceMetrics()
+        sampled = self._calls % self.sample_every == 0
+        self._calls += 1
         
-        # Coleta CPU antes
-        self.process.cpu_percent()  # Primeira chamada para inicializar
+        if sampled:
+            return self._measure_with_memory(operation, *args, **kwargs)
+        return self._measure_time(operation, *args, **kwargs)
+    
+    def _measure_time(self, operation: Callable, *args, **kwargs) -> tuple[Any, PerformanceMetrics]:
+        """Caminho barato: apenas o relógio em volta da chamada."""
+        start_time = time.perf_counter()
+        result = operation(*args, **kwargs)
+        end_time = time.perf_counter()
         
-        # Inicia rastreamento de memória
-        tracemalloc.start()
+        metrics = PerformanceMetrics(execution_time=end_time - start_time)
+        metrics.additional_metrics['memory_sampled'] = False
+        return result, metrics
+    
+    def _measure_with_memory(self, operation: Callable, *args, **kwargs) -> tuple[Any, PerformanceMetrics]:
+        metrics = PerformanceMetrics()
+        
+        # Inicia rastreamento de memória (sem interromper um rastreamento externo)
+        already_tracing = tracemalloc.is_tracing()
+        if already_tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
         
         # Memória inicial
         mem_before = self.process.memory_info().rss / 1024 / 1024  # MB
         
-        # Executa operação e mede tempo
+        # Executa operação e mede tempo e contadores de CPU
+        resources_before = resource_snapshot()
+        thread_start = time.thread_time_ns()
         start_time = time.perf_counter()
         result = operation(*args, **kwargs)
         end_time = time.perf_counter()
+        thread_end = time.thread_time_ns()
+        resources_after = resource_snapshot()
         
         # Coleta métricas
         metrics.execution_time = end_time - start_time
+        for name, value in resource_delta(resources_before, resources_after).items():
+            setattr(metrics, name, value)
+        # CPU da thread lido colado ao relógio, sem o custo das leituras de getrusage
+        metrics.thread_cpu_time = (thread_end - thread_start) / 1e9
         
         # Memória
         current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
+        if not already_tracing:
+            tracemalloc.stop()
         
         mem_after = self.process.memory_info().rss / 1024 / 1024  # MB
         
         metrics.memory_usage = (mem_after - mem_before)
         metrics.peak_memory = peak / 1024 / 1024  # MB
-        
-        # CPU
-        metrics.cpu_percent = self.process.cpu_percent()
+        metrics.additional_metrics['memory_sampled'] = True
         
         return result, metrics
     
+    def measure_overhead(self, repeats: int = 2000) -> Dict[str, float]:
+        """Mede o custo da própria instrumentação com uma operação vazia.
+        
+        Returns:
+            Dicionário com o viés do relógio dentro do intervalo medido e o custo
+            extra de parede por chamada nos caminhos só-tempo e com memória
+        """
+        if self._overhead is not None:
+            return self._overhead
+        
+        def noop():
+            return None
+        
+        start_time = time.perf_counter()
+        for _ in range(repeats):
+            noop()
+        bare = (time.perf_counter() - start_time) / repeats
+        
+        bias = []
+        start_time = time.perf_counter()
+        for _ in range(repeats):
+            bias.append(self._measure_time(noop)[1].execution_time)
+        timed = (time.perf_counter() - start_time) / repeats
+        
+        memory_repeats = max(1, repeats // 20)
+        start_time = time.perf_counter()
+        for _ in range(memory_repeats):
+            self._measure_with_memory(noop)
+        sampled = (time.perf_counter() - start_time) / memory_repeats
+        
+        bias.sort()
+        self._overhead = {
+            'timer_bias': bias[len(bias) // 2],
+            'timed_call_overhead': max(timed - bare, 0.0),
+            'sampled_call_overhead': max(sampled - bare, 0.0)
+        }
+        return self._overhead
+    
     def measure_batch_operations(self, operations: list, 
                                operation_func: Callable,
                                description: str = "") -> Dict[str, Any]:
         all_metrics = []
+        overhead = self.measure_overhead()
         
         print(f"Executando: {description}")
         
+        if self.batch_memory:
+            already_tracing = tracemalloc.is_tracing()
+            if already_tracing:
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+            resources_before = resource_snapshot()
+            mem_before = self.process.memory_info().rss / 1024 / 1024  # MB
+        
+        # A amostragem recomeça a cada lote: a primeira chamada é sempre
+        # amostrada, então lotes menores que sample_every também têm memória
+        self._calls = 0
+        batch_start = time.perf_counter()
         for i, op_args in enumerate(operations):
             if i % 100 == 0 and i > 0:
                 print(f"  Progresso: {i}/{len(operations)}")
             
-            _, metrics = self.measure_operation(operation_func, *op_args)
+            if self.batch_memory:
+                _, metrics = self._measure_time(operation_func, *op_args)
+            else:
+                _, metrics = self.measure_operation(operation_func, *op_args)
             all_metrics.append(metrics)
+        batch_time = time.perf_counter() - batch_start
+        
+        sampled = [m for m in all_metrics if m.additional_metrics['memory_sampled']]
+        # O tracemalloc ativo deixa as chamadas amostradas mais lentas; o tempo
+        # vem das chamadas só-tempo sempre que houver alguma
+        timed = [m for m in all_metrics if not m.additional_metrics['memory_sampled']] or all_metrics
+        
+        if self.batch_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            if not already_tracing:
+                tracemalloc.stop()
+            mem_after = self.process.memory_info().rss / 1024 / 1024  # MB
+            avg_memory = (mem_after - mem_before) / len(all_metrics)
+            max_memory = peak / 1024 / 1024
+            resources = resource_delta(resources_before, resource_snapshot())
+            resource_time = batch_time
+        else:
+            avg_memory = sum(m.memory_usage for m in sampled) / len(sampled)
+            max_memory = max(m.peak_memory for m in sampled)
+            resources = {name: sum(getattr(m, name) for m in sampled) for name in RESOURCE_FIELDS}
+            resource_time = sum(m.execution_time for m in sampled)
         
-        # Calcula estatísticas
-        avg_time = sum(m.execution_time for m in all_metrics) / len(all_metrics)
-        avg_memory = sum(m.memory_usage for m in all_metrics) / len(all_metrics)
-        max_memory = max(m.peak_memory for m in all_metrics)
-        avg_cpu = sum(m.cpu_percent for m in all_metrics) / len(all_metrics)
+        raw_avg_time = sum(m.execution_time for m in timed) / len(timed)
         total_iterations = sum(m.iterations for m in all_metrics)
         
+        # Custo da instrumentação fora do intervalo medido, estimado pela calibração
+        overhead_total = (overhead['timed_call_overhead'] * (len(all_metrics) - len(sampled)) +
+                          overhead['sampled_call_overhead'] * len(sampled))
+        
         return {
             'total_operations': len(operations),
-            'avg_execution_time': avg_time,
+            'avg_execution_time': max(raw_avg_time - overhead['timer_bias'], 0.0),
+            'avg_execution_time_raw': raw_avg_time,
             'total_execution_time': sum(m.execution_time for m in all_metrics),
             'avg_memory_usage': avg_memory,
             'peak_memory_usage': max_memory,
-            'avg_cpu_percent': avg_cpu,
+            # Contadores de CPU somados sobre as regiões amostradas (ou o lote)
+            **{f'total_{name}': value for name, value in resources.items()},
+            'cpu_ratio': resources['thread_cpu_time'] / resource_time if resource_time > 0 else 0.0,
             'total_iterations': total_iterations,
-            'avg_iterations': total_iterations / len(operations) if operations else 0
-        }
\ No newline at end of file
+            'avg_iterations': total_iterations / len(operations) if operations else 0,
+            'memory_samples': 0 if self.batch_memory else len(sampled),
+            'sample_every': self.sample_every,
+            'batch_memory': self.batch_memory,
+            'instrumentation_overhead_per_op': overhead_total / len(all_metrics),
+            'instrumentation_overhead_ratio': min(overhead_total / batch_time, 1.0) if batch_time > 0 else 0.0
+        }
@@ -0,0 +1,390 @@
+"""
+Registro unificado de métricas (contadores, gauges e histogramas).
+
+As estruturas publicam no registro sem mudar o próprio código: ``publish_structure``
+embrulha ``insert``/``search`` (e as rotações da AVL) na instância, da mesma forma
+que o modo rápido troca os métodos, e registra um coletor que lê o estado da
+estrutura (tamanho, altura, cadeias, profundidades) no momento da coleta.
+O registro é exportado em formato texto do Prometheus ou em JSON, e pode ser
+servido por um endpoint HTTP local durante execuções longas.
+"""
+
+import json
+import math
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Buckets em potências de 2: iterações por operação, tamanho de cadeia, profundidade
+DEFAULT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    type_name = 'counter'
+
+    def __init__(self, name: str, help: str = ""):
+        self.name = name
+        self.help = help
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels):
+        """Define o total acumulado (para contadores mantidos pela própria estrutura)."""
+        self._values[_label_key(labels)] = value
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        return [(self.name, key, value) for key, value in list(self._values.items())]
+
+
+class Gauge(Counter):
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels):
+        self._values[_label_key(labels)] = value
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram:
+    type_name = 'histogram'
+
+    def __init__(self, name: str, help: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # Por conjunto de rótulos: [contagens por bucket..., soma, total]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def _series(self, labels: Dict[str, Any]) -> List[float]:
+        key = _label_key(labels)
+        series = self._values.get(key)
+        if series is None:
+            series = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+        return series
+
+    def observe(self, value: float, **labels):
+        series = self._series(labels)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def reset(self, **labels):
+        """Zera uma série (histogramas recalculados a cada coleta)."""
+        self._values.pop(_label_key(labels), None)
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        result = []
+        for key, series in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                result.append((f"{self.name}_bucket", key + (('le', _format_value(bound)),), cumulative))
+            result.append((f"{self.name}_bucket", key + (('le', '+Inf'),), series[-1]))
+            result.append((f"{self.name}_sum", key, series[-2]))
+            result.append((f"{self.name}_count", key, series[-1]))
+        return result
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"Métrica '{name}' já registrada como {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get_or_create(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], None]):
+        """Função chamada antes de cada exportação para atualizar métricas derivadas."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collect(self):
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:  # A estrutura pode estar sendo modificada durante a coleta
+                print(f"Aviso: coletor de métricas falhou: {e}")
+
+    def _sorted_metrics(self) -> List[Any]:
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def to_prometheus(self) -> str:
+        """Exporta no formato texto de exposição do Prometheus."""
+        self.collect()
+        lines = []
+        for metric in self._sorted_metrics():
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for sample_name, key, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> Dict[str, Any]:
+        """Snapshot das métricas como dicionário serializável."""
+        self.collect()
+        snapshot = {}
+        for metric in self._sorted_metrics():
+            snapshot[metric.name] = {
+                'type': metric.type_name,
+                'help': metric.help,
+                'samples': [{'name': sample_name, 'labels': dict(key), 'value': value}
+                            for sample_name, key, value in metric.samples()]
+            }
+        return snapshot
+
+    def save_json(self, filename: str = "metrics_snapshot.json"):
+        with open(filename, 'w') as f:
+            json.dump(self.to_json(), f, indent=2)
+
+    def serve(self, port: int = 8000, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve ``/metrics`` (Prometheus) e ``/metrics.json`` numa thread daemon.
+
+        Returns:
+            O servidor; chame ``shutdown()`` para encerrar
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body = registry.to_prometheus().encode()
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif self.path == '/metrics.json':
+                    body = json.dumps(registry.to_json()).encode()
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Não polui a saída dos experimentos
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+        print(f"Métricas disponíveis em http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+
+REGISTRY = MetricsRegistry()
+
+
+def _tree_depths(root) -> List[int]:
+    """Profundidade (raiz = 1) de cada nó, sem recursão."""
+    depths = []
+    stack = [(root, 1)] if root is not None else []
+    while stack:
+        node, depth = stack.pop()
+        depths.append(depth)
+        if node.left is not None:
+            stack.append((node.left, depth + 1))
+        if node.right is not None:
+            stack.append((node.right, depth + 1))
+    return depths
+
+
+def publish_structure(structure, name: str, registry: MetricsRegistry = None, **labels):
+    """Publica uma estrutura (LinearArray, BST, AVL, HashTable) no registro.
+
+    Embrulha ``insert``/``search`` para contar operações e iterações (sondagens)
+    e registra um coletor com o estado derivado da estrutura.
+
+    Args:
+        structure: Instância da estrutura
+        name: Valor do rótulo ``structure`` nas métricas
+        registry: Registro de destino (padrão: REGISTRY global)
+        **labels: Rótulos adicionais (ex.: M, hash_function)
+    """
+    registry = registry or REGISTRY
+    registry.register_collector(_instrument(structure, name, registry, labels))
+    return structure
+
+
+@contextmanager
+def published_structure(structure, name: str, registry: MetricsRegistry = None, **labels):
+    """Como ``publish_structure``, mas só durante o bloco ``with``.
+
+    Na saída o estado da estrutura é coletado uma última vez e o coletor não
+    fica registrado, então o registro não mantém a estrutura viva (usado pelo
+    ExperimentRunner, que publica uma instância por célula).
+    """
+    registry = registry or REGISTRY
+    collect = _instrument(structure, name, registry, labels)
+    try:
+        yield structure
+    finally:
+        collect()
+
+
+def _instrument(structure, name: str, registry: MetricsRegistry, labels: Dict[str, Any]) -> Callable[[], None]:
+    """Embrulha os métodos da estrutura e devolve o coletor do seu estado."""
+    labels = {'structure': name, **labels}
+
+    operations = registry.counter('ds_operations_total', "Operações executadas")
+    probes = registry.counter('ds_probes_total', "Iterações (comparações/sondagens) acumuladas")
+    probes_per_op = registry.histogram('ds_probes_per_operation', "Iterações por operação")
+
+    def wrap(method, operation):
+        def wrapped(*args, **kwargs):
+            result = method(*args, **kwargs)
+            iterations = result[1] if isinstance(result, tuple) else result
+            operations.inc(operation=operation, **labels)
+            probes.inc(iterations, operation=operation, **labels)
+            probes_per_op.observe(iterations, operation=operation, **labels)
+            return result
+        return wrapped
+
+    structure.insert = wrap(structure.insert, 'insert')
+    structure.search = wrap(structure.search, 'search')
+
+    if hasattr(structure, '_rotate_left'):
+        rotations = registry.counter('ds_rotations_total', "Rotações de balanceamento da AVL")
+
+        def wrap_rotation(method, direction):
+            def wrapped(node):
+                rotations.inc(direction=direction, **labels)
+                return method(node)
+            return wrapped
+
+        structure._rotate_left = wrap_rotation(structure._rotate_left, 'left')
+        structure._rotate_right = wrap_rotation(structure._rotate_right, 'right')
+
+    size = registry.gauge('ds_elements', "Elementos armazenados")
+
+    if hasattr(structure, 'table'):
+        collisions = registry.counter('ds_hash_collisions_total', "Inserções em bucket já ocupado")
+        load_factor = registry.gauge('ds_hash_load_factor', "Fator de carga (n / M)")
+        max_chain = registry.gauge('ds_hash_max_chain_length', "Maior cadeia")
+        chains = registry.histogram('ds_hash_chain_length', "Comprimento das cadeias não vazias")
+
+        def collect():
+            size.set(structure.total_elements, **labels)
+            collisions.set_total(structure.collisions, **labels)
+            load_factor.set(structure.get_load_factor(), **labels)
+            max_chain.set(structure.get_max_chain_length(), **labels)
+            chains.reset(**labels)
+            for bucket in list(structure.table):
+                if bucket:
+                    chains.observe(len(bucket), **labels)
+    elif hasattr(structure, 'root'):
+        height = registry.gauge('ds_tree_height', "Altura da árvore")
+        depth = registry.histogram('ds_tree_node_depth', "Profundidade dos nós")
+
+        def collect():
+            depths = _tree_depths(structure.root)
+            size.set(len(depths), **labels)
+            height.set(max(depths, default=0), **labels)
+            depth.reset(**labels)
+            for d in depths:
+                depth.observe(d, **labels)
+    else:
+        def collect():
+            size.set(structure.size(), **labels)
+
+    return collect
+
+
+def publish_results(results, registry: MetricsRegistry = None):
+    """Publica resultados do benchmark (tempo médio e iterações) como gauges."""
+    registry = registry or REGISTRY
+    mean_time = registry.gauge('benchmark_mean_seconds', "Tempo médio medido por célula do benchmark")
+    mean_iterations = registry.gauge('benchmark_mean_iterations', "Iterações médias por célula do benchmark")
+
+    for result in results:
+        stats = result.get_statistics()
+        labels = {'structure': result.structure_name, 'operation': result.operation,
+                  'n': result.data_size}
+        labels.update({k: v for k, v in result.parameters.items() if k in ('M', 'hash_function')})
+        mean_time.set(stats.get('mean_time', 0.0), **labels)
+        mean_iterations.set(stats.get('mean_iterations', 0.0), **labels)
+
+
+def main():
+    """Constrói as estruturas publicadas e exporta o registro.
+
+    Uso: ``python metrics_registry.py [--serve PORTA]``
+    """
+    import sys
+    import time
+    from models import DataGenerator
+    from mixed_workloads import default_structures
+
+    data = DataGenerator(use_realistic_data=False).generate_records(10000, seed=42)
+    for name, factory in default_structures().items():
+        structure = publish_structure(factory(), name)
+        for record in data:
+            structure.insert(record)
+        for record in data[::10]:
+            structure.search(record.matricula)
+
+    if "--serve" in sys.argv:
+        port = int(sys.argv[sys.argv.index("--serve") + 1])
+        REGISTRY.serve(port)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            return
+
+    print(REGISTRY.to_prometheus())
+    REGISTRY.save_json()
+    print("Snapshot salvo em: metrics_snapshot.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Driver de workloads mistos (estilo YCSB) para as estruturas de dados.
+
+Em vez de fases separadas de inserção e busca, executa sequências intercaladas
+de leituras, atualizações, inserções e varreduras, reportando vazão (ops/s) e
+percentis de latência por mix de operações.
+"""
+
+import copy
+import random
+from bisect import bisect_left
+import time
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from tabulate import tabulate
+from models import DataGenerator, Record
+from linear_array import LinearArray
+from binary_search_tree import BinarySearchTree
+from avl_tree import AVLTree
+from hash_table import HashTable
+from experiments import ExperimentResult
+from workloads import SearchWorkload
+
+
+OPERATION_TYPES = ('read', 'update', 'insert', 'scan')
+
+
+@dataclass
+class OperationMix:
+    """Proporção de cada tipo de operação em um workload misto."""
+    name: str
+    read: float = 0.0
+    update: float = 0.0
+    insert: float = 0.0
+    scan: float = 0.0
+    scan_length: int = 10
+
+    def __post_init__(self):
+        total = self.read + self.update + self.insert + self.scan
+        if abs(total - 1.0) > 1e-9:
+            raise ValueError(f"Proporções do mix '{self.name}' somam {total}, esperado 1.0")
+
+    def weights(self) -> List[float]:
+        return [self.read, self.update, self.insert, self.scan]
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'mix': self.name,
+            'read': self.read,
+            'update': self.update,
+            'insert': self.insert,
+            'scan': self.scan,
+            'scan_length': self.scan_length
+        }
+
+
+# Mixes inspirados nos workloads padrão do YCSB
+STANDARD_MIXES = [
+    OperationMix('A_update_heavy', read=0.50, update=0.50),
+    OperationMix('B_read_mostly', read=0.95, update=0.05),
+    OperationMix('C_read_only', read=1.0),
+    OperationMix('D_read_insert', read=0.95, insert=0.05),
+    OperationMix('E_insert_scan', read=0.10, insert=0.60, scan=0.30),
+]
+
+
+def default_structures() -> Dict[str, Callable[[], Any]]:
+    """Fábricas das estruturas avaliadas pelo driver."""
+    return {
+        'LinearArray': LinearArray,
+        'BST': BinarySearchTree,
+        'AVL': AVLTree,
+        'HashTable': lambda: HashTable(size=5000, hash_function='division'),
+    }
+
+
+class MixedWorkloadDriver:
+    """Executa mixes de operações sobre qualquer estrutura com insert/search.
+
+    Atualizações são leitura-modificação-escrita sobre o registro encontrado.
+    Como as estruturas não oferecem varredura por intervalo, uma varredura é
+    executada como ``scan_length`` buscas consecutivas em ordem de matrícula.
+    """
+
+    def __init__(self, structures: Dict[str, Callable[[], Any]] = None,
+                 num_operations: int = 5000, preload_fraction: float = 0.5,
+                 key_workload: SearchWorkload = None, num_rounds: int = 3):
+        self.structures = structures or default_structures()
+        self.num_operations = num_operations
+        self.preload_fraction = preload_fraction
+        self.key_workload = key_workload or SearchWorkload()
+        self.num_rounds = num_rounds
+        self.results: List[ExperimentResult] = []
+
+    def _build_plan(self, data: List[Record], mix: OperationMix) -> Tuple[List[Tuple[str, Any]], int]:
+        """Gera a sequência de operações, idêntica para todas as estruturas."""
+        preload_count = max(1, int(len(data) * self.preload_fraction))
+        preloaded = data[:preload_count]
+        pending_inserts = iter(range(preload_count, len(data)))
+
+        op_types = random.choices(OPERATION_TYPES, weights=mix.weights(), k=self.num_operations)
+        keys = self.key_workload.generate_keys(preloaded, self.num_operations)
+        ordered_keys = sorted(r.matricula for r in preloaded)
+
+        plan = []
+        for op_type, key in zip(op_types, keys):
+            if op_type == 'insert':
+                index = next(pending_inserts, None)
+                if index is None:
+                    # Sem registros novos disponíveis: degrada para leitura
+                    plan.append(('read', key))
+                else:
+                    plan.append(('insert', index))
+            elif op_type == 'scan':
+                # Chave ausente (misses do workload): a varredura começa na primeira
+                # chave maior, como num range scan, e não no início
+                start = bisect_left(ordered_keys, key)
+                plan.append(('scan', ordered_keys[start:start + mix.scan_length]))
+            elif op_type == 'update':
+                plan.append(('update', (key, random.uniform(2000.0, 20000.0))))
+            else:
+                plan.append(('read', key))
+
+        return plan, preload_count
+
+    def _run_round(self, factory: Callable[[], Any], data: List[Record],
+                   plan: List[Tuple[str, Any]], preload_count: int) -> Dict[str, Any]:
+        # Cópias isolam as atualizações entre estruturas e rodadas
+        records = [copy.copy(r) for r in data]
+        structure = factory()
+        for record in records[:preload_count]:
+            structure.insert(record)
+
+        latencies = {op: [] for op in OPERATION_TYPES}
+        total_iterations = 0
+        clock = time.perf_counter_ns
+
+        start_time = time.perf_counter()
+        for op_type, arg in plan:
+            op_start = clock()
+            if op_type == 'read':
+                _, iterations = structure.search(arg)
+            elif op_type == 'update':
+                found, iterations = structure.search(arg[0])
+                if found is not None:
+                    found.salario = arg[1]
+            elif op_type == 'insert':
+                iterations = structure.insert(records[arg])
+            else:
+                iterations = 0
+                for key in arg:
+                    _, probe_iterations = structure.search(key)
+                    iterations += probe_iterations
+            latencies[op_type].append(clock() - op_start)
+            total_iterations += iterations
+        elapsed = time.perf_counter() - start_time
+
+        all_latencies = np.array([lat for op in OPERATION_TYPES for lat in latencies[op]]) / 1000.0
+        round_metrics = {
+            'execution_time': elapsed,
+            'memory_usage': 0,
+            'iterations': total_iterations / len(plan),
+            'throughput_ops_s': len(plan) / elapsed if elapsed > 0 else 0.0,
+            'p50_latency_us': float(np.percentile(all_latencies, 50)),
+            'p95_latency_us': float(np.percentile(all_latencies, 95)),
+            'p99_latency_us': float(np.percentile(all_latencies, 99)),
+        }
+        for op_type in OPERATION_TYPES:
+            if latencies[op_type]:
+                op_latencies = np.array(latencies[op_type]) / 1000.0
+                round_metrics[f'{op_type}_p50_latency_us'] = float(np.percentile(op_latencies, 50))
+                round_metrics[f'{op_type}_p99_latency_us'] = float(np.percentile(op_latencies, 99))
+        return round_metrics
+
+    def run_mix(self, data: List[Record], mix: OperationMix) -> List[ExperimentResult]:
+        """Executa um mix sobre todas as estruturas configuradas."""
+        print(f"  Mix {mix.name}...")
+        plan, preload_count = self._build_plan(data, mix)
+        mix_results = []
+
+        for name, factory in self.structures.items():
+            rounds = [self._run_round(factory, data, plan, preload_count)
+                      for _ in range(self.num_rounds)]
+            metrics = {}
+            for key in rounds[0]:
+                values = [r[key] for r in rounds if key in r]
+                metrics[f'avg_{key}'] = float(np.mean(values))
+                metrics[f'std_{key}'] = float(np.std(values))
+
+            mix_results.append(ExperimentResult(
+                structure_name=name,
+                data_size=len(data),
+                operation=f"mix:{mix.name}",
+                metrics=metrics,
+                rounds=rounds,
+                parameters={**mix.describe(), **self.key_workload.describe(),
+                            'preload': preload_count, 'operations': len(plan)}
+            ))
+
+        self.results.extend(mix_results)
+        return mix_results
+
+    def run_all(self, data: List[Record], mixes: Optional[List[OperationMix]] = None) -> List[ExperimentResult]:
+        for mix in mixes or STANDARD_MIXES:
+            self.run_mix(data, mix)
+        return self.results
+
+
+def print_mix_table(results: List[ExperimentResult]):
+    """Tabela de vazão e latência por mix e estrutura."""
+    rows = []
+    for result in results:
+        m = result.metrics
+        rows.append({
+            'Mix': result.parameters['mix'],
+            'Estrutura': result.structure_name,
+            'N': result.data_size,
+            'Vazão (ops/s)': f"{m['avg_throughput_ops_s']:,.0f}",
+            'p50 (μs)': f"{m['avg_p50_latency_us']:.2f}",
+            'p95 (μs)': f"{m['avg_p95_latency_us']:.2f}",
+            'p99 (μs)': f"{m['avg_p99_latency_us']:.2f}",
+            'Iterações/op': f"{m['avg_iterations']:.1f}"
+        })
+    print(tabulate(rows, headers='keys', tablefmt='grid'))
+
+
+def main():
+    print("=" * 80)
+    print(" WORKLOADS MISTOS (ESTILO YCSB) ".center(80))
+    print("=" * 80)
+
+    data = DataGenerator(use_realistic_data=False).generate_records(10000, seed=42)
+    driver = MixedWorkloadDriver(num_operations=5000)
+    results = driver.run_all(data)
+    print_mix_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import random
 import string
 from typing import Any, Optional, List
 import os
+from tracing import traced
 
 # Importa módulo de geração de dados de estudantes
 try:
@@ -109,6 +110,7 @@ class DataGenerator:
         if self.use_realistic_data:
             self.student_generator = StudentDataGenerator()
     
+    @traced('generate_records', cat='data')
     def generate_records(self, n: int, seed: Optional[int] = None) -> List[Record]:
         """Gera registros usando dados realísticos ou básicos."""
         if seed is not None:
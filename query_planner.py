@@ -0,0 +1,243 @@
+"""
+Planejador de consultas baseado em custo para o sistema de cadastro.
+
+Uma consulta é um conjunto de predicados por campo: valor (igualdade) ou tupla
+``(mínimo, máximo)`` (faixa inclusiva). Para cada índice que cobre parte dos
+predicados, o planejador estima quantas linhas ele devolve — contagem exata,
+já que os índices hash guardam as listas e os ordenados respondem com dois
+bisect — e compara três estratégias:
+
+- ``full_scan``: avalia todos os predicados em cada registro;
+- ``index``: busca no índice mais seletivo e filtra o restante;
+- ``intersection``: intersecta (em C, por ``id``) as saídas de vários
+  índices e filtra o que nenhum deles cobre.
+
+Um índice bitmap entra como um único caminho: o E dos bitmaps de todas as
+igualdades que ele cobre, com contagem exata.
+"""
+
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from registration_indexes import BitmapIndex, HashIndex, SortedIndex
+
+
+# Custos relativos por linha (medidos grosseiramente em CPython: uma iteração
+# de laço ~ um elemento processado em operação de conjunto)
+ROW_COST = 1.0        # Iteração de um laço Python sobre uma linha
+PREDICATE_COST = 1.5  # Avaliação de um predicado (atributo + comparação)
+SET_COST = 1.0        # Elemento inserido/testado num conjunto de ids
+LOOKUP_COST = 5.0     # Custo fixo de consultar um índice
+BITMAP_COST = 0.01    # Bit percorrido ao extrair as posições de um bitmap
+
+
+class _Max:
+    """Sentinela maior que qualquer valor (limite superior de prefixos compostos)."""
+
+    def __lt__(self, other):
+        return False
+
+    def __le__(self, other):
+        return other is self
+
+    def __gt__(self, other):
+        return other is not self
+
+    def __ge__(self, other):
+        return True
+
+    def __repr__(self):
+        return "MAX"
+
+
+MAX = _Max()
+
+
+def is_range(condition: Any) -> bool:
+    return isinstance(condition, tuple) and len(condition) == 2
+
+
+def predicate(field_name: str, condition: Any) -> Callable[[Any], bool]:
+    get = attrgetter(field_name)
+    if is_range(condition):
+        low, high = condition
+        return lambda record: low <= get(record) <= high
+    return lambda record: get(record) == condition
+
+
+@dataclass
+class AccessPath:
+    """Uso concreto de um índice para parte dos predicados."""
+    name: str
+    index: Any
+    covered: Tuple[str, ...]
+    estimated_rows: int
+    fetch: Callable[[], List[Any]]
+    scan_cost: float = 0.0  # Custo fixo além das linhas (ex.: percorrer um bitmap)
+
+
+@dataclass
+class QueryPlan:
+    strategy: str  # 'full_scan', 'index' ou 'intersection'
+    predicates: Dict[str, Any]
+    paths: List[AccessPath] = field(default_factory=list)
+    residual: List[str] = field(default_factory=list)
+    estimated_rows: float = 0.0
+    estimated_cost: float = 0.0
+    alternatives: Dict[str, float] = field(default_factory=dict)
+
+    def describe(self) -> str:
+        if self.strategy == 'full_scan':
+            access = "varredura completa"
+        else:
+            access = " ∩ ".join(f"{p.name}({p.estimated_rows})" for p in self.paths)
+        residual = f" + filtro {','.join(self.residual)}" if self.residual else ""
+        return f"{self.strategy}: {access}{residual} (~{self.estimated_rows:.0f} linhas, custo {self.estimated_cost:.0f})"
+
+
+def _index_name(fields: Tuple[str, ...], index: Any) -> str:
+    if isinstance(index, BitmapIndex):
+        kind = 'bitmap'
+    else:
+        kind = 'sorted' if isinstance(index, SortedIndex) else 'hash'
+    return f"{'+'.join(fields)}_{kind}"
+
+
+def access_path(fields: Tuple[str, ...], index: Any, predicates: Dict[str, Any]) -> Optional[AccessPath]:
+    """Como ``index`` (sobre ``fields``) pode atender ``predicates``, se puder."""
+    composite = len(fields) > 1
+    name = _index_name(fields, index)
+
+    if isinstance(index, HashIndex):
+        if not all(f in predicates and not is_range(predicates[f]) for f in fields):
+            return None
+        key = tuple(predicates[f] for f in fields) if composite else predicates[fields[0]]
+        rows = index.lookup(key)
+        return AccessPath(name, index, fields, len(rows), lambda: rows)
+
+    if isinstance(index, SortedIndex):
+        # Campos iniciais com igualdade e, opcionalmente, uma faixa no seguinte
+        equal = []
+        for f in fields:
+            if f not in predicates or is_range(predicates[f]):
+                break
+            equal.append(predicates[f])
+        k = len(equal)
+        range_field = fields[k] if k < len(fields) and fields[k] in predicates else None
+        if not equal and range_field is None:
+            return None
+
+        if not composite:
+            bounds = (equal[0], equal[0]) if equal else predicates[range_field]
+        elif range_field is not None:
+            low, high = predicates[range_field]
+            # Campos após o da faixa não podem excluir chaves no limite superior
+            tail = (MAX,) if k + 1 < len(fields) else ()
+            bounds = ((*equal, low), (*equal, high, *tail))
+        elif k == len(fields):
+            bounds = (tuple(equal), tuple(equal))
+        else:
+            bounds = (tuple(equal), (*equal, MAX))
+        covered = fields[:k] + ((range_field,) if range_field else ())
+        view = index.range(*bounds)
+        return AccessPath(name, index, covered, len(view), view.to_list)
+
+    if isinstance(index, BitmapIndex):
+        # Todas as igualdades em campos do índice viram um único E bit a bit
+        covered = tuple(f for f in fields if f in predicates and not is_range(predicates[f]))
+        if not covered:
+            return None
+        bitmap = index.match({f: predicates[f] for f in covered})
+        return AccessPath(_index_name(covered, index), index, covered, len(bitmap), bitmap.to_list,
+                          scan_cost=BITMAP_COST * len(index.rows))
+
+    return None
+
+
+def _estimate(paths: List[AccessPath], predicates: Dict[str, Any], total_rows: int) -> QueryPlan:
+    """Plano (e custo estimado) que usa ``paths`` e filtra o que eles não cobrem."""
+    n = max(total_rows, 1)
+    covered = {f for path in paths for f in path.covered}
+    residual = [f for f in predicates if f not in covered]
+
+    if not paths:
+        return QueryPlan('full_scan', predicates, [], residual, total_rows,
+                         total_rows * (ROW_COST + PREDICATE_COST * len(residual)))
+
+    # Seletividades independentes: linhas que sobram após a interseção
+    estimated = float(n)
+    for path in paths:
+        estimated *= path.estimated_rows / n
+    scan_cost = sum(path.scan_cost for path in paths)
+    if len(paths) == 1:
+        cost = scan_cost + LOOKUP_COST + paths[0].estimated_rows * (ROW_COST + PREDICATE_COST * len(residual))
+        return QueryPlan('index', predicates, paths, residual, estimated, cost)
+
+    smallest = min(path.estimated_rows for path in paths)
+    cost = (scan_cost + LOOKUP_COST * len(paths) + SET_COST * sum(path.estimated_rows for path in paths)
+            + smallest * ROW_COST + estimated * PREDICATE_COST * len(residual))
+    return QueryPlan('intersection', predicates, paths, residual, estimated, cost)
+
+
+def plan_query(indexes: List[Tuple[Tuple[str, ...], Any]], predicates: Dict[str, Any], total_rows: int) -> QueryPlan:
+    """Escolhe a estratégia de menor custo estimado para ``predicates``.
+
+    Parte do melhor índice isolado e acrescenta à interseção, do mais seletivo
+    para o menos, índices que cubram predicados novos enquanto o custo cair.
+    """
+    paths = [path for fields, index in indexes
+             if (path := access_path(fields, index, predicates)) is not None]
+    paths.sort(key=lambda p: p.estimated_rows)
+
+    full_scan = _estimate([], predicates, total_rows)
+    alternatives = {'full_scan': full_scan.estimated_cost}
+    plan = full_scan
+
+    if paths:
+        singles = [_estimate([path], predicates, total_rows) for path in paths]
+        best_single = min(singles, key=lambda p: p.estimated_cost)
+        alternatives['index'] = best_single.estimated_cost
+
+        current = best_single
+        for path in paths:
+            covered = {f for p in current.paths for f in p.covered}
+            if set(path.covered) <= covered:
+                continue
+            candidate = _estimate(current.paths + [path], predicates, total_rows)
+            alternatives['intersection'] = min(alternatives.get('intersection', candidate.estimated_cost),
+                                               candidate.estimated_cost)
+            if candidate.estimated_cost < current.estimated_cost:
+                current = candidate
+        if current.estimated_cost < plan.estimated_cost:
+            plan = current
+
+    plan.alternatives = alternatives
+    return plan
+
+
+def _combined_test(tests: List[Callable[[Any], bool]]) -> Callable[[Any], bool]:
+    if len(tests) == 1:
+        return tests[0]
+    return lambda record: all(test(record) for test in tests)
+
+
+def execute_plan(plan: QueryPlan, records: List[Any]) -> List[Any]:
+    tests = [predicate(f, plan.predicates[f]) for f in plan.residual]
+
+    if plan.strategy == 'full_scan':
+        rows = records
+    elif plan.strategy == 'index':
+        rows = plan.paths[0].fetch()
+    else:
+        # Do menor resultado para o maior; ids evitam o __hash__ em Python dos registros
+        fetched = sorted((path.fetch() for path in plan.paths), key=len)
+        ids = set(map(id, fetched[0]))
+        for rows in fetched[1:]:
+            ids.intersection_update(map(id, rows))
+            if not ids:
+                return []
+        rows = [record for record in fetched[0] if id(record) in ids]
+
+    if not tests:
+        return list(rows)
+    return list(filter(_combined_test(tests), rows))
@@ -0,0 +1,773 @@
+"""
+Índices secundários do sistema de cadastro de matrículas.
+"""
+
+import heapq
+import unicodedata
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain, islice
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import numpy as np
+from metrics import deep_sizeof
+
+
+class RangeView:
+    """Visão preguiçosa de um intervalo ``[start, stop)`` das linhas de um índice.
+
+    Não copia nada na criação: ``len`` é O(1) e iterar ou fatiar só toca as
+    linhas pedidas (ex.: a primeira página). A visão vale até a próxima
+    modificação do índice.
+    """
+
+    def __init__(self, rows: List[Any], start: int, stop: int):
+        self._rows = rows
+        self._start = start
+        self._stop = max(start, stop)
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __bool__(self) -> bool:
+        return self._stop > self._start
+
+    def __iter__(self) -> Iterator[Any]:
+        rows = self._rows
+        for i in range(self._start, self._stop):
+            yield rows[i]
+
+    def to_list(self) -> List[Any]:
+        """Materializa o intervalo inteiro (uma fatia da lista, em C)."""
+        return self._rows[self._start:self._stop]
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return list(self)[item]
+            return RangeView(self._rows, self._start + start, self._start + stop)
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("índice fora do intervalo")
+        return self._rows[self._start + item]
+
+    def __repr__(self):
+        return f"RangeView({len(self)} registros)"
+
+
+class Cursor(RangeView):
+    """Cursor preguiçoso e paginável sobre ``rows[start:stop]``.
+
+    Com ``predicate`` só as linhas que o satisfazem contam (varreduras); com
+    ``keys`` (a lista ordenada paralela a ``rows`` de um índice ordenado) a
+    paginação por chave retoma com bisect a partir do valor da última linha
+    entregue, sem percorrer as páginas anteriores. ``offset``/``limit`` criam
+    cursores novos sem tocar em linha nenhuma. Como ``RangeView``, vale até a
+    próxima modificação da estrutura de origem.
+    """
+
+    def __init__(self, rows: List[Any], start: int = 0, stop: Optional[int] = None,
+                 predicate: Optional[Callable[[Any], bool]] = None, keys: Optional[List[Any]] = None,
+                 skip: int = 0, limit: Optional[int] = None):
+        super().__init__(rows, start, len(rows) if stop is None else stop)
+        self._predicate = predicate
+        self._keys = keys
+        self._skip = skip
+        self._limit = limit
+        if predicate is None and skip:
+            # Sem filtro o deslocamento é aritmético
+            self._start = min(self._start + skip, self._stop)
+            self._skip = 0
+        if predicate is None and limit is not None:
+            self._stop = min(self._stop, self._start + limit)
+            self._limit = None
+
+    def _derive(self, skip: int = 0, limit: Optional[int] = None) -> 'Cursor':
+        if self._limit is not None:
+            remaining = max(self._limit - skip, 0)
+            limit = remaining if limit is None else min(limit, remaining)
+        return Cursor(self._rows, self._start, self._stop, self._predicate, self._keys,
+                      self._skip + skip, limit)
+
+    def offset(self, n: int) -> 'Cursor':
+        return self._derive(skip=n)
+
+    def limit(self, n: int) -> 'Cursor':
+        return self._derive(limit=n)
+
+    def _positions(self, start: int) -> Iterator[int]:
+        """Posições em ``rows`` (a partir de ``start``) das linhas do cursor."""
+        rows, predicate = self._rows, self._predicate
+        if predicate is None:
+            return iter(range(start, self._stop))
+        return (i for i in range(start, self._stop) if predicate(rows[i]))
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._predicate is None:
+            return super().__iter__()
+        rows = self._rows
+        positions = islice(self._positions(self._start), self._skip,
+                           None if self._limit is None else self._skip + self._limit)
+        return (rows[i] for i in positions)
+
+    def count(self) -> int:
+        """Número de linhas: O(1) sem filtro (vem do índice), senão uma passada sem materializar."""
+        if self._predicate is None:
+            return self._stop - self._start
+        total = max(sum(1 for _ in self._positions(self._start)) - self._skip, 0)
+        return total if self._limit is None else min(total, self._limit)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __bool__(self) -> bool:
+        return next(iter(self), None) is not None if self._predicate else super().__bool__()
+
+    def to_list(self) -> List[Any]:
+        if self._predicate is None:
+            return super().to_list()
+        return list(self)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice) and (item.step or 1) == 1 and (item.start or 0) >= 0 \
+                and (item.stop is None or item.stop >= 0):
+            start = item.start or 0
+            cursor = self.offset(start)
+            return cursor if item.stop is None else cursor.limit(max(item.stop - start, 0))
+        if self._predicate is None:
+            return super().__getitem__(item)
+        return self.to_list()[item]
+
+    def page(self, size: int, after: Any = None) -> Tuple[List[Any], Any]:
+        """Uma página de até ``size`` linhas e o marcador da seguinte (``None`` no fim).
+
+        Passe o marcador devolvido em ``after`` para continuar; ``offset``/``limit``
+        do cursor valem para a sequência de páginas inteira. Em cursores de índice
+        ordenado o marcador é ``(chave, repetições)`` da última linha e continua
+        válido após inserções e remoções em outras chaves; em cursores filtrados é
+        ``(posição, linhas já entregues)``, para respeitar o ``limit``; nos demais
+        é a posição na estrutura de origem.
+        """
+        rows, keys, predicate = self._rows, self._keys, self._predicate
+        delivered = 0
+        if after is None:
+            positions = islice(self._positions(self._start), self._skip, None)
+        elif predicate is not None:
+            position, delivered = after
+            positions = self._positions(position)
+        elif keys is not None:
+            key, ties = after
+            positions = self._positions(bisect_left(keys, key, self._start, self._stop) + ties)
+        else:
+            positions = self._positions(after)
+
+        # Sem filtro skip/limit já estão em start/stop; com filtro o limite é contado
+        if self._limit is not None:
+            size = min(size, self._limit - delivered)
+        if size <= 0:
+            return [], None
+        page = list(islice(positions, size))
+        delivered += len(page)
+        if len(page) < size or page[-1] + 1 >= self._stop or delivered == self._limit:
+            return [rows[i] for i in page], None
+        last = page[-1]
+        if predicate is not None:
+            return [rows[i] for i in page], (last + 1, delivered)
+        if keys is None:
+            return [rows[i] for i in page], last + 1
+        ties = last + 1 - bisect_left(keys, keys[last], self._start, last)
+        return [rows[i] for i in page], (keys[last], ties)
+
+    def __repr__(self):
+        return f"Cursor({'filtrado' if self._predicate else f'{len(self)} registros'})"
+
+
+class SortedIndex:
+    """Índice ordenado: lista de chaves ordenada e referências às linhas em paralelo.
+
+    Inserções e remoções vão para buffers e são incorporadas em lote na
+    próxima consulta: poucas pendências entram com ``insort``/``del``; muitas
+    (ex.: carga inicial ou rotatividade sem consultas) são aplicadas com uma
+    ordenação e uma intercalação ou uma única passada de filtro.
+    """
+
+    def __init__(self, key: Callable[[Any], Any], merge_ratio: int = 64, unique: bool = False):
+        """
+        Args:
+            key: Função que extrai a chave do registro (ex.: ``attrgetter('salario')``)
+            merge_ratio: Acima de ``len(chaves) / merge_ratio`` pendências, intercala
+                (ou filtra) em vez de inserir (ou remover) uma a uma
+            unique: Rejeita chaves repetidas (mantém um conjunto das chaves para
+                checar sem incorporar as pendências)
+        """
+        self.key = key
+        self.merge_ratio = merge_ratio
+        self.unique = unique
+        self.keys: List[Any] = []
+        self.rows: List[Any] = []
+        self._pending: List[Tuple[Any, Any]] = []
+        self._removed: List[Tuple[Any, Any]] = []
+        self._key_set: Set[Any] = set()
+
+    def __len__(self) -> int:
+        return len(self.keys) + len(self._pending) - len(self._removed)
+
+    def check(self, record: Any):
+        """Levanta ValueError se ``record`` violar a unicidade do índice."""
+        if self.unique and self.key(record) in self._key_set:
+            raise ValueError(f"Chave duplicada em índice único: {self.key(record)!r}")
+
+    def add(self, record: Any):
+        key = self.key(record)
+        if self.unique:
+            self.check(record)
+            self._key_set.add(key)
+        self._pending.append((key, record))
+
+    def build(self, records: Iterable[Any]):
+        """Reconstrói o índice a partir de ``records`` com uma única ordenação."""
+        records = list(records)
+        keys = list(map(self.key, records))
+        # Ordena posições (ints não entram no coletor de lixo, tuplas entrariam)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        if self.unique:
+            self._key_set = set(keys)
+            if len(self._key_set) != len(keys):
+                raise ValueError("Chaves duplicadas em índice único")
+        self.keys = [keys[i] for i in order]
+        self.rows = [records[i] for i in order]
+        self._pending = []
+        self._removed = []
+
+    def remove(self, record: Any):
+        """Remove ``record``, que deve estar indexado com a chave atual.
+
+        A entrada (chave, identidade) fica pendente até a próxima consulta;
+        remover e reinserir o mesmo objeto antes disso é seguro, pois as
+        pendências são aplicadas depois das inserções.
+        """
+        key = self.key(record)
+        self._removed.append((key, record))
+        self._key_set.discard(key)
+
+    def flush(self):
+        """Incorpora inserções e remoções pendentes (feito automaticamente nas consultas)."""
+        if self._pending:
+            self._merge_pending()
+        if self._removed:
+            self._apply_removed()
+
+    def _merge_pending(self):
+        pending = self._pending
+        self._pending = []
+        pending.sort(key=itemgetter(0))
+
+        if len(pending) * self.merge_ratio < len(self.keys):
+            keys, rows = self.keys, self.rows
+            for key, record in pending:
+                i = bisect_right(keys, key)
+                keys.insert(i, key)
+                rows.insert(i, record)
+            return
+
+        merged = list(heapq.merge(zip(self.keys, self.rows), pending, key=itemgetter(0)))
+        self.keys = [key for key, _ in merged]
+        self.rows = [record for _, record in merged]
+
+    def _apply_removed(self):
+        removed = self._removed
+        self._removed = []
+
+        if len(removed) * self.merge_ratio < len(self.keys):
+            keys, rows = self.keys, self.rows
+            for key, record in removed:
+                low, high = bisect_left(keys, key), bisect_right(keys, key)
+                # Chaves repetidas (ex.: nomes): procura a identidade em C, pelos ids
+                try:
+                    i = low + list(map(id, rows[low:high])).index(id(record))
+                except ValueError:
+                    raise KeyError(key) from None
+                del keys[i]
+                del rows[i]
+            return
+
+        # Muitas remoções: uma passada, descontando cada (id, chave) removido
+        counts: Dict[Tuple[int, Any], int] = {}
+        for key, record in removed:
+            counts[id(record), key] = counts.get((id(record), key), 0) + 1
+        keys, rows = [], []
+        for key, record in zip(self.keys, self.rows):
+            entry = (id(record), key)
+            if counts.get(entry):
+                counts[entry] -= 1
+                continue
+            keys.append(key)
+            rows.append(record)
+        if any(counts.values()):
+            raise KeyError("Remoção de registro que não estava no índice")
+        self.keys, self.rows = keys, rows
+
+    def range(self, low: Any, high: Any) -> Cursor:
+        """Linhas com ``low <= chave <= high`` em ordem de chave, em O(log n)."""
+        self.flush()
+        return Cursor(self.rows, bisect_left(self.keys, low), bisect_right(self.keys, high), keys=self.keys)
+
+    def prefix(self, prefix: str) -> Cursor:
+        """Linhas cuja chave (texto) começa com ``prefix``, em O(log n)."""
+        self.flush()
+        if not prefix:
+            return Cursor(self.rows, 0, len(self.rows), keys=self.keys)
+        # Limite exclusivo: o menor texto maior que todos os que começam com o prefixo
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return Cursor(self.rows, bisect_left(self.keys, prefix), bisect_left(self.keys, upper), keys=self.keys)
+
+    def lookup(self, value: Any) -> Cursor:
+        """Linhas com chave igual a ``value``."""
+        return self.range(value, value)
+
+    def memory_bytes(self, exclude: Tuple[type, ...] = ()) -> int:
+        self.flush()
+        return deep_sizeof(self, exclude=exclude)
+
+
+class HashIndex:
+    """Índice hash de um campo: valor -> registro (único) ou valor -> lista (multivalorado).
+
+    No índice multivalorado a remoção é O(1): o registro vira uma lápide
+    (``id`` guardado por chave) e a lista da chave é compactada em uma passada
+    quando metade dela é lápide ou na próxima consulta à chave.
+    """
+
+    def __init__(self, key: Callable[[Any], Any], unique: bool = False):
+        self.key = key
+        self.unique = unique
+        self.table: Dict[Any, Any] = {}
+        self._dead: Dict[Any, Set[int]] = {}  # chave -> ids removidos ainda na lista
+
+    def __len__(self) -> int:
+        if self.unique:
+            return len(self.table)
+        tombstones = sum(len(dead) for dead in self._dead.values())
+        return sum(len(rows) for rows in self.table.values()) - tombstones
+
+    def check(self, record: Any):
+        """Levanta ValueError se ``record`` violar a unicidade do índice."""
+        if self.unique and self.key(record) in self.table:
+            raise ValueError(f"Chave duplicada em índice único: {self.key(record)!r}")
+
+    def add(self, record: Any):
+        key = self.key(record)
+        if self.unique:
+            self.check(record)
+            self.table[key] = record
+            return
+        dead = self._dead.get(key)
+        if dead is not None and id(record) in dead:
+            # Removido e reinserido na mesma chave: a entrada ainda está na lista
+            dead.discard(id(record))
+            if not dead:
+                del self._dead[key]
+            return
+        rows = self.table.get(key)
+        if rows is None:
+            self.table[key] = [record]
+        else:
+            rows.append(record)
+
+    def build(self, records: Iterable[Any]):
+        """Reconstrói o índice em uma passada."""
+        # Atualiza o mesmo dicionário: quem guardou ``table`` continua vendo o índice
+        key = self.key
+        table = self.table
+        table.clear()
+        self._dead.clear()
+        if self.unique:
+            records = list(records)
+            table.update((key(record), record) for record in records)
+            if len(table) != len(records):
+                raise ValueError("Chaves duplicadas em índice único")
+            return
+        for record in records:
+            rows = table.get(key(record))
+            if rows is None:
+                table[key(record)] = [record]
+            else:
+                rows.append(record)
+
+    def remove(self, record: Any):
+        """Remove ``record``, que deve estar indexado com a chave atual."""
+        key = self.key(record)
+        if self.unique:
+            if self.table.get(key) is not record:
+                raise KeyError(key)
+            del self.table[key]
+            return
+        rows = self.table.get(key)
+        if rows is None or id(record) in self._dead.get(key, ()):
+            raise KeyError(key)
+        dead = self._dead.setdefault(key, set())
+        dead.add(id(record))
+        if len(dead) * 2 >= len(rows):
+            self.compact(key)
+
+    def compact(self, key: Any = None):
+        """Descarta as lápides de ``key`` (ou de todas as chaves)."""
+        keys = list(self._dead) if key is None else [key]
+        for key in keys:
+            dead = self._dead.pop(key, None)
+            if not dead:
+                continue
+            rows = self.table[key]
+            # Na mesma lista: referências já entregues continuam válidas
+            rows[:] = [row for row in rows if id(row) not in dead]
+            if not rows:
+                del self.table[key]
+
+    def lookup(self, value: Any) -> Cursor:
+        """Linhas com chave igual a ``value``.
+
+        Cursor sobre a lista da chave, como ``SortedIndex.lookup``: não copia e
+        não entrega a lista interna a quem chama.
+        """
+        if self.unique:
+            record = self.table.get(value)
+            return Cursor([] if record is None else [record])
+        if value in self._dead:
+            self.compact(value)
+        return Cursor(self.table.get(value, []))
+
+    def memory_bytes(self, exclude: Tuple[type, ...] = ()) -> int:
+        return deep_sizeof(self, exclude=exclude)
+
+
+class Bitmap:
+    """Conjunto de linhas de um ``BitmapIndex`` como inteiro (bit i = linha i).
+
+    ``&``, ``|``, ``-`` e ``~`` combinam conjuntos com operações bit a bit
+    sobre o inteiro inteiro (em C); ``len`` conta os bits sem materializar
+    nenhuma linha.
+    """
+
+    __slots__ = ('index', 'bits')
+
+    def __init__(self, index: 'BitmapIndex', bits: int):
+        self.index = index
+        self.bits = bits
+
+    def __and__(self, other: 'Bitmap') -> 'Bitmap':
+        return Bitmap(self.index, self.bits & other.bits)
+
+    def __or__(self, other: 'Bitmap') -> 'Bitmap':
+        return Bitmap(self.index, self.bits | other.bits)
+
+    def __sub__(self, other: 'Bitmap') -> 'Bitmap':
+        return Bitmap(self.index, self.bits & ~other.bits)
+
+    def __invert__(self) -> 'Bitmap':
+        # Complemento dentro das linhas vivas (o inteiro não tem tamanho fixo)
+        return Bitmap(self.index, self.index.alive & ~self.bits)
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.to_list())
+
+    def row_ids(self) -> np.ndarray:
+        """Posições dos bits ligados, em ordem crescente."""
+        if not self.bits:
+            return np.empty(0, dtype=np.intp)
+        raw = self.bits.to_bytes((self.bits.bit_length() + 7) // 8, 'little')
+        return np.flatnonzero(np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder='little'))
+
+    def to_list(self) -> List[Any]:
+        """Registros do conjunto, em ordem de inserção."""
+        rows = self.index.rows
+        return [rows[i] for i in self.row_ids().tolist()]
+
+    def __repr__(self):
+        return f"Bitmap({len(self)} registros)"
+
+
+class BitmapIndex:
+    """Índices bitmap de campos com poucos valores distintos (status, cargo, ...).
+
+    Cada registro recebe uma posição fixa e cada valor de cada campo um
+    inteiro Python com o bit da posição ligado (~n/8 bytes por valor). Todos
+    os campos compartilham as posições, então filtros com vários predicados
+    e contagens por valor viram operações bit a bit. Inserções ficam
+    pendentes e entram em lote na próxima consulta, com um ``bytearray`` por
+    valor em vez de um deslocamento de inteiro grande por registro. Remoções
+    deixam a posição vaga; quando metade das posições está vaga o índice é
+    renumerado (bitmaps obtidos antes disso deixam de valer).
+    """
+
+    def __init__(self, fields: Tuple[str, ...]):
+        self.fields = fields
+        self.key = attrgetter(*fields)
+        self._getters = {field: attrgetter(field) for field in fields}
+        self.rows: List[Any] = []
+        self.row_ids: Dict[int, int] = {}  # id(registro) -> posição
+        self.bitmaps: Dict[str, Dict[Any, int]] = {field: {} for field in fields}
+        self.alive = 0
+        self._flushed = 0  # Posições abaixo disto já estão nos bitmaps
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def add(self, record: Any):
+        self.row_ids[id(record)] = len(self.rows)
+        self.rows.append(record)
+
+    def build(self, records: Iterable[Any]):
+        """Reconstrói todos os bitmaps em uma passada por campo."""
+        self.rows = list(records)
+        self.row_ids = {id(record): i for i, record in enumerate(self.rows)}
+        self.bitmaps = {field: {} for field in self.fields}
+        self.alive = 0
+        self._flushed = 0
+        self.flush()
+
+    def flush(self):
+        """Liga os bits das inserções pendentes (feito automaticamente nas consultas)."""
+        start, stop = self._flushed, len(self.rows)
+        if start == stop:
+            return
+        size = (stop - start + 7) // 8
+        pending = self.rows[start:stop]
+        for field, getter in self._getters.items():
+            buffers: Dict[Any, bytearray] = {}
+            for offset, record in enumerate(pending):
+                value = getter(record)
+                buffer = buffers.get(value)
+                if buffer is None:
+                    buffer = buffers[value] = bytearray(size)
+                buffer[offset >> 3] |= 1 << (offset & 7)
+            bitmaps = self.bitmaps[field]
+            for value, buffer in buffers.items():
+                bitmaps[value] = bitmaps.get(value, 0) | (int.from_bytes(buffer, 'little') << start)
+        self.alive |= ((1 << (stop - start)) - 1) << start
+        self._flushed = stop
+
+    def remove(self, record: Any):
+        """Desliga os bits de ``record``; a posição fica vaga (``None``)."""
+        self.flush()
+        row_id = self.row_ids.pop(id(record), None)
+        if row_id is None:
+            raise KeyError(record)
+        bit = 1 << row_id
+        for field, getter in self._getters.items():
+            bitmaps = self.bitmaps[field]
+            value = getter(record)
+            bitmaps[value] ^= bit
+            if not bitmaps[value]:
+                del bitmaps[value]
+        self.alive ^= bit
+        self.rows[row_id] = None
+        if len(self.rows) > 64 and len(self.row_ids) * 2 < len(self.rows):
+            self.build(row for row in self.rows if row is not None)
+
+    def bitmap(self, field: str, value: Any) -> Bitmap:
+        """Linhas com ``field == value``."""
+        self.flush()
+        return Bitmap(self, self.bitmaps[field].get(value, 0))
+
+    def any_of(self, field: str, values: Iterable[Any]) -> Bitmap:
+        """Linhas com ``field`` em ``values`` (OU dos bitmaps)."""
+        self.flush()
+        bitmaps = self.bitmaps[field]
+        bits = 0
+        for value in values:
+            bits |= bitmaps.get(value, 0)
+        return Bitmap(self, bits)
+
+    def all(self) -> Bitmap:
+        self.flush()
+        return Bitmap(self, self.alive)
+
+    def match(self, predicates: Dict[str, Any]) -> Bitmap:
+        """E dos bitmaps de igualdade ``campo=valor`` (campos deste índice)."""
+        result = self.all()
+        for field, value in predicates.items():
+            result = result & self.bitmap(field, value)
+        return result
+
+    def count(self, field: str, value: Any) -> int:
+        return len(self.bitmap(field, value))
+
+    def distribution(self, field: str) -> Dict[Any, int]:
+        """Contagem de registros por valor de ``field``."""
+        self.flush()
+        return {value: bits.bit_count() for value, bits in self.bitmaps[field].items()}
+
+    def memory_bytes(self, exclude: Tuple[type, ...] = ()) -> int:
+        self.flush()
+        return deep_sizeof(self, exclude=exclude)
+
+
+@dataclass
+class IndexDefinition:
+    """Declaração de um índice secundário sobre um campo do registro.
+
+    Com uma tupla de campos o índice é composto e a chave é a tupla dos
+    valores; um índice ordenado composto atende igualdade nos campos iniciais
+    e faixa no campo seguinte.
+    """
+    field: Union[str, Tuple[str, ...]]
+    kind: str = 'hash'  # 'hash' (igualdade) ou 'sorted' (igualdade, faixas e prefixos)
+    unique: bool = False
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return self.field if isinstance(self.field, tuple) else (self.field,)
+
+    @property
+    def name(self) -> str:
+        return f"{'+'.join(self.fields)}_{self.kind}"
+
+    def create(self):
+        key = attrgetter(*self.fields)
+        if self.kind == 'hash':
+            return HashIndex(key, unique=self.unique)
+        if self.kind == 'sorted':
+            return SortedIndex(key, unique=self.unique)
+        raise ValueError(f"Tipo de índice desconhecido: {self.kind}")
+
+
+@lru_cache(maxsize=65536)
+def fold_text(text: str) -> str:
+    """Normaliza para busca: minúsculas e sem acentos ("Antônio" -> "antonio").
+
+    Memorizada: nomes se repetem muito e a normalização Unicode é cara.
+    """
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Índice invertido de trigramas para busca por substring.
+
+    Os textos são normalizados uma vez na inserção (``fold_text``) e agrupados
+    por valor distinto: as listas de postagem apontam para valores distintos
+    (nomes repetem muito), e cada valor guarda as linhas que o possuem (em
+    um dicionário por ``id``, para remover em O(1)). Uma
+    consulta intersecta as postagens dos seus trigramas, da menor para a
+    maior, e só confere a substring nos candidatos restantes.
+
+    Um valor sem linhas sai das postagens na hora; sua posição em ``values``
+    fica vaga (``None``) até que metade delas esteja vaga, quando os valores
+    são renumerados.
+    """
+
+    def __init__(self, key: Callable[[Any], str]):
+        self.key = key
+        self.value_ids: Dict[str, int] = {}
+        self.values: List[str] = []
+        self.value_rows: List[Dict[int, Any]] = []
+        self.postings: Dict[str, Set[int]] = {}
+        self.total_rows = 0
+        self._vacant = 0  # Posições de ``values`` sem valor
+
+    def __len__(self) -> int:
+        return self.total_rows
+
+    def add(self, record: Any):
+        folded = fold_text(self.key(record))
+        value_id = self.value_ids.get(folded)
+        if value_id is None:
+            value_id = self.value_ids[folded] = len(self.values)
+            self.values.append(folded)
+            self.value_rows.append({})
+            for gram in trigrams(folded):
+                self.postings.setdefault(gram, set()).add(value_id)
+        self.value_rows[value_id][id(record)] = record
+        self.total_rows += 1
+
+    def build(self, records: Iterable[Any]):
+        """Reconstrói o índice, normalizando e indexando cada valor distinto uma vez."""
+        self.value_ids = {}
+        self.values = []
+        self.value_rows = []
+        self.postings = {}
+        self.total_rows = 0
+        self._vacant = 0
+        key = self.key
+        groups: Dict[str, List[Any]] = {}
+        for record in records:
+            rows = groups.get(key(record))
+            if rows is None:
+                groups[key(record)] = [record]
+            else:
+                rows.append(record)
+        for value, rows in groups.items():
+            self.add(rows[0])
+            value_rows = self.value_rows[self.value_ids[fold_text(value)]]
+            value_rows.update((id(record), record) for record in rows[1:])
+            self.total_rows += len(rows) - 1
+
+    def remove(self, record: Any):
+        folded = fold_text(self.key(record))
+        value_id = self.value_ids.get(folded)
+        if value_id is None or self.value_rows[value_id].pop(id(record), None) is None:
+            raise KeyError(self.key(record))
+        self.total_rows -= 1
+        if not self.value_rows[value_id]:
+            self._drop_value(folded, value_id)
+
+    def _drop_value(self, folded: str, value_id: int):
+        """Tira das postagens um valor que ficou sem linhas."""
+        for gram in trigrams(folded):
+            posting = self.postings[gram]
+            posting.discard(value_id)
+            if not posting:
+                del self.postings[gram]
+        del self.value_ids[folded]
+        self.values[value_id] = None
+        self._vacant += 1
+        if self._vacant * 2 > len(self.values):
+            self._renumber()
+
+    def _renumber(self):
+        """Descarta as posições vagas, mantendo a ordem dos valores."""
+        live = [(value, rows) for value, rows in zip(self.values, self.value_rows) if value is not None]
+        self.values = [value for value, _ in live]
+        self.value_rows = [rows for _, rows in live]
+        self.value_ids = {value: value_id for value_id, value in enumerate(self.values)}
+        self.postings = {}
+        for value_id, value in enumerate(self.values):
+            for gram in trigrams(value):
+                self.postings.setdefault(gram, set()).add(value_id)
+        self._vacant = 0
+
+    def memory_bytes(self, exclude: Tuple[type, ...] = ()) -> int:
+        return deep_sizeof(self, exclude=exclude)
+
+    def _candidates(self, query: str) -> Iterable[int]:
+        grams = trigrams(query)
+        if not grams:
+            # Consultas com menos de 3 caracteres: confere todos os valores distintos
+            return [value_id for value_id, value in enumerate(self.values) if value is not None]
+        postings = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return candidates
+
+    def search(self, text: str) -> List[Any]:
+        """Linhas cujo valor contém ``text`` (sem diferenciar maiúsculas e acentos)."""
+        query = fold_text(text)
+        values = self.values
+        matches = sorted(value_id for value_id in self._candidates(query) if query in values[value_id])
+        return list(chain.from_iterable(self.value_rows[value_id].values() for value_id in matches))
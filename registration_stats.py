@@ -0,0 +1,244 @@
+"""
+Estatísticas incrementais do sistema de cadastro de matrículas.
+
+Os agregados são atualizados a cada inserção, alteração e remoção, de modo
+que ``get_statistics`` custa O(1) em relação ao número de registros (só
+depende do número de valores distintos e de faixas do esboço de quantis).
+"""
+
+import heapq
+import math
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Tuple
+from metrics import deep_sizeof
+
+
+class RunningMoments:
+    """Contagem, soma, média e variância pelo algoritmo de Welford (com remoção)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0  # Soma dos quadrados dos desvios em relação à média
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def build(self, values: List[float]):
+        """Estado equivalente a ``add`` de cada valor, em duas passadas."""
+        self.count = len(values)
+        self.total = math.fsum(values)
+        self.mean = self.total / self.count if values else 0.0
+        mean = self.mean
+        self._m2 = math.fsum((value - mean) ** 2 for value in values)
+
+    def remove(self, value: float):
+        """Desfaz um ``add(value)`` (Welford ao contrário)."""
+        if self.count <= 1:
+            self.__init__()
+            return
+        self.count -= 1
+        self.total -= value
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self._m2 = max(0.0, self._m2 - delta * (value - self.mean))
+
+    @property
+    def variance(self) -> float:
+        """Variância populacional (como ``np.var``)."""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class LazyMinMax:
+    """Mínimo e máximo sob remoções: dois heaps com remoção preguiçosa.
+
+    Removidos continuam nos heaps e só saem quando chegam ao topo; quando os
+    heaps passam do dobro dos valores vivos eles são reconstruídos.
+    """
+
+    def __init__(self):
+        self._live: Dict[float, int] = {}
+        self._min_heap: List[float] = []
+        self._max_heap: List[float] = []  # Valores negados
+
+    def add(self, value: float):
+        self._live[value] = self._live.get(value, 0) + 1
+        heapq.heappush(self._min_heap, value)
+        heapq.heappush(self._max_heap, -value)
+
+    def build(self, values: List[float]):
+        self._live = {}
+        for value in values:
+            self._live[value] = self._live.get(value, 0) + 1
+        self._min_heap = list(self._live)
+        heapq.heapify(self._min_heap)
+        self._max_heap = [-value for value in self._live]
+        heapq.heapify(self._max_heap)
+
+    def remove(self, value: float):
+        count = self._live[value]
+        if count == 1:
+            del self._live[value]
+        else:
+            self._live[value] = count - 1
+        if len(self._min_heap) > 2 * len(self._live) + 64:
+            self._min_heap = list(self._live)
+            heapq.heapify(self._min_heap)
+            self._max_heap = [-value for value in self._live]
+            heapq.heapify(self._max_heap)
+
+    def min(self) -> float:
+        heap = self._min_heap
+        while heap and heap[0] not in self._live:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def max(self) -> float:
+        heap = self._max_heap
+        while heap and -heap[0] not in self._live:
+            heapq.heappop(heap)
+        return -heap[0] if heap else None
+
+
+class QuantileSketch:
+    """Esboço de quantis com erro relativo limitado (faixas logarítmicas, à la DDSketch).
+
+    Cada valor positivo cai na faixa ``ceil(log_gamma(x))``; o quantil devolvido
+    tem erro relativo de no máximo ``relative_accuracy``. Como as faixas são só
+    contadores, remover é tão barato quanto inserir, e o tamanho depende da
+    amplitude dos valores, não da quantidade.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0  # Valores <= 0
+        self.count = 0
+
+    def _bucket(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float):
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        bucket = self._bucket(value)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def remove(self, value: float):
+        self.count -= 1
+        if value <= 0:
+            self.zero_count -= 1
+            return
+        bucket = self._bucket(value)
+        if self.buckets[bucket] == 1:
+            del self.buckets[bucket]
+        else:
+            self.buckets[bucket] -= 1
+
+    def quantile(self, q: float) -> float:
+        """Valor aproximado do quantil ``q`` (0 a 1)."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if rank < seen:
+                # Ponto da faixa (gamma^(i-1), gamma^i] com erro relativo <= alfa
+                return 2 * self.gamma ** bucket / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class RegistrationStatistics:
+    """Agregados do cadastro mantidos como um índice (``add``/``remove``/``build``).
+
+    A chave é a tupla dos campos acompanhados, então ``update_record`` só
+    atualiza os agregados quando algum deles muda.
+    """
+
+    def __init__(self, value_field: str = 'salario',
+                 count_fields: Tuple[str, ...] = ('codigo_setor', 'status', 'cargo', 'nivel')):
+        self.value_field = value_field
+        self.count_fields = count_fields
+        self.key = attrgetter(value_field, *count_fields)
+        self._value = attrgetter(value_field)
+        self._count_getters = [(field, attrgetter(field)) for field in count_fields]
+        self.build([])
+
+    def __len__(self) -> int:
+        return self.moments.count
+
+    def add(self, record: Any):
+        value = self._value(record)
+        self.moments.add(value)
+        self.extremes.add(value)
+        self.sketch.add(value)
+        for field, getter in self._count_getters:
+            counts = self.counters[field]
+            key = getter(record)
+            counts[key] = counts.get(key, 0) + 1
+
+    def remove(self, record: Any):
+        value = self._value(record)
+        self.moments.remove(value)
+        self.extremes.remove(value)
+        self.sketch.remove(value)
+        for field, getter in self._count_getters:
+            counts = self.counters[field]
+            key = getter(record)
+            if counts[key] == 1:
+                del counts[key]
+            else:
+                counts[key] -= 1
+
+    def build(self, records: Iterable[Any]):
+        """Recalcula tudo em lote (usado na carga em massa)."""
+        self.moments = RunningMoments()
+        self.extremes = LazyMinMax()
+        self.sketch = QuantileSketch()
+        self.counters: Dict[str, Dict[Any, int]] = {field: {} for field in self.count_fields}
+        records = list(records)
+        if not records:
+            return
+
+        values = [self._value(record) for record in records]
+        self.moments.build(values)
+        self.extremes.build(values)
+        for value in values:
+            self.sketch.add(value)
+        for field, getter in self._count_getters:
+            counts = self.counters[field]
+            for record in records:
+                key = getter(record)
+                counts[key] = counts.get(key, 0) + 1
+
+    def distribution(self, field: str) -> Dict[Any, int]:
+        return dict(self.counters[field])
+
+    def value_stats(self) -> Dict[str, float]:
+        """Média, mediana (aproximada), desvio padrão, mínimo e máximo."""
+        return {
+            'mean': self.moments.mean,
+            'median': self.sketch.quantile(0.5),
+            'std': self.moments.std,
+            'min': self.extremes.min(),
+            'max': self.extremes.max()
+        }
+
+    def memory_bytes(self, exclude: Tuple[type, ...] = ()) -> int:
+        return deep_sizeof(self, exclude=exclude)
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Suíte de regressão de desempenho.
+
+Executa um perfil de benchmark fixo e rápido e compara cada célula
+(estrutura, parâmetros, operação) com um baseline salvo, usando o teste de
+Mann-Whitney U (bilateral) sobre as medianas das repetições combinado com um
+limiar de tamanho de efeito sobre a razão das medianas. Células que regridem
+são medidas de novo e só reprovam se a regressão se repetir. Emite um
+veredito em JSON e uma tabela de diferenças.
+
+Uso:
+    python regression.py --update-baseline   # grava o baseline atual
+    python regression.py                     # compara com o baseline
+
+O baseline é específico da máquina e não é versionado: em cada host de CI,
+grave-o com ``--update-baseline`` no commit de referência (ex.: a branch
+principal) e compare os commits seguintes no mesmo host. Regrave sempre que
+``PROFILE`` mudar ou quando uma mudança de desempenho for intencional.
+"""
+
+import sys
+import json
+import math
+import random
+import time
+import platform
+import argparse
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from tabulate import tabulate
+from experiments import ExperimentRunner, ExperimentResult
+from models import DataGenerator
+from workloads import SearchWorkload
+
+
+# Perfil fixo: pequeno o bastante para rodar em segundos, com rodadas suficientes
+# para o teste estatístico. Todas as opções do ExperimentRunner ficam fixadas
+# aqui (os padrões do runner podem mudar); o perfil é gravado no baseline e
+# comparado na carga
+PROFILE = {
+    'data_sizes': [2000],
+    # Repetições do perfil inteiro, cada uma num processo novo, x rodadas por repetição
+    'repeats': 8,
+    'num_rounds': 5,
+    'warmup_rounds': 2,
+    'seed': 42,
+    'use_realistic_data': False,
+    'workload': {'distribution': 'uniform', 'miss_ratio': 0.0},
+    'runner': {
+        'num_searches': 1000,
+        'include_baselines': False,
+        'shuffle_tree_inserts': True,
+        'measure_fast': True,
+        # Só os tempos entram na comparação; memória, profilers e linha do tempo
+        # ficam desligados para não alterar as rodadas
+        'measure_memory': False,
+        'profile_allocations': False,
+        'sampling_profile_dir': None,
+        'sampling_interval': 0.001,
+        'memory_timeline_interval': None,
+    },
+}
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_VERDICT = "regression_verdict.json"
+
+
+def cell_key(result: ExperimentResult) -> str:
+    """Identificador estável de uma célula do benchmark."""
+    params = {k: v for k, v in result.parameters.items() if k in ('M', 'hash_function')}
+    label = ",".join(f"{k}={v}" for k, v in sorted(params.items()))
+    return f"{result.structure_name}[{label}]|{result.operation}|N={result.data_size}"
+
+
+def calibrate(repeats: int = 7) -> float:
+    """Menor tempo de uma carga de referência fixa em Python puro.
+
+    Serve para normalizar as amostras pela velocidade da máquina no momento da
+    medição. O mínimo é a estatística menos afetada por interferência de
+    outros processos (só pode ser inflado, nunca reduzido, por elas).
+    """
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        table = {}
+        for i in range(20000):
+            table[(i * 2654435761) % 100003] = i
+        sum(table.values())
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+
+class CalibratedRunner(ExperimentRunner):
+    """ExperimentRunner que mede a calibração da máquina em volta de cada célula.
+
+    A calibração fica intercalada com as células, no mesmo processo, então a
+    normalização acompanha variações de velocidade ao longo da execução.
+    """
+
+    def __init__(self, *args, normalize: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.normalize = normalize
+        self.calibrations: List[float] = []  # Paralela a ``results``
+
+    def _run_profiled(self, experiment, *args):
+        first_result = len(self.results)
+        calibration = calibrate() if self.normalize else 1.0
+        super()._run_profiled(experiment, *args)
+        if self.normalize:
+            calibration = min(calibration, calibrate())
+        self.calibrations.extend([calibration] * (len(self.results) - first_result))
+
+
+def _run_repeat(profile: Dict[str, Any], normalize: bool) -> Dict[str, List[float]]:
+    """Uma repetição do perfil (aquecimento + rodadas), já normalizada por célula."""
+
+    def make_runner(num_rounds: int) -> CalibratedRunner:
+        random.seed(profile['seed'])
+        return CalibratedRunner(
+            data_sizes=profile['data_sizes'],
+            num_rounds=num_rounds,
+            data_generator=DataGenerator(use_realistic_data=profile['use_realistic_data']),
+            workload=SearchWorkload(seed=profile['seed'], **profile['workload']),
+            metrics_registry=None,
+            normalize=normalize,
+            **profile['runner']
+        )
+
+    # Aquecimento descartado (caches, alocador e frequência da CPU)
+    if profile.get('warmup_rounds'):
+        make_runner(profile['warmup_rounds']).run_all_experiments()
+
+    samples: Dict[str, List[float]] = {}
+    runner = make_runner(profile['num_rounds'])
+    for result, calibration in zip(runner.run_all_experiments(), runner.calibrations):
+        key = cell_key(result)
+        samples[key] = [round_data['execution_time'] / calibration for round_data in result.rounds]
+        # Tempos do modo rápido (sem contagem de iterações) viram células próprias
+        fast = [round_data['fast_execution_time'] / calibration for round_data in result.rounds
+                if 'fast_execution_time' in round_data]
+        if fast:
+            structure, operation, size = key.split('|')
+            samples[f"{structure}|{operation}:fast|{size}"] = fast
+    return samples
+
+
+def run_profile(profile: Dict[str, Any] = None, normalize: bool = True) -> Dict[str, Any]:
+    """Executa o perfil e retorna as amostras por célula.
+
+    O perfil roda ``repeats`` vezes, cada uma num interpretador novo: a
+    variação entre processos (layout de memória, estado do alocador) costuma
+    superar a variação entre rodadas de um mesmo processo, e só aparece no
+    ruído do baseline se as repetições também mudarem de processo. Cada
+    repetição passa por todas as células, e as amostras são divididas pela
+    calibração medida em volta da própria célula (tempos em unidades de
+    calibração).
+
+    Returns:
+        ``samples`` (todas as rodadas de todas as repetições) e
+        ``repeat_medians`` (a mediana de cada repetição, a unidade comparada
+        por ``compare``) por célula
+    """
+    profile = profile or PROFILE
+    samples: Dict[str, List[float]] = {}
+    repeat_medians: Dict[str, List[float]] = {}
+
+    context = multiprocessing.get_context('spawn')
+    for _ in range(profile['repeats']):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            repeat = pool.submit(_run_repeat, profile, normalize).result()
+        for key, values in repeat.items():
+            samples.setdefault(key, []).extend(values)
+            repeat_medians.setdefault(key, []).append(float(np.median(values)))
+    return {'samples': samples, 'repeat_medians': repeat_medians}
+
+
+def noise_floors(repeat_medians: Dict[str, List[float]]) -> Dict[str, float]:
+    """Ruído relativo de cada célula no baseline: amplitude das medianas das repetições.
+
+    Uma diferença menor que essa amplitude já aparece entre repetições do
+    mesmo código, então não é tratada como mudança.
+    """
+    floors = {}
+    for key, medians in repeat_medians.items():
+        center = float(np.median(medians))
+        floors[key] = (max(medians) - min(medians)) / center if center > 0 else 0.0
+    return floors
+
+
+def mann_whitney_u(a: List[float], b: List[float]) -> Tuple[float, float]:
+    """Teste de Mann-Whitney U bilateral (aproximação normal com correção de empates).
+
+    Returns:
+        Tupla (estatística U de ``a``, p-valor)
+    """
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 0.0, 1.0
+
+    combined = np.concatenate([np.asarray(a, dtype=float), np.asarray(b, dtype=float)])
+    order = np.argsort(combined, kind='mergesort')
+    ranks = np.empty(len(combined))
+    sorted_values = combined[order]
+
+    # Postos médios para valores empatados
+    tie_term = 0.0
+    i = 0
+    while i < len(sorted_values):
+        j = i
+        while j + 1 < len(sorted_values) and sorted_values[j + 1] == sorted_values[i]:
+            j += 1
+        ranks[order[i:j + 1]] = (i + j) / 2.0 + 1
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+
+    u1 = ranks[:n1].sum() - n1 * (n1 + 1) / 2.0
+    mean_u = n1 * n2 / 2.0
+    n = n1 + n2
+    var_u = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if var_u <= 0:
+        return u1, 1.0
+
+    # Correção de continuidade
+    z = (abs(u1 - mean_u) - 0.5) / math.sqrt(var_u)
+    p_value = math.erfc(max(z, 0.0) / math.sqrt(2))
+    return u1, min(p_value, 1.0)
+
+
+def compare(baseline: Dict[str, List[float]], current: Dict[str, List[float]],
+            alpha: float = 0.01, threshold: float = 0.10, scale: float = 1.0,
+            noise_floor: Dict[str, float] = None) -> Dict[str, Any]:
+    """Compara amostras atuais com o baseline.
+
+    Uma célula só é regressão (ou melhoria) se a diferença for estatisticamente
+    significativa (p < alpha) E a razão das medianas ultrapassar o limiar da
+    célula: ``threshold`` ou, se maior, o ruído da célula (``noise_floor``,
+    ver ``noise_floors``). ``scale`` é a razão de velocidade
+    da máquina (atual / baseline) pela qual as amostras atuais são divididas
+    antes da comparação.
+    """
+    noise_floor = noise_floor or {}
+    cells = []
+    for key in sorted(set(baseline) | set(current)):
+        base, cur = baseline.get(key), current.get(key)
+        if cur:
+            cur = [value / scale for value in cur]
+        if not base or not cur:
+            cells.append({'cell': key, 'status': 'missing_in_baseline' if not base else 'missing_in_current'})
+            continue
+
+        base_median = float(np.median(base))
+        cur_median = float(np.median(cur))
+        ratio = cur_median / base_median if base_median > 0 else float('inf')
+        _, p_value = mann_whitney_u(cur, base)
+        cell_threshold = max(threshold, noise_floor.get(key, 0.0))
+
+        if p_value < alpha and ratio > 1 + cell_threshold:
+            status = 'regression'
+        elif p_value < alpha and ratio < 1 / (1 + cell_threshold):
+            status = 'improvement'
+        else:
+            status = 'unchanged'
+
+        cells.append({
+            'cell': key,
+            'status': status,
+            'baseline_median': base_median,
+            'current_median': cur_median,
+            'ratio': ratio,
+            'threshold': cell_threshold,
+            'p_value': p_value
+        })
+
+    regressions = [c['cell'] for c in cells if c['status'] == 'regression']
+    return {
+        'verdict': 'fail' if regressions else 'pass',
+        'alpha': alpha,
+        'threshold': threshold,
+        'scale': scale,
+        'regressions': regressions,
+        'cells': cells
+    }
+
+
+def compare_measurement(baseline: Dict[str, Any], measurement: Dict[str, Any],
+                        alpha: float = 0.01, threshold: float = 0.10) -> Dict[str, Any]:
+    """Compara duas medições de ``measure`` pelas medianas das repetições.
+
+    Cada repetição roda num processo próprio, então as medianas das repetições
+    são as observações independentes. O ruído de cada célula é o maior entre
+    baseline e medição atual (uma lentidão uniforme desloca as medianas sem
+    espalhá-las).
+    """
+    base_floor = noise_floors(baseline['repeat_medians'])
+    cur_floor = noise_floors(measurement['repeat_medians'])
+    floor = {key: max(base_floor.get(key, 0.0), cur_floor.get(key, 0.0))
+             for key in set(base_floor) | set(cur_floor)}
+    return compare(baseline['repeat_medians'], measurement['repeat_medians'],
+                   alpha=alpha, threshold=threshold, noise_floor=floor)
+
+
+def print_diff_table(verdict: Dict[str, Any]):
+    rows = []
+    for c in verdict['cells']:
+        if 'ratio' not in c:
+            rows.append({'Célula': c['cell'], 'Status': c['status']})
+            continue
+        structure, operation, size = c['cell'].split('|')
+        rows.append({
+            'Estrutura': structure,
+            'Operação': operation,
+            'N': size[2:],
+            'Baseline': f"{c['baseline_median']:.3e}",
+            'Atual': f"{c['current_median']:.3e}",
+            'Δ': f"{(c['ratio'] - 1) * 100:+.1f}%",
+            'Limiar': f"{c['threshold']:.0%}",
+            'p-valor': f"{c['p_value']:.4f}",
+            'Status': c['status']
+        })
+    print(tabulate(rows, headers='keys', tablefmt='grid'))
+    unit = "unidades de calibração" if verdict.get('normalized', True) else "segundos"
+    print(f"\nVeredito: {verdict['verdict'].upper()} "
+          f"(alpha={verdict['alpha']}, limiar mínimo={verdict['threshold']:.0%}, tempos em {unit})")
+
+
+def environment_info() -> Dict[str, str]:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'timestamp': datetime.now().isoformat(timespec='seconds')
+    }
+
+
+def measure(profile: Dict[str, Any] = None, normalize: bool = True) -> Dict[str, Any]:
+    """Executa o perfil, com as amostras normalizadas pela calibração de cada célula."""
+    return {'normalized': normalize, **run_profile(profile, normalize=normalize)}
+
+
+def save_baseline(measurement: Dict[str, Any], filename: str = DEFAULT_BASELINE):
+    with open(filename, 'w') as f:
+        json.dump({'profile': PROFILE, 'environment': environment_info(), **measurement}, f, indent=2)
+    print(f"Baseline salvo em: {filename}")
+
+
+def load_baseline(filename: str = DEFAULT_BASELINE) -> Dict[str, Any]:
+    with open(filename) as f:
+        data = json.load(f)
+    if data.get('profile') != PROFILE:
+        print("Aviso: o baseline foi gravado com outro perfil de benchmark")
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de regressão de desempenho")
+    parser.add_argument('--update-baseline', action='store_true', help="grava o baseline com o código atual")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="arquivo de baseline")
+    parser.add_argument('--output', default=DEFAULT_VERDICT, help="arquivo JSON do veredito")
+    parser.add_argument('--alpha', type=float, default=0.01, help="nível de significância")
+    parser.add_argument('--threshold', type=float, default=0.10, help="variação mínima da mediana (ex.: 0.10 = 10%%)")
+    parser.add_argument('--no-confirm', dest='confirm', action='store_false',
+                        help="não mede de novo para confirmar as regressões")
+    parser.add_argument('--no-normalize', action='store_true', help="não normaliza pela calibração da máquina")
+    args = parser.parse_args()
+
+    measurement = measure(normalize=not args.no_normalize)
+
+    if args.update_baseline:
+        save_baseline(measurement, args.baseline)
+        return
+
+    try:
+        baseline = load_baseline(args.baseline)
+    except FileNotFoundError:
+        print(f"Baseline {args.baseline} não encontrado. Execute com --update-baseline primeiro.")
+        sys.exit(2)
+
+    if baseline.get('normalized') != measurement['normalized'] or 'repeat_medians' not in baseline:
+        print(f"Baseline {args.baseline} incompatível (normalização ou formato). "
+              "Regrave com --update-baseline.")
+        sys.exit(2)
+
+    verdict = compare_measurement(baseline, measurement, args.alpha, args.threshold)
+    if verdict['regressions'] and args.confirm:
+        # Confirmação: mede de novo e só reprova as células que regridem nas duas
+        # medições (um surto de carga na máquina raramente atinge a mesma célula duas vezes)
+        print(f"Regressões em {len(verdict['regressions'])} célula(s); medindo de novo para confirmar...")
+        confirmation = compare_measurement(baseline, measure(normalize=not args.no_normalize),
+                                           args.alpha, args.threshold)
+        confirmed = set(confirmation['regressions'])
+        for cell in verdict['cells']:
+            if cell['status'] == 'regression' and cell['cell'] not in confirmed:
+                cell['status'] = 'unconfirmed'
+        verdict['regressions'] = [key for key in verdict['regressions'] if key in confirmed]
+        verdict['verdict'] = 'fail' if verdict['regressions'] else 'pass'
+    verdict['normalized'] = measurement['normalized']
+    verdict['environment'] = environment_info()
+
+    with open(args.output, 'w') as f:
+        json.dump(verdict, f, indent=2)
+
+    print_diff_table(verdict)
+    print(f"Veredito salvo em: {args.output}")
+    sys.exit(1 if verdict['verdict'] == 'fail' else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Profiler estatístico por amostragem.
+
+Uma thread em segundo plano captura periodicamente a pilha da thread medida via
+``sys._current_frames()`` e acumula as pilhas no formato "folded" (uma linha
+por pilha: ``raiz;...;folha contagem``), que pode ser renderizado como
+flamegraph offline (ex.: ``flamegraph.pl arquivo.folded > arquivo.svg`` ou
+speedscope). Ao contrário do cProfile, não instrumenta cada chamada, então não
+distorce o custo relativo de funções pequenas como ``_get_height``.
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+from typing import List, Optional, Tuple
+
+
+# Raiz das pilhas cortadas em ``max_depth`` (os quadros de cima não foram lidos)
+TRUNCATED_FRAME = "[truncated]"
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """Amostra a pilha de uma thread a cada ``interval`` segundos.
+    
+    Pode ser iniciado e parado várias vezes; as amostras se acumulam.
+    """
+    
+    def __init__(self, interval: float = 0.001, thread_id: Optional[int] = None,
+                 max_depth: int = 128):
+        """
+        Args:
+            interval: Intervalo entre amostras (s)
+            thread_id: Thread amostrada (padrão: a que chama ``start``)
+            max_depth: Profundidade máxima de pilha registrada; pilhas mais
+                fundas guardam os ``max_depth`` quadros mais internos sob a
+                raiz ``[truncated]`` e são contadas em ``truncated_samples``
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self.truncated_samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._switch_interval: Optional[float] = None
+    
+    def start(self):
+        if self._thread is not None:
+            return
+        target = self.thread_id or threading.get_ident()
+        # Sem isso a thread de amostragem só obtém o GIL a cada 5 ms
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(target,), daemon=True,
+                                        name="sampling-profiler")
+        self._thread.start()
+    
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        sys.setswitchinterval(self._switch_interval)
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def _run(self, target: int):
+        own_frames = sys._current_frames
+        while not self._stop.wait(self.interval):
+            frame = own_frames().get(target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                # Descarta amostras da thread medida dentro do próprio start/stop
+                if frame.f_code.co_filename == __file__:
+                    break
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            else:
+                if frame is not None:
+                    stack.append(TRUNCATED_FRAME)
+                    self.truncated_samples += 1
+                stack.reverse()
+                self.samples[";".join(stack)] += 1
+    
+    @property
+    def total_samples(self) -> int:
+        return sum(self.samples.values())
+    
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+    
+    def write_folded(self, filename: str):
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        with open(filename, 'w') as f:
+            f.write(self.folded())
+    
+    def top_functions(self, n: int = 10, inclusive: bool = False) -> List[Tuple[str, float]]:
+        """Funções com mais amostras (próprias ou, se ``inclusive``, acumuladas).
+        
+        Returns:
+            Lista de (função, fração das amostras)
+        """
+        counts: Counter = Counter()
+        for stack, count in self.samples.items():
+            frames = stack.split(";")
+            if inclusive:
+                for label in set(frames) - {TRUNCATED_FRAME}:
+                    counts[label] += count
+            else:
+                counts[frames[-1]] += count
+        total = self.total_samples or 1
+        return [(label, count / total) for label, count in counts.most_common(n)]
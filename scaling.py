@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Varredura de escalabilidade (N crescendo geometricamente até 10M registros).
+
+Cada célula (estrutura, N, operação) roda com orçamento de tempo de parede e de
+memória residente (RSS). Células que estouram o orçamento são abortadas de forma
+controlada; células que não chegam a rodar recebem uma extrapolação ajustada
+sobre os pontos medidos e são marcadas como tal nos resultados.
+"""
+
+import os
+import json
+import math
+import time
+import numpy as np
+import psutil
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from tabulate import tabulate
+from models import DataGenerator, Record
+from experiments import ExperimentResult
+from mixed_workloads import default_structures
+from workloads import SearchWorkload
+
+
+# Formas de complexidade candidatas para a extrapolação
+COMPLEXITY_MODELS: Dict[str, Callable[[float], float]] = {
+    'O(1)': lambda n: 1.0,
+    'O(log n)': lambda n: math.log2(n),
+    'O(n)': lambda n: n,
+    'O(n log n)': lambda n: n * math.log2(n),
+    'O(n^2)': lambda n: n * n,
+}
+
+
+class BudgetExceeded(Exception):
+    """Sinaliza que uma célula ultrapassou o orçamento de tempo ou memória."""
+
+    def __init__(self, reason: str, elapsed: float, progress: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.elapsed = elapsed
+        self.progress = progress
+
+
+def geometric_sizes(start: int = 10_000, stop: int = 10_000_000, factor: float = 10.0) -> List[int]:
+    """Tamanhos N = start, start*factor, ... até ``stop`` (inclusive)."""
+    sizes = []
+    n = float(start)
+    while n <= stop * (1 + 1e-9):
+        sizes.append(int(round(n)))
+        n *= factor
+    return sizes
+
+
+def fit_complexity(sizes: List[int], values: List[float]) -> Tuple[str, float]:
+    """Ajusta ``value = a * f(n)`` para cada modelo e escolhe o de menor erro relativo.
+
+    Returns:
+        Tupla (nome do modelo, coeficiente a)
+    """
+    best_model, best_coef, best_error = 'O(n)', 0.0, float('inf')
+    y = np.array(values, dtype=float)
+
+    for name, f in COMPLEXITY_MODELS.items():
+        x = np.array([f(n) for n in sizes], dtype=float)
+        coef = float(np.dot(x, y) / np.dot(x, x))
+        predicted = coef * x
+        error = float(np.mean(((predicted - y) / np.maximum(y, 1e-12)) ** 2))
+        if error < best_error:
+            best_model, best_coef, best_error = name, coef, error
+
+    return best_model, best_coef
+
+
+def extrapolate(sizes: List[int], values: List[float], n: int) -> Optional[Tuple[float, str]]:
+    """Extrapola o valor em ``n`` a partir dos pontos medidos (mínimo de 2)."""
+    if len(sizes) < 2:
+        return None
+    model, coef = fit_complexity(sizes, values)
+    return coef * COMPLEXITY_MODELS[model](n), model
+
+
+class ScalingSweep:
+    """Executa a varredura de escalabilidade com orçamentos por célula."""
+
+    def __init__(self, data_sizes: List[int] = None,
+                 structures: Dict[str, Callable[[], Any]] = None,
+                 time_budget: float = 120.0, rss_budget_mb: float = 8192.0,
+                 num_searches: int = 1000, workload: SearchWorkload = None,
+                 data_generator: DataGenerator = None, check_every: int = 4096,
+                 search_check_every: int = 64):
+        """
+        Args:
+            data_sizes: Tamanhos N (padrão: 10k a 10M em passos de 10x)
+            structures: Fábricas das estruturas (padrão: as quatro do projeto)
+            time_budget: Orçamento de tempo de parede por célula (s)
+            rss_budget_mb: Limite de RSS do processo (MB)
+            num_searches: Buscas por célula de busca
+            workload: Gerador das chaves de busca
+            data_generator: Gerador de dados
+            check_every: Inserções por bloco cronometrado; o orçamento é verificado entre blocos
+            search_check_every: Buscas por bloco cronometrado; o orçamento é verificado entre blocos
+        """
+        self.data_sizes = data_sizes or geometric_sizes()
+        self.structures = structures or default_structures()
+        self.time_budget = time_budget
+        self.rss_budget_mb = rss_budget_mb
+        self.num_searches = num_searches
+        self.workload = workload or SearchWorkload()
+        self.data_generator = data_generator or DataGenerator(use_realistic_data=False)
+        self.check_every = check_every
+        self.search_check_every = search_check_every
+        self.process = psutil.Process(os.getpid())
+        self.results: List[ExperimentResult] = []
+
+        # Pontos medidos por (estrutura, operação): listas de N e tempos
+        self._measured: Dict[Tuple[str, str], Tuple[List[int], List[float]]] = {}
+
+    def _rss_mb(self) -> float:
+        return self.process.memory_info().rss / 1024 / 1024
+
+    def _check_budget(self, start_time: float, progress: int):
+        elapsed = time.perf_counter() - start_time
+        if elapsed > self.time_budget:
+            raise BudgetExceeded('time', elapsed, progress)
+        if self._rss_mb() > self.rss_budget_mb:
+            raise BudgetExceeded('memory', elapsed, progress)
+
+    def _build(self, factory: Callable[[], Any], data: List[Record]) -> Tuple[Any, float, int]:
+        # Como em ``_search``: só os blocos de inserções são cronometrados e o
+        # orçamento é verificado entre eles
+        structure = factory()
+        total_iterations = 0
+        elapsed = 0.0
+        step = self.check_every
+        start_time = time.perf_counter()
+
+        for first in range(0, len(data), step):
+            block = data[first:first + step]
+            block_start = time.perf_counter()
+            for record in block:
+                total_iterations += structure.insert(record)
+            elapsed += time.perf_counter() - block_start
+            self._check_budget(start_time, first + len(block))
+
+        return structure, elapsed, total_iterations
+
+    def _search(self, structure: Any, keys: List[int]) -> Tuple[float, float]:
+        # Cada busca pode custar O(N): o orçamento é verificado a cada bloco de
+        # chaves, fora do intervalo cronometrado
+        total_iterations = 0
+        elapsed = 0.0
+        step = self.search_check_every
+        start_time = time.perf_counter()
+
+        for first in range(0, len(keys), step):
+            block = keys[first:first + step]
+            block_start = time.perf_counter()
+            for key in block:
+                _, iterations = structure.search(key)
+                total_iterations += iterations
+            elapsed += time.perf_counter() - block_start
+            self._check_budget(start_time, first + len(block))
+
+        return elapsed / len(keys), total_iterations / len(keys)
+
+    def _predict(self, name: str, operation: str, n: int) -> Optional[Tuple[float, str]]:
+        sizes, times = self._measured.get((name, operation), ([], []))
+        return extrapolate(sizes, times, n)
+
+    def _over_budget(self, name: str, operation: str, n: int, scale: int) -> bool:
+        prediction = self._predict(name, operation, n)
+        return prediction is not None and prediction[0] * scale > self.time_budget
+
+    def _record(self, name: str, size: int, operation: str, status: str,
+                metrics: Dict[str, float], rounds: List[Dict[str, float]],
+                extra: Dict[str, Any] = None):
+        parameters = {'status': status, 'extrapolated': False,
+                      'time_budget': self.time_budget, 'rss_budget_mb': self.rss_budget_mb}
+        if operation == 'search':
+            parameters.update(self.workload.describe())
+        parameters.update(extra or {})
+
+        if status == 'measured':
+            sizes, times = self._measured.setdefault((name, operation), ([], []))
+            sizes.append(size)
+            times.append(metrics['avg_execution_time'])
+        else:
+            prediction = self._predict(name, operation, size)
+            if prediction is not None:
+                metrics = {**metrics, 'avg_execution_time': prediction[0]}
+                parameters['extrapolated'] = True
+                parameters['model'] = prediction[1]
+
+        self.results.append(ExperimentResult(
+            structure_name=name,
+            data_size=size,
+            operation=operation,
+            metrics=metrics,
+            rounds=rounds,
+            parameters=parameters
+        ))
+
+    def _skip(self, name: str, size: int, reason: str):
+        for operation in ('insert', 'search'):
+            self._record(name, size, operation, 'skipped', {}, [], {'reason': reason})
+
+    def _run_cell(self, name: str, factory: Callable[[], Any], data: List[Record], size: int,
+                  search_keys: List[int]) -> bool:
+        """Executa inserção e busca de uma estrutura; retorna False se abortou."""
+        # Evita rodar células cuja previsão já excede o orçamento
+        if self._over_budget(name, 'insert', size, 1):
+            print(f"    {name}: previsão de inserção excede o orçamento, pulando")
+            self._skip(name, size, 'predicted_insert_over_budget')
+            return False
+
+        try:
+            structure, build_time, iterations = self._build(factory, data)
+        except BudgetExceeded as e:
+            print(f"    {name}: inserção abortada ({e.reason}) após {e.progress} registros")
+            self._record(name, size, 'insert', 'aborted', {}, [],
+                         {'reason': e.reason, 'progress': e.progress, 'elapsed': e.elapsed})
+            self._record(name, size, 'search', 'skipped', {}, [], {'reason': 'insert_aborted'})
+            return False
+
+        insert_round = {'execution_time': build_time, 'memory_usage': 0, 'iterations': iterations}
+        self._record(name, size, 'insert', 'measured',
+                     {f'avg_{k}': v for k, v in insert_round.items()}, [insert_round])
+
+        if self._over_budget(name, 'search', size, len(search_keys)):
+            print(f"    {name}: previsão de busca excede o orçamento, pulando")
+            self._record(name, size, 'search', 'skipped', {}, [],
+                         {'reason': 'predicted_search_over_budget'})
+            return False
+
+        try:
+            search_time, search_iterations = self._search(structure, search_keys)
+        except BudgetExceeded as e:
+            print(f"    {name}: busca abortada ({e.reason}) após {e.progress} buscas")
+            self._record(name, size, 'search', 'aborted', {}, [],
+                         {'reason': e.reason, 'progress': e.progress, 'elapsed': e.elapsed})
+            return False
+
+        search_round = {'execution_time': search_time, 'memory_usage': 0, 'iterations': search_iterations}
+        self._record(name, size, 'search', 'measured',
+                     {f'avg_{k}': v for k, v in search_round.items()}, [search_round])
+        return True
+
+    def run(self) -> List[ExperimentResult]:
+        print("=" * 60)
+        print("VARREDURA DE ESCALABILIDADE")
+        print(f"Tamanhos: {self.data_sizes}")
+        print(f"Orçamento por célula: {self.time_budget:g}s, RSS máx. {self.rss_budget_mb:.0f} MB")
+        print("=" * 60)
+
+        # Estruturas que já estouraram o orçamento não são executadas em N maiores
+        exhausted = set()
+        rss_per_record = None
+
+        for size in self.data_sizes:
+            print(f"\n--- N = {size} ---")
+
+            # Verifica se os próprios dados cabem no orçamento de memória
+            if rss_per_record is not None and self._rss_mb() + rss_per_record * size > self.rss_budget_mb:
+                print("  Dados excedem o orçamento de memória, extrapolando todas as estruturas")
+                for name in self.structures:
+                    self._skip(name, size, 'dataset_over_memory_budget')
+                continue
+
+            rss_before = self._rss_mb()
+            data = self.data_generator.generate_records(size, seed=42)
+            rss_per_record = max(self._rss_mb() - rss_before, 0.0) / size or rss_per_record
+            search_keys = self.workload.generate_keys(data, min(self.num_searches, size))
+
+            for name, factory in self.structures.items():
+                if name in exhausted:
+                    self._skip(name, size, 'previous_size_over_budget')
+                    continue
+                print(f"  {name}...")
+                if not self._run_cell(name, factory, data, size, search_keys):
+                    exhausted.add(name)
+
+            del data
+
+        return self.results
+
+    def save_results(self, filename: str = "scaling_results.json"):
+        results_dict = []
+        for result in self.results:
+            results_dict.append({
+                'structure': result.structure_name,
+                'data_size': result.data_size,
+                'operation': result.operation,
+                'parameters': result.parameters,
+                'metrics': result.metrics
+            })
+
+        with open(filename, 'w') as f:
+            json.dump(results_dict, f, indent=2)
+
+        print(f"\nResultados salvos em: {filename}")
+
+
+def print_scaling_table(results: List[ExperimentResult]):
+    """Tabela de tempos por N, marcando valores extrapolados com '*'."""
+    rows = []
+    for result in results:
+        params = result.parameters
+        value = result.metrics.get('avg_execution_time')
+        if value is None:
+            time_str = "-"
+        else:
+            time_str = f"{value:.6f}" + ("*" if params['extrapolated'] else "")
+        rows.append({
+            'Estrutura': result.structure_name,
+            'Operação': result.operation,
+            'N': result.data_size,
+            'Tempo (s)': time_str,
+            'Status': params['status'],
+            'Modelo': params.get('model', '-'),
+            'Motivo': params.get('reason', '-')
+        })
+    print(tabulate(rows, headers='keys', tablefmt='grid'))
+    print("* valor extrapolado a partir dos pontos medidos")
+
+
+def main():
+    sweep = ScalingSweep()
+    results = sweep.run()
+    sweep.save_results()
+    print_scaling_table(results)
+
+
+if __name__ == "__main__":
+    main()
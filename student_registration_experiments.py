@@ -1,35 +1,237 @@
+import sys
 import json
 import time
 import psutil
 import os
 import random
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
 from student_registration_data import StudentRecord, StudentDataGenerator
 import matplotlib.pyplot as plt
 import numpy as np
-from dataclasses import asdict
+from dataclasses import asdict, fields, replace
+from operator import attrgetter
+from metrics import resource_snapshot, resource_delta
+from registration_indexes import BitmapIndex, Bitmap, HashIndex, SortedIndex, TrigramIndex, Cursor, IndexDefinition, fold_text
+from query_planner import QueryPlan, plan_query, execute_plan
+from registration_stats import RegistrationStatistics
 
 class StudentRegistrationSystem:
     """Sistema de cadastro usando diferentes estruturas de dados"""
     
-    def __init__(self):
+    def __init__(self, indexes: Optional[List[IndexDefinition]] = None):
+        """
+        Args:
+            indexes: Índices secundários declarados (campo, hash/sorted, único),
+                além dos índices fixos de matrícula, CPF, setor, nome e salário
+        """
         self.records = []
-        self.hash_table_matricula = {}
-        self.hash_table_cpf = {}
-        self.hash_table_setor = {}
-        self.sorted_by_matricula = []
-        self.sorted_by_nome = []
+        # id(registro) -> posição em ``records`` (remoção em O(1))
+        self._positions: Dict[int, int] = {}
+        # Índices hash fixos; hash_table_matricula/cpf são os próprios dicionários
+        # e hash_table_setor é uma propriedade só de leitura (ver abaixo)
+        self.matricula_index = HashIndex(attrgetter('matricula'), unique=True)
+        self.cpf_index = HashIndex(attrgetter('cpf'), unique=True)
+        self.setor_index = HashIndex(attrgetter('codigo_setor'))
+        self.hash_table_matricula = self.matricula_index.table
+        self.hash_table_cpf = self.cpf_index.table
+        # Índices ordenados (inserções incorporadas em lote na próxima consulta)
+        self.sorted_by_matricula = SortedIndex(attrgetter('matricula'))
+        # Nomes normalizados internados: nomes repetidos compartilham a mesma chave
+        self.sorted_by_nome = SortedIndex(lambda record: sys.intern(fold_text(record.nome)))
+        self.salary_index = SortedIndex(attrgetter('salario'))
+        self.nome_index = TrigramIndex(attrgetter('nome'))
+        # Bitmaps dos campos com poucos valores distintos (filtros e contagens bit a bit)
+        self.bitmap_index = BitmapIndex(('status', 'cargo', 'nivel', 'codigo_setor'))
+        # Agregados de salário e contagens por campo, mantidos como mais um índice
+        self.statistics = RegistrationStatistics()
+        
+        # Índices declarados: campo (ou tupla de campos) -> índice
+        self.index_definitions: Dict[Any, IndexDefinition] = {}
+        self.secondary_indexes: Dict[Any, Any] = {}
+        for definition in indexes or []:
+            self.create_index(definition.field, definition.kind, definition.unique)
+    
+    @property
+    def hash_table_setor(self) -> Dict[int, Cursor]:
+        """Setor -> cursor sobre os registros vivos do setor.
+
+        As listas internas de ``setor_index`` guardam lápides até serem
+        compactadas; cada consulta compacta a chave e entrega um cursor, sem
+        expor (nem copiar) a lista.
+        """
+        return {setor: self.setor_index.lookup(setor) for setor in list(self.setor_index.table)}
+    
+    def create_index(self, field: Union[str, Tuple[str, ...]], kind: str = 'hash', unique: bool = False):
+        """Declara um índice secundário sobre ``field`` ou, com uma tupla de
+        campos, um índice composto (ex.: ``('codigo_setor', 'status')``)
+        
+        Se já houver registros, o índice é construído em lote (uma passada ou
+        uma única ordenação) em vez de inserção por inserção.
+        """
+        definition = IndexDefinition(field, kind, unique)
+        index = definition.create()
+        index.build(self.records)
+        self.index_definitions[field] = definition
+        self.secondary_indexes[field] = index
+    
+    def _all_indexes(self) -> List[Any]:
+        """Todos os índices mantidos a cada inserção"""
+        return [self.matricula_index, self.cpf_index, self.setor_index,
+                self.sorted_by_matricula, self.sorted_by_nome, self.salary_index, self.nome_index,
+                self.bitmap_index, self.statistics, *self.secondary_indexes.values()]
+    
+    def _query_indexes(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        """Índices utilizáveis pelo planejador, com os campos que indexam"""
+        indexes = [(('matricula',), self.matricula_index), (('cpf',), self.cpf_index),
+                   (('codigo_setor',), self.setor_index), (('matricula',), self.sorted_by_matricula),
+                   (('salario',), self.salary_index), (self.bitmap_index.fields, self.bitmap_index)]
+        for field, index in self.secondary_indexes.items():
+            indexes.append((field if isinstance(field, tuple) else (field,), index))
+        return indexes
         
     def add_record(self, record: StudentRecord):
         """Adiciona um registro ao sistema"""
+        indexes = self._all_indexes()
+        # Restrições de unicidade antes de alterar qualquer estrutura
+        for index in indexes:
+            if getattr(index, 'unique', False):
+                index.check(record)
+        
+        self._positions[id(record)] = len(self.records)
         self.records.append(record)
-        self.hash_table_matricula[record.matricula] = record
-        self.hash_table_cpf[record.cpf] = record
+        for index in indexes:
+            index.add(record)
+    
+    def add_records(self, records: Iterable[StudentRecord]):
+        """Carga em massa: grava os registros e depois constrói cada índice de uma vez
+        
+        Em vez de tocar todos os índices a cada registro, cada índice é
+        reconstruído em uma passada sobre ``records`` (dicionários em uma
+        passada, uma única ordenação por índice ordenado, listas de setor
+        agrupadas). Lotes pequenos em relação ao cadastro usam ``add_record``,
+        que sai mais barato que reconstruir tudo. Unicidade é verificada
+        antes de qualquer alteração.
+        """
+        batch = list(records)
+        if len(batch) * 8 < len(self.records):
+            for record in batch:
+                self.add_record(record)
+            return
+        
+        indexes = self._all_indexes()
+        for index in indexes:
+            if getattr(index, 'unique', False):
+                seen = set()
+                for record in batch:
+                    index.check(record)
+                    key = index.key(record)
+                    if key in seen:
+                        raise ValueError(f"Chave duplicada em índice único: {key!r}")
+                    seen.add(key)
+        
+        start = len(self.records)
+        self.records.extend(batch)
+        self._positions.update((id(record), start + i) for i, record in enumerate(batch))
+        for index in indexes:
+            index.build(self.records)
+    
+    def flush_indexes(self):
+        """Aplica agora as inserções/remoções pendentes e descarta as lápides
+        de todos os índices (senão isso acontece na próxima consulta a cada um)"""
+        for index in self._all_indexes():
+            if isinstance(index, HashIndex):
+                index.compact()
+            elif isinstance(index, (SortedIndex, BitmapIndex)):
+                index.flush()
+    
+    def update_record(self, matricula: str, **changes) -> StudentRecord:
+        """Altera campos de um registro mantendo todos os índices consistentes
+        
+        Só os índices cuja chave muda são tocados (remoção e reinserção do
+        mesmo objeto); violações de unicidade são detectadas antes de qualquer
+        alteração. Ex.: ``update_record(m, salario=9500.0, status='Afastado')``.
+        """
+        record = self.matricula_index.table.get(matricula)
+        if record is None:
+            raise KeyError(matricula)
+        unknown = set(changes) - {f.name for f in fields(StudentRecord)}
+        if unknown:
+            raise ValueError(f"Campos desconhecidos: {', '.join(sorted(unknown))}")
+        
+        updated = replace(record, **changes)
+        affected = [index for index in self._all_indexes() if index.key(updated) != index.key(record)]
+        for index in affected:
+            if getattr(index, 'unique', False):
+                index.check(updated)
         
-        # Hash table por setor (lista de registros por setor)
-        if record.codigo_setor not in self.hash_table_setor:
-            self.hash_table_setor[record.codigo_setor] = []
-        self.hash_table_setor[record.codigo_setor].append(record)
+        for index in affected:
+            index.remove(record)
+        for field, value in changes.items():
+            setattr(record, field, value)
+        for index in affected:
+            index.add(record)
+        return record
+    
+    def delete_record(self, matricula: str) -> StudentRecord:
+        """Remove um registro de ``records`` e de todos os índices
+        
+        O último registro ocupa a posição do removido, então a ordem de
+        ``records`` deixa de ser a de inserção.
+        """
+        record = self.matricula_index.table.get(matricula)
+        if record is None:
+            raise KeyError(matricula)
+        for index in self._all_indexes():
+            index.remove(record)
+        
+        position = self._positions.pop(id(record))
+        last = self.records.pop()
+        if last is not record:
+            self.records[position] = last
+            self._positions[id(last)] = position
+        return record
+    
+    def find(self, field: str, value: Any) -> Cursor:
+        """Registros com ``field == value``, pelo índice declarado ou por varredura
+        
+        Sempre um cursor somente leitura: sobre as linhas do índice ou, sem
+        índice, uma varredura preguiçosa de ``records``.
+        """
+        index = self.secondary_indexes.get(field)
+        if index is not None:
+            return index.lookup(value)
+        get = attrgetter(field)
+        return Cursor(self.records, predicate=lambda record: get(record) == value)
+    
+    def find_range(self, field: str, low: Any, high: Any) -> Cursor:
+        """Registros com ``low <= field <= high`` (índice ordenado ou varredura)"""
+        index = self.secondary_indexes.get(field)
+        if isinstance(index, SortedIndex):
+            return index.range(low, high)
+        get = attrgetter(field)
+        return Cursor(self.records, predicate=lambda record: low <= get(record) <= high)
+    
+    def explain(self, **predicates) -> QueryPlan:
+        """Plano escolhido para ``query`` com os mesmos predicados"""
+        return plan_query(self._query_indexes(), predicates, len(self.records))
+    
+    def query(self, **predicates) -> List[StudentRecord]:
+        """Registros que satisfazem todos os predicados
+        
+        Cada predicado é ``campo=valor`` (igualdade) ou ``campo=(mínimo, máximo)``
+        (faixa inclusiva), ex.: ``query(codigo_setor=1007, status='Ativo',
+        salario=(8000, 12000))``. O planejador escolhe entre varredura, o
+        índice mais seletivo com filtro, ou interseção de índices.
+        """
+        return execute_plan(self.explain(**predicates), self.records)
+    
+    def bitmap(self, field: str, value: Any) -> Bitmap:
+        """Bitmap dos registros com ``field == value`` (status, cargo, nivel ou codigo_setor)
+        
+        Combina com ``&``, ``|``, ``-`` e ``~``, ex.: ``len(s.bitmap('status', 'Ativo')
+        & ~s.bitmap('nivel', 'Graduação'))`` conta sem percorrer os registros.
+        """
+        return self.bitmap_index.bitmap(field, value)
     
     def search_by_matricula_linear(self, matricula: str) -> StudentRecord:
         """Busca linear por matrícula"""
@@ -46,29 +248,97 @@ class StudentRegistrationSystem:
         """Busca por hash table - CPF"""
         return self.hash_table_cpf.get(cpf)
     
-    def search_by_setor(self, codigo_setor: int) -> List[StudentRecord]:
-        """Retorna todos registros de um setor"""
-        return self.hash_table_setor.get(codigo_setor, [])
+    def search_by_setor(self, codigo_setor: int) -> Cursor:
+        """Registros de um setor, em ordem de inserção
+        
+        Cursor sobre a lista do índice (sem cópia e sem expô-la a alterações):
+        ``count()`` vem do tamanho da lista e a primeira página só toca as
+        linhas que devolve.
+        """
+        return self.setor_index.lookup(codigo_setor)
     
-    def search_by_nome_linear(self, nome: str) -> List[StudentRecord]:
-        """Busca linear por nome (busca parcial)"""
-        results = []
+    def search_by_nome_linear(self, nome: str) -> Cursor:
+        """Busca linear por nome (busca parcial)
+        
+        A varredura acontece à medida que o cursor é consumido: a primeira
+        página para ao achar as suas linhas, e ``page`` retoma da posição em
+        ``records`` onde a anterior parou.
+        """
         nome_lower = nome.lower()
-        for record in self.records:
-            if nome_lower in record.nome.lower():
-                results.append(record)
-        return results
+        return Cursor(self.records, predicate=lambda record: nome_lower in record.nome.lower())
+    
+    def search_by_nome(self, nome: str) -> List[StudentRecord]:
+        """Busca parcial por nome no índice de trigramas
+        
+        Ignora maiúsculas e acentos ("antonio" encontra "Antônio").
+        """
+        return self.nome_index.search(nome)
+    
+    def search_by_nome_prefix(self, prefix: str) -> Cursor:
+        """Registros cujo nome começa com ``prefix`` (sem diferenciar maiúsculas e acentos),
+        em ordem alfabética, em O(log n + k)"""
+        return self.sorted_by_nome.prefix(fold_text(prefix))
     
-    def search_by_salary_range(self, min_salary: float, max_salary: float) -> List[StudentRecord]:
-        """Busca por faixa salarial"""
+    def search_by_matricula_prefix(self, prefix: str) -> Cursor:
+        """Registros cuja matrícula começa com ``prefix`` (ex.: "2021" = ingressantes de 2021),
+        em ordem de matrícula, em O(log n + k)"""
+        return self.sorted_by_matricula.prefix(prefix)
+    
+    def search_by_salary_range(self, min_salary: float, max_salary: float) -> Cursor:
+        """Busca por faixa salarial no índice ordenado (dois bisect e uma fatia)
+        
+        Retorna um cursor preguiçoso em ordem de salário: ``count()`` é
+        imediato, só as linhas iteradas são acessadas e ``page`` retoma pelo
+        salário da última linha (paginação por chave).
+        """
+        return self.salary_index.range(min_salary, max_salary)
+    
+    def search_by_salary_range_linear(self, min_salary: float, max_salary: float) -> List[StudentRecord]:
+        """Busca linear por faixa salarial"""
         results = []
         for record in self.records:
             if min_salary <= record.salario <= max_salary:
                 results.append(record)
         return results
     
+    def index_memory(self) -> Dict[str, int]:
+        """Bytes ocupados por cada índice secundário (sem contar os registros)"""
+        indexes = {
+            'hash_table_matricula': self.matricula_index,
+            'hash_table_cpf': self.cpf_index,
+            'hash_table_setor': self.setor_index,
+            'sorted_by_matricula': self.sorted_by_matricula,
+            'sorted_by_nome': self.sorted_by_nome,
+            'salary_index': self.salary_index,
+            'nome_index': self.nome_index,
+            'bitmap_index': self.bitmap_index,
+            'statistics': self.statistics
+        }
+        for field, definition in self.index_definitions.items():
+            indexes[definition.name] = self.secondary_indexes[field]
+        return {name: index.memory_bytes(exclude=(StudentRecord,)) for name, index in indexes.items()}
+    
     def get_statistics(self) -> Dict[str, Any]:
-        """Retorna estatísticas do sistema"""
+        """Retorna estatísticas do sistema
+        
+        Lidas dos agregados incrementais, em O(1) no número de registros; a
+        mediana é aproximada (erro relativo de até 1%).
+        """
+        if not self.records:
+            return {}
+        
+        distribution = self.statistics.distribution
+        return {
+            'total_records': len(self.records),
+            'salary_stats': self.statistics.value_stats(),
+            'sector_distribution': distribution('codigo_setor'),
+            'status_distribution': distribution('status'),
+            'position_distribution': distribution('cargo'),
+            'level_distribution': distribution('nivel')
+        }
+    
+    def compute_statistics(self) -> Dict[str, Any]:
+        """Recalcula as estatísticas percorrendo todos os registros (referência)"""
         if not self.records:
             return {}
         
@@ -76,11 +346,13 @@ class StudentRegistrationSystem:
         setores = {}
         status_count = {}
         cargos = {}
+        niveis = {}
         
         for record in self.records:
             setores[record.codigo_setor] = setores.get(record.codigo_setor, 0) + 1
             status_count[record.status] = status_count.get(record.status, 0) + 1
             cargos[record.cargo] = cargos.get(record.cargo, 0) + 1
+            niveis[record.nivel] = niveis.get(record.nivel, 0) + 1
         
         return {
             'total_records': len(self.records),
@@ -93,61 +365,99 @@ class StudentRegistrationSystem:
             },
             'sector_distribution': setores,
             'status_distribution': status_count,
-            'position_distribution': cargos
+            'position_distribution': cargos,
+            'level_distribution': niveis
         }
 
+# Linhas por página nas medições de primeira página
+PAGE_SIZE = 20
+
+# Índices secundários declarados no benchmark (campos sem índice fixo)
+BENCHMARK_INDEXES = [
+    IndexDefinition('email'),
+    IndexDefinition('status'),
+    IndexDefinition('cargo'),
+    IndexDefinition('nivel'),
+    IndexDefinition('data_ingresso', kind='sorted'),
+    # Compostos: setor+status (relatórios por setor) e cargo+salário (faixas por cargo)
+    IndexDefinition(('codigo_setor', 'status')),
+    IndexDefinition(('cargo', 'salario'), kind='sorted'),
+]
+
 class StudentRegistrationBenchmark:
     """Benchmark para operações no sistema de cadastro"""
     
-    def __init__(self):
+    def __init__(self, indexes: Optional[List[IndexDefinition]] = None):
         self.results = []
+        self.indexes = BENCHMARK_INDEXES if indexes is None else indexes
         
     def measure_resources(self, func, *args, **kwargs):
-        """Mede tempo, memória e CPU de uma função"""
+        """Mede tempo, memória e contadores de CPU de uma função
+        
+        Returns:
+            Tupla (resultado, tempo, memória em MB, dict com tempo de CPU da
+            thread/processo, trocas de contexto e page faults da região)
+        """
         # Medição inicial
         process = psutil.Process(os.getpid())
         initial_memory = process.memory_info().rss / 1024 / 1024  # MB
-        initial_cpu_percent = process.cpu_percent()
+        resources_before = resource_snapshot()
         
         # Execução e medição de tempo
+        thread_start = time.thread_time_ns()
         start_time = time.perf_counter()
         result = func(*args, **kwargs)
         end_time = time.perf_counter()
+        thread_end = time.thread_time_ns()
         
         # Medição final
+        cpu_usage = resource_delta(resources_before, resource_snapshot())
+        cpu_usage['thread_cpu_time'] = (thread_end - thread_start) / 1e9
         final_memory = process.memory_info().rss / 1024 / 1024  # MB
-        final_cpu_percent = process.cpu_percent()
         
         execution_time = end_time - start_time
         memory_used = final_memory - initial_memory
-        cpu_usage = final_cpu_percent
         
         return result, execution_time, memory_used, cpu_usage
     
     def benchmark_insertion(self, records: List[StudentRecord]) -> Dict[str, Any]:
         """Benchmark de inserção de registros"""
-        system = StudentRegistrationSystem()
+        system = StudentRegistrationSystem(indexes=self.indexes)
         
         insert_times = []
         memory_usage = []
+        cpu_totals = {}
         
         for i, record in enumerate(records):
             _, exec_time, mem_used, cpu_usage = self.measure_resources(system.add_record, record)
             insert_times.append(exec_time)
             memory_usage.append(mem_used)
+            for name, value in cpu_usage.items():
+                cpu_totals[name] = cpu_totals.get(name, 0) + value
             
             # Log a cada 1000 inserções para datasets grandes
             if (i + 1) % 1000 == 0:
                 print(f"Inseridos {i + 1}/{len(records)} registros")
         
+        # Pendências dos índices ordenados/bitmaps fazem parte do custo da carga
+        _, flush_time, _, _ = self.measure_resources(system.flush_indexes)
+        
+        # Carga em massa dos mesmos registros num sistema novo
+        bulk_system = StudentRegistrationSystem(indexes=self.indexes)
+        _, bulk_time, bulk_memory, _ = self.measure_resources(bulk_system.add_records, records)
+        
         return {
             'operation': 'insertion',
             'total_records': len(records),
             'total_time': sum(insert_times),
+            'incremental_load_time': sum(insert_times) + flush_time,
+            'bulk_load_time': bulk_time,
+            'bulk_memory_usage': bulk_memory,
             'avg_time_per_record': np.mean(insert_times),
             'std_time_per_record': np.std(insert_times),
             'avg_memory_usage': np.mean(memory_usage),
             'max_memory_usage': max(memory_usage) if memory_usage else 0,
+            **{f'total_{name}': value for name, value in cpu_totals.items()},
             'system': system
         }
     
@@ -162,8 +472,24 @@ class StudentRegistrationBenchmark:
             'search_by_matricula_hash': [],
             'search_by_cpf_hash': [],
             'search_by_nome_partial': [],
+            'search_by_nome_trigram': [],
+            'search_by_nome_prefix': [],
+            'search_by_matricula_prefix': [],
             'search_by_setor': [],
-            'search_by_salary_range': []
+            'find_by_email_scan': [],
+            'find_by_email': [],
+            'search_by_salary_range_linear': [],
+            'search_by_salary_range': [],
+            'search_by_salary_range_materialized': [],
+            'first_page_salary_range': [],
+            'first_page_nome_linear': [],
+            'first_page_setor': [],
+            'filter_scan': [],
+            'filter_bitmap': [],
+            'distribution_scan': [],
+            'distribution_bitmap': [],
+            'compute_statistics': [],
+            'get_statistics': []
         }
         
         print(f"Executando {num_searches} buscas de cada tipo...")
@@ -205,7 +531,7 @@ class StudentRegistrationBenchmark:
         for record in search_records:
             first_name = record.nome.split()[0]
             _, exec_time, mem_used, cpu_usage = self.measure_resources(
-                system.search_by_nome_linear, first_name
+                lambda nome: system.search_by_nome_linear(nome).to_list(), first_name
             )
             results['search_by_nome_partial'].append({
                 'time': exec_time,
@@ -213,6 +539,53 @@ class StudentRegistrationBenchmark:
                 'cpu': cpu_usage
             })
         
+        # Busca por nome (parcial) no índice de trigramas
+        for record in search_records:
+            first_name = record.nome.split()[0]
+            _, exec_time, mem_used, cpu_usage = self.measure_resources(
+                system.search_by_nome, first_name
+            )
+            results['search_by_nome_trigram'].append({
+                'time': exec_time,
+                'memory': mem_used,
+                'cpu': cpu_usage
+            })
+        
+        # Busca por prefixo de nome e de matrícula (ano de ingresso) nos índices ordenados
+        system.sorted_by_nome.flush()
+        system.sorted_by_matricula.flush()
+        for record in search_records:
+            _, exec_time, mem_used, cpu_usage = self.measure_resources(
+                system.search_by_nome_prefix, record.nome[:3]
+            )
+            results['search_by_nome_prefix'].append({
+                'time': exec_time,
+                'memory': mem_used,
+                'cpu': cpu_usage
+            })
+            _, exec_time, mem_used, cpu_usage = self.measure_resources(
+                system.search_by_matricula_prefix, record.matricula[:4]
+            )
+            results['search_by_matricula_prefix'].append({
+                'time': exec_time,
+                'memory': mem_used,
+                'cpu': cpu_usage
+            })
+        
+        # Busca por e-mail: varredura vs índice declarado (se houver)
+        email_searches = {
+            'find_by_email_scan': lambda email: [r for r in system.records if r.email == email],
+            'find_by_email': lambda email: system.find('email', email)
+        }
+        for name, search in email_searches.items():
+            for record in search_records:
+                _, exec_time, mem_used, cpu_usage = self.measure_resources(search, record.email)
+                results[name].append({
+                    'time': exec_time,
+                    'memory': mem_used,
+                    'cpu': cpu_usage
+                })
+        
         # Busca por setor
         setores_unicos = list(set(record.codigo_setor for record in records))
         for _ in range(num_searches):
@@ -226,21 +599,182 @@ class StudentRegistrationBenchmark:
                 'cpu': cpu_usage
             })
         
-        # Busca por faixa salarial
+        # Busca por faixa salarial: varredura linear, índice ordenado (visão
+        # preguiçosa) e índice ordenado com todas as linhas materializadas
+        salary_ranges = []
         for _ in range(num_searches):
             min_sal = random.uniform(1000, 5000)
-            max_sal = min_sal + random.uniform(2000, 10000)
-            _, exec_time, mem_used, cpu_usage = self.measure_resources(
-                system.search_by_salary_range, min_sal, max_sal
-            )
-            results['search_by_salary_range'].append({
-                'time': exec_time,
-                'memory': mem_used,
-                'cpu': cpu_usage
-            })
+            salary_ranges.append((min_sal, min_sal + random.uniform(2000, 10000)))
+        
+        # Incorpora as inserções pendentes ao índice antes de medir as consultas
+        system.salary_index.flush()
+        
+        salary_searches = {
+            'search_by_salary_range_linear': system.search_by_salary_range_linear,
+            'search_by_salary_range': system.search_by_salary_range,
+            'search_by_salary_range_materialized': lambda lo, hi: system.search_by_salary_range(lo, hi).to_list(),
+            'first_page_salary_range': lambda lo, hi: system.search_by_salary_range(lo, hi).page(PAGE_SIZE)
+        }
+        for name, search in salary_searches.items():
+            for min_sal, max_sal in salary_ranges:
+                _, exec_time, mem_used, cpu_usage = self.measure_resources(search, min_sal, max_sal)
+                results[name].append({
+                    'time': exec_time,
+                    'memory': mem_used,
+                    'cpu': cpu_usage
+                })
+        
+        # Primeira página (tela com PAGE_SIZE linhas) de buscas com muitos resultados
+        first_page_searches = {
+            'first_page_nome_linear': lambda r: system.search_by_nome_linear(r.nome.split()[0]).page(PAGE_SIZE),
+            'first_page_setor': lambda r: system.search_by_setor(r.codigo_setor).page(PAGE_SIZE)
+        }
+        for name, search in first_page_searches.items():
+            for record in search_records:
+                _, exec_time, mem_used, cpu_usage = self.measure_resources(search, record)
+                results[name].append({
+                    'time': exec_time,
+                    'memory': mem_used,
+                    'cpu': cpu_usage
+                })
+        
+        # Filtro com E/NÃO e distribuições: varredura de objetos vs bitmaps
+        def filter_scan(status, nivel, cargo):
+            return sum(1 for r in system.records if r.status == status and r.nivel == nivel and r.cargo != cargo)
+        
+        def filter_bitmap(status, nivel, cargo):
+            return len(system.bitmap('status', status) & system.bitmap('nivel', nivel) & ~system.bitmap('cargo', cargo))
+        
+        def distribution_scan():
+            counts = {field: {} for field in system.bitmap_index.fields}
+            for r in system.records:
+                for field, field_counts in counts.items():
+                    value = getattr(r, field)
+                    field_counts[value] = field_counts.get(value, 0) + 1
+            return counts
+        
+        def distribution_bitmap():
+            return {field: system.bitmap_index.distribution(field) for field in system.bitmap_index.fields}
         
+        system.bitmap_index.flush()
+        bitmap_searches = {
+            'filter_scan': filter_scan,
+            'filter_bitmap': filter_bitmap,
+            'distribution_scan': lambda *_: distribution_scan(),
+            'distribution_bitmap': lambda *_: distribution_bitmap(),
+            # Painel: estatísticas recalculadas vs agregados incrementais
+            'compute_statistics': lambda *_: system.compute_statistics(),
+            'get_statistics': lambda *_: system.get_statistics()
+        }
+        # Varreduras completas: menos repetições que as buscas pontuais
+        filter_args = [(r.status, r.nivel, r.cargo) for r in search_records[:50]]
+        for name, search in bitmap_searches.items():
+            for args in filter_args:
+                _, exec_time, mem_used, cpu_usage = self.measure_resources(search, *args)
+                results[name].append({
+                    'time': exec_time,
+                    'memory': mem_used,
+                    'cpu': cpu_usage
+                })
+        
+        return results
+    
+    def benchmark_queries(self, system: StudentRegistrationSystem, records: List[StudentRecord], repetitions: int = 5) -> List[Dict[str, Any]]:
+        """Consultas com vários predicados: plano escolhido e tempo vs varredura completa"""
+        sample = random.choice(records)
+        queries = [
+            {'status': 'Ativo', 'nivel': sample.nivel},
+            {'codigo_setor': sample.codigo_setor, 'status': 'Ativo'},
+            {'cargo': sample.cargo, 'salario': (sample.salario * 0.9, sample.salario * 1.1)},
+            {'codigo_setor': sample.codigo_setor, 'status': 'Ativo', 'cargo': sample.cargo,
+             'salario': (sample.salario * 0.8, sample.salario * 1.2)},
+            {'status': 'Ativo', 'nivel': sample.nivel, 'cargo': sample.cargo},
+            {'data_ingresso': ('2020-01-01', '2020-12-31'), 'status': sample.status},
+            {'telefone': sample.telefone},
+        ]
+        
+        results = []
+        for predicates in queries:
+            plan = system.explain(**predicates)
+            scan_plan = plan_query([], predicates, len(system.records))
+            rows = system.query(**predicates)
+            
+            times, scan_times = [], []
+            for _ in range(repetitions):
+                _, exec_time, _, _ = self.measure_resources(system.query, **predicates)
+                times.append(exec_time)
+                _, exec_time, _, _ = self.measure_resources(execute_plan, scan_plan, system.records)
+                scan_times.append(exec_time)
+            
+            results.append({
+                'predicates': predicates,
+                'strategy': plan.strategy,
+                'plan': plan.describe(),
+                'estimated_costs': plan.alternatives,
+                'rows': len(rows),
+                'time': float(np.median(times)),
+                'scan_time': float(np.median(scan_times))
+            })
         return results
     
+    def benchmark_churn(self, system: StudentRegistrationSystem, num_operations: int = 2000, block_size: int = 200) -> Dict[str, Any]:
+        """Alterações, remoções e inserções misturadas, com a latência por bloco
+        
+        O tamanho do cadastro fica estável (remoções ~ inserções); a latência
+        média por bloco deve ficar plana se nenhum índice degradar com a
+        rotatividade (listas com lápides, bitmaps com posições vagas). O fim de
+        cada bloco aplica as pendências dos índices, e esse tempo entra na
+        média do bloco.
+        """
+        generator = StudentDataGenerator()
+        setores = list(generator.setores.keys())
+        
+        def new_record():
+            while True:
+                record = generator.generate_student_record()
+                try:
+                    system.add_record(record)
+                    return record
+                except ValueError:
+                    continue  # Matrícula ou CPF repetido: gera outro
+        
+        operations = {
+            'update_salario': lambda r: system.update_record(r.matricula, salario=round(r.salario * random.uniform(0.9, 1.1), 2)),
+            'update_status_setor': lambda r: system.update_record(r.matricula, status=random.choice(generator.status_options),
+                                                                  codigo_setor=random.choice(setores)),
+            'delete_record': lambda r: system.delete_record(r.matricula),
+            'insert_record': lambda r: new_record()
+        }
+        weights = [0.3, 0.3, 0.2, 0.2]
+        
+        system.flush_indexes()
+        times = {name: [] for name in operations}
+        times['flush_indexes'] = []
+        block_latency = []
+        block = []
+        for _ in range(num_operations):
+            name = random.choices(list(operations), weights)[0]
+            record = random.choice(system.records)
+            start = time.perf_counter()
+            operations[name](record)
+            elapsed = time.perf_counter() - start
+            times[name].append(elapsed)
+            block.append(elapsed)
+            if len(block) == block_size:
+                start = time.perf_counter()
+                system.flush_indexes()
+                elapsed = time.perf_counter() - start
+                times['flush_indexes'].append(elapsed)
+                block_latency.append((sum(block) + elapsed) / len(block))
+                block = []
+        
+        return {
+            'operations': {name: {'count': len(t), 'mean_time': float(np.mean(t)) if t else 0.0}
+                           for name, t in times.items()},
+            'block_latency': block_latency,
+            'final_size': len(system.records)
+        }
+    
     def run_complete_benchmark(self, dataset_sizes: List[int]) -> List[Dict[str, Any]]:
         """Executa benchmark completo para diferentes tamanhos de dataset"""
         
@@ -269,12 +803,25 @@ class StudentRegistrationBenchmark:
                 insertion_results['system'], records, num_searches
             )
             
+            print("Executando benchmark de consultas planejadas...")
+            query_results = self.benchmark_queries(insertion_results['system'], records)
+            
+            # Estatísticas antes da rotatividade, que altera o cadastro
+            system_stats = insertion_results['system'].get_statistics()
+            index_memory = insertion_results['system'].index_memory()
+            
+            print("Executando benchmark de rotatividade (alterações/remoções)...")
+            churn_results = self.benchmark_churn(insertion_results['system'], min(2000, size))
+            
             # Consolida resultados
             result = {
                 'dataset_size': size,
                 'insertion': insertion_results,
                 'searches': search_results,
-                'system_stats': insertion_results['system'].get_statistics()
+                'queries': query_results,
+                'churn': churn_results,
+                'system_stats': system_stats,
+                'index_memory': index_memory
             }
             
             all_results.append(result)
@@ -396,9 +943,70 @@ def main():
         
         print(f"\nDataset: {size} registros")
         print(f"  Inserção média: {avg_insert_time:.4f} ms/registro")
+        incremental_load = result['insertion']['incremental_load_time']
+        bulk_load = result['insertion']['bulk_load_time']
+        print(f"  Carga completa: incremental {incremental_load:.3f} s, em massa {bulk_load:.3f} s "
+              f"(speedup {incremental_load/bulk_load:.1f}x)")
         print(f"  Busca hash: {avg_hash_search:.4f} ms")
         print(f"  Busca linear: {avg_linear_search:.4f} ms")
         print(f"  Speedup hash vs linear: {avg_linear_search/avg_hash_search:.1f}x")
+        
+        # Faixa salarial: varredura linear vs índice ordenado
+        avg_range_linear = np.mean([s['time'] for s in result['searches']['search_by_salary_range_linear']]) * 1000
+        avg_range_index = np.mean([s['time'] for s in result['searches']['search_by_salary_range']]) * 1000
+        avg_range_full = np.mean([s['time'] for s in result['searches']['search_by_salary_range_materialized']]) * 1000
+        print(f"  Faixa salarial linear: {avg_range_linear:.4f} ms")
+        print(f"  Faixa salarial índice: {avg_range_index:.4f} ms "
+              f"({avg_range_full:.4f} ms materializando todas as linhas)")
+        print(f"  Speedup índice vs linear: {avg_range_linear/avg_range_index:.1f}x")
+        
+        first_pages = ", ".join(
+            f"{label} {np.mean([s['time'] for s in result['searches'][name]]) * 1000:.4f} ms"
+            for label, name in [('faixa salarial', 'first_page_salary_range'),
+                                ('nome linear', 'first_page_nome_linear'),
+                                ('setor', 'first_page_setor')])
+        print(f"  Primeira página ({PAGE_SIZE} linhas): {first_pages}")
+        
+        # Nome parcial: varredura linear vs índice de trigramas
+        avg_nome_linear = np.mean([s['time'] for s in result['searches']['search_by_nome_partial']]) * 1000
+        avg_nome_index = np.mean([s['time'] for s in result['searches']['search_by_nome_trigram']]) * 1000
+        print(f"  Nome parcial linear: {avg_nome_linear:.4f} ms")
+        print(f"  Nome parcial trigramas: {avg_nome_index:.4f} ms "
+              f"(speedup {avg_nome_linear/avg_nome_index:.1f}x)")
+        
+        avg_nome_prefix = np.mean([s['time'] for s in result['searches']['search_by_nome_prefix']]) * 1000
+        avg_matricula_prefix = np.mean([s['time'] for s in result['searches']['search_by_matricula_prefix']]) * 1000
+        print(f"  Prefixo de nome: {avg_nome_prefix:.4f} ms, prefixo de matrícula (ano): {avg_matricula_prefix:.4f} ms")
+        
+        avg_email_scan = np.mean([s['time'] for s in result['searches']['find_by_email_scan']]) * 1000
+        avg_email_index = np.mean([s['time'] for s in result['searches']['find_by_email']]) * 1000
+        print(f"  E-mail: varredura {avg_email_scan:.4f} ms, índice declarado {avg_email_index:.4f} ms")
+        
+        for label, scan, fast, fast_label in [
+                ('Filtro status E nível E NÃO cargo', 'filter_scan', 'filter_bitmap', 'bitmaps'),
+                ('Distribuições (4 campos)', 'distribution_scan', 'distribution_bitmap', 'bitmaps'),
+                ('Estatísticas do painel', 'compute_statistics', 'get_statistics', 'agregados incrementais')]:
+            avg_scan = np.mean([s['time'] for s in result['searches'][scan]]) * 1000
+            avg_fast = np.mean([s['time'] for s in result['searches'][fast]]) * 1000
+            print(f"  {label}: varredura {avg_scan:.4f} ms, {fast_label} {avg_fast:.4f} ms "
+                  f"(speedup {avg_scan/avg_fast:.1f}x)")
+        
+        index_memory = ", ".join(f"{name} {size / 1024:.1f} KB" for name, size in result['index_memory'].items())
+        print(f"  Memória dos índices: {index_memory}")
+        
+        churn = result['churn']
+        churn_ops = ", ".join(f"{name} {op['mean_time'] * 1000:.4f} ms"
+                              for name, op in churn['operations'].items())
+        blocks = [t * 1000 for t in churn['block_latency']]
+        print(f"  Rotatividade: {churn_ops}")
+        if blocks:
+            print(f"  Latência por bloco: primeiro {blocks[0]:.4f} ms, último {blocks[-1]:.4f} ms, "
+                  f"máximo {max(blocks):.4f} ms")
+        
+        print("  Consultas planejadas (mediana, planejador vs varredura):")
+        for query in result['queries']:
+            print(f"    {query['plan']}: {query['time'] * 1000:.3f} ms vs "
+                  f"{query['scan_time'] * 1000:.3f} ms ({query['rows']} linhas)")
     
     print("\nArquivos gerados:")
     print("- plots/student_registration_benchmark.png")
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""Testes dos índices do sistema de cadastro de matrículas"""
+
+import random
+from operator import attrgetter
+from student_registration_data import StudentDataGenerator
+from student_registration_experiments import StudentRegistrationSystem, BENCHMARK_INDEXES
+from registration_indexes import Cursor, IndexDefinition, TrigramIndex, fold_text
+
+
+def _system(n=2000, seed=11):
+    random.seed(seed)
+    records = StudentDataGenerator().generate_dataset(n)
+    system = StudentRegistrationSystem()
+    for record in records:
+        system.add_record(record)
+    return system, records
+
+
+def test_salary_range_index_matches_linear_scan():
+    system, records = _system()
+    for low, high in [(0, 500), (1000, 3000), (4999.5, 12000), (30000, 40000)]:
+        view = system.search_by_salary_range(low, high)
+        expected = system.search_by_salary_range_linear(low, high)
+        assert len(view) == len(expected)
+        assert sorted(r.matricula for r in view) == sorted(r.matricula for r in expected)
+        salaries = [r.salario for r in view]
+        assert salaries == sorted(salaries)
+
+    # Inserções depois de uma consulta entram no índice (manutenção em lote)
+    extra = StudentDataGenerator().generate_dataset(10)
+    for record in extra:
+        record.salario = 99999.0
+        system.add_record(record)
+    page = system.search_by_salary_range(99999.0, 99999.0)
+    assert len(page) == 10 and len(page[:3]) == 3
+    assert page.to_list() == list(page)
+
+
+def test_trigram_index_finds_substrings_ignoring_accents():
+    system, records = _system()
+    for query in ["Ana", "silva", "a Co", "ri", "Costa Santos", "xyz"]:
+        found = system.search_by_nome(query)
+        expected = [r for r in records if query.lower() in r.nome.lower()]
+        # Sem acentos na consulta, o índice acha ao menos o que a varredura acha
+        assert set(r.matricula for r in expected) <= set(r.matricula for r in found)
+        assert all(fold_text(query) in fold_text(r.nome) for r in found)
+    
+    accented = [r for r in records if "Antônio" in r.nome]
+    assert accented
+    assert set(r.matricula for r in system.search_by_nome("ANTONIO")) == set(r.matricula for r in accented)
+    assert system.index_memory()['nome_index'] > 0
+    
+    # Valores sem linhas saem das postagens; as posições vagas são recicladas
+    index = TrigramIndex(attrgetter('nome'))
+    index.build(records)
+    gone = set(index.values[:2 * len(index.values) // 3])
+    kept = [r for r in records if fold_text(r.nome) not in gone]
+    for record in records:
+        if fold_text(record.nome) in gone:
+            index.remove(record)
+    assert set(index.value_ids) == {fold_text(r.nome) for r in kept} and len(index.values) <= 2 * len(index.value_ids)
+    assert all(index.values[value_id] is not None for posting in index.postings.values() for value_id in posting)
+    assert {id(r) for r in index.search("a")} == {id(r) for r in kept if 'a' in fold_text(r.nome)}
+    for record in kept:
+        index.remove(record)
+    assert not index.postings and not index.value_ids and index.search("an") == []
+
+
+def test_prefix_searches_use_sorted_indexes():
+    system, records = _system()
+    year = records[0].matricula[:4]
+    by_year = system.search_by_matricula_prefix(year)
+    assert sorted(r.matricula for r in records if r.matricula.startswith(year)) == [r.matricula for r in by_year]
+    assert len(system.search_by_matricula_prefix("1999")) == 0
+    assert len(system.search_by_matricula_prefix("")) == len(records)
+    
+    names = system.search_by_nome_prefix("ana")
+    assert len(names) == sum(1 for r in records if r.nome.startswith("Ana "))
+    assert all(fold_text(r.nome).startswith("ana") for r in names)
+    assert {r.nome for r in system.search_by_nome_prefix("ANTONIO")} == {"Antônio Santos Lima"}
+
+
+def test_declared_indexes_match_scans_and_stay_consistent():
+    random.seed(5)
+    records = StudentDataGenerator().generate_dataset(1500)
+    system = StudentRegistrationSystem(indexes=[IndexDefinition('status'),
+                                                IndexDefinition('cpf', unique=True),
+                                                IndexDefinition('data_ingresso', kind='sorted')])
+    for record in records[:1000]:
+        system.add_record(record)
+    # Declarado depois da carga: construído em lote
+    system.create_index('nivel', kind='sorted')
+    for record in records[1000:]:
+        system.add_record(record)
+    
+    for field, value in [('status', 'Ativo'), ('nivel', 'Mestrado'), ('cpf', records[1200].cpf)]:
+        assert {r.matricula for r in system.find(field, value)} == \
+               {r.matricula for r in records if getattr(r, field) == value}
+    in_2020 = system.find_range('data_ingresso', '2020-01-01', '2020-12-31')
+    assert len(in_2020) == sum(1 for r in records if r.data_ingresso.startswith('2020'))
+    
+    # Índice hash, índice ordenado e varredura devolvem cursores, nunca a lista do índice
+    for field in ('status', 'nivel', 'cargo'):
+        found = system.find(field, getattr(records[0], field))
+        assert isinstance(found, Cursor) and not isinstance(found, list)
+    ativos = system.find('status', 'Ativo').count()
+    system.find('status', 'Ativo').to_list().clear()
+    assert system.find('status', 'Ativo').count() == ativos
+    
+    duplicate = StudentDataGenerator().generate_dataset(1)[0]
+    duplicate.cpf = records[0].cpf
+    try:
+        system.add_record(duplicate)
+        assert False, "CPF duplicado deveria ser rejeitado"
+    except ValueError:
+        pass
+    assert len(system.records) == 1500
+    
+    for field in ('status', 'nivel'):
+        system.secondary_indexes[field].remove(records[0])
+    assert records[0] not in list(system.find('nivel', records[0].nivel))
+    memory = system.index_memory()
+    assert memory['status_hash'] > 0 and memory['nivel_sorted'] > 0
+
+
+def test_query_planner_matches_scan_and_picks_cheap_strategies():
+    random.seed(3)
+    records = StudentDataGenerator().generate_dataset(3000)
+    system = StudentRegistrationSystem(indexes=BENCHMARK_INDEXES)
+    for record in records:
+        system.add_record(record)
+    
+    sample = records[7]
+    queries = [
+        {'status': 'Ativo', 'nivel': sample.nivel},
+        {'codigo_setor': sample.codigo_setor, 'status': sample.status},
+        {'cargo': sample.cargo, 'salario': (sample.salario - 500, sample.salario + 500)},
+        {'codigo_setor': sample.codigo_setor, 'cargo': sample.cargo, 'nivel': sample.nivel},
+        {'telefone': sample.telefone, 'status': sample.status},
+        {'salario': (0, 10 ** 9)},
+    ]
+    for predicates in queries:
+        expected = {r.matricula for r in records
+                    if all(v[0] <= getattr(r, f) <= v[1] if isinstance(v, tuple) else getattr(r, f) == v
+                           for f, v in predicates.items())}
+        assert {r.matricula for r in system.query(**predicates)} == expected, predicates
+    
+    # Índice composto cobre os dois predicados: sem interseção nem filtro
+    plan = system.explain(codigo_setor=sample.codigo_setor, status=sample.status)
+    assert plan.strategy == 'index' and not plan.residual
+    plan = system.explain(cargo=sample.cargo, salario=(1000, 2000))
+    assert plan.paths[0].name == 'cargo+salario_sorted'
+    # Campo sem índice: varredura completa
+    assert system.explain(telefone=sample.telefone).strategy == 'full_scan'
+    assert all(cost >= plan.estimated_cost for cost in plan.alternatives.values())
+
+
+def test_bitmap_index_combines_predicates_and_counts():
+    system, records = _system()
+    ativo = system.bitmap('status', 'Ativo')
+    mestrado = system.bitmap('nivel', 'Mestrado')
+    monitor = system.bitmap('cargo', 'Monitor')
+    
+    expected = [r for r in records if r.status == 'Ativo' and r.nivel == 'Mestrado' and r.cargo != 'Monitor']
+    combined = ativo & mestrado & ~monitor
+    assert len(combined) == len(expected)
+    assert combined.to_list() == expected  # Ordem de inserção
+    assert len(ativo | mestrado) == sum(1 for r in records if r.status == 'Ativo' or r.nivel == 'Mestrado')
+    assert len(~ativo) + len(ativo) == len(records)
+    assert len(system.bitmap('status', 'Inexistente')) == 0
+    
+    stats = system.get_statistics()
+    for field, key in [('codigo_setor', 'sector_distribution'), ('status', 'status_distribution'),
+                       ('cargo', 'position_distribution'), ('nivel', 'level_distribution')]:
+        counts = {}
+        for r in records:
+            counts[getattr(r, field)] = counts.get(getattr(r, field), 0) + 1
+        assert stats[key] == counts
+    
+    # Remoção desliga os bits; inserções posteriores entram nos bitmaps
+    system.bitmap_index.remove(records[0])
+    assert len(system.bitmap('status', records[0].status)) == stats['status_distribution'][records[0].status] - 1
+    extra = StudentDataGenerator().generate_dataset(5)
+    for record in extra:
+        record.status = 'Ativo'
+        system.add_record(record)
+    assert system.bitmap('status', 'Ativo').to_list()[-5:] == extra
+    
+    plan = system.explain(status='Ativo', nivel='Mestrado')
+    assert plan.paths[0].name == 'status+nivel_bitmap'
+    assert system.query(status='Ativo', nivel='Mestrado') == \
+        (system.bitmap('status', 'Ativo') & system.bitmap('nivel', 'Mestrado')).to_list()
+
+
+def test_update_and_delete_keep_indexes_consistent():
+    random.seed(8)
+    records = StudentDataGenerator().generate_dataset(1500)
+    system = StudentRegistrationSystem(indexes=BENCHMARK_INDEXES)
+    for record in records:
+        system.add_record(record)
+    
+    for i, record in enumerate(random.sample(records, 600)):
+        if i % 3 == 0:
+            system.delete_record(record.matricula)
+        elif i % 3 == 1:
+            system.update_record(record.matricula, salario=record.salario + 1000, status='Afastado')
+        else:
+            system.update_record(record.matricula, codigo_setor=1007, nome='Ana Costa Lima', cargo='Monitor')
+    
+    live = system.records
+    assert len(live) == 1300 and len(system.hash_table_matricula) == 1300
+    
+    def same(found, expected):
+        assert sorted(r.matricula for r in found) == sorted(r.matricula for r in expected)
+    
+    same(system.search_by_setor(1007), [r for r in live if r.codigo_setor == 1007])
+    setores = system.hash_table_setor
+    assert sum(len(rows) for rows in setores.values()) == 1300
+    same(setores[1007], [r for r in live if r.codigo_setor == 1007])
+    same(system.search_by_salary_range(5000, 9000), [r for r in live if 5000 <= r.salario <= 9000])
+    same(system.search_by_nome('ana costa'), [r for r in live if 'ana costa' in fold_text(r.nome)])
+    same(system.search_by_nome_prefix('ana costa'), [r for r in live if r.nome.startswith('Ana Costa')])
+    same(system.find('status', 'Afastado'), [r for r in live if r.status == 'Afastado'])
+    same(system.query(codigo_setor=1007, status='Afastado'),
+         [r for r in live if r.codigo_setor == 1007 and r.status == 'Afastado'])
+    same(system.bitmap('cargo', 'Monitor').to_list(), [r for r in live if r.cargo == 'Monitor'])
+    assert sum(system.get_statistics()['status_distribution'].values()) == 1300
+    
+    try:
+        system.update_record(live[0].matricula, cpf=live[1].cpf)
+        assert False, "CPF duplicado deveria ser rejeitado"
+    except ValueError:
+        pass
+    assert system.search_by_cpf_hash(live[0].cpf) is live[0]
+    try:
+        system.delete_record(records[0].matricula if records[0] not in live else '000000000')
+        assert False, "Matrícula inexistente deveria levantar KeyError"
+    except KeyError:
+        pass
+
+
+def test_incremental_statistics_match_recomputation():
+    system, records = _system(3000, seed=13)
+    for i, record in enumerate(records[:900]):
+        if i % 3 == 0:
+            system.delete_record(record.matricula)
+        elif i % 3 == 1:
+            system.update_record(record.matricula, salario=record.salario * 1.5, cargo='Monitor')
+        else:
+            system.update_record(record.matricula, status='Licença', codigo_setor=1001)
+    # Remove os extremos para exercitar a remoção preguiçosa dos heaps
+    by_salary = sorted(system.records, key=lambda r: r.salario)
+    system.delete_record(by_salary[0].matricula)
+    system.delete_record(by_salary[-1].matricula)
+    
+    stats = system.get_statistics()
+    expected = system.compute_statistics()
+    assert stats['total_records'] == expected['total_records'] == 2698
+    for key in ('sector_distribution', 'status_distribution', 'position_distribution', 'level_distribution'):
+        assert stats[key] == expected[key]
+    salary, expected_salary = stats['salary_stats'], expected['salary_stats']
+    assert salary['min'] == expected_salary['min'] and salary['max'] == expected_salary['max']
+    assert abs(salary['mean'] - expected_salary['mean']) < 1e-6 * expected_salary['mean']
+    assert abs(salary['std'] - expected_salary['std']) < 1e-6 * expected_salary['std']
+    # Mediana do esboço: erro relativo de até 1%
+    assert abs(salary['median'] - expected_salary['median']) <= 0.011 * expected_salary['median']
+    assert StudentRegistrationSystem().get_statistics() == {}
+
+
+def test_bulk_load_builds_same_indexes_as_incremental():
+    random.seed(17)
+    records = StudentDataGenerator().generate_dataset(2000)
+    incremental = StudentRegistrationSystem(indexes=BENCHMARK_INDEXES)
+    for record in records:
+        incremental.add_record(record)
+    bulk = StudentRegistrationSystem(indexes=BENCHMARK_INDEXES)
+    bulk.add_records(iter(records[:1500]))
+    bulk.add_records(records[1500:])
+    
+    def matriculas(found):
+        return sorted(r.matricula for r in found)
+    
+    for system in (incremental, bulk):
+        system.flush_indexes()
+    assert bulk.records == incremental.records
+    assert bulk.sorted_by_matricula.keys == incremental.sorted_by_matricula.keys
+    assert bulk.salary_index.keys == incremental.salary_index.keys
+    assert matriculas(bulk.search_by_setor(1007)) == matriculas(incremental.search_by_setor(1007))
+    assert matriculas(bulk.search_by_nome('silva')) == matriculas(incremental.search_by_nome('silva'))
+    assert matriculas(bulk.query(status='Ativo', nivel='Mestrado')) == \
+        matriculas(incremental.query(status='Ativo', nivel='Mestrado'))
+    assert bulk.get_statistics()['status_distribution'] == incremental.get_statistics()['status_distribution']
+    
+    # Lote com CPF repetido é rejeitado sem alterar nada
+    extra = StudentDataGenerator().generate_dataset(300)
+    extra[-1].cpf = records[0].cpf
+    try:
+        bulk.add_records(extra)
+        assert False, "CPF duplicado deveria ser rejeitado"
+    except ValueError:
+        pass
+    assert len(bulk.records) == len(bulk.hash_table_matricula) == 2000
+    
+    # Lote pequeno: inserção registro a registro; remoção continua funcionando
+    bulk.add_records(extra[:5])
+    bulk.delete_record(extra[0].matricula)
+    assert len(bulk.records) == 2004 and bulk.search_by_cpf_hash(extra[0].cpf) is None
+
+
+def test_cursors_paginate_lazily():
+    system, records = _system(3000, seed=19)
+    
+    def all_pages(cursor, size):
+        rows, token = cursor.page(size)
+        pages = [rows]
+        while token is not None:
+            rows, token = cursor.page(size, after=token)
+            pages.append(rows)
+        return [r for page in pages for r in page]
+    
+    # Índice ordenado: paginação por chave (salários repetem e cruzam páginas)
+    for record in records[:40]:
+        system.update_record(record.matricula, salario=5000.0)
+    salary = system.search_by_salary_range(1000, 9000)
+    assert salary.count() == sum(1 for r in records if 1000 <= r.salario <= 9000)
+    assert all_pages(salary, 7) == salary.to_list()
+    assert salary.offset(5).limit(10).to_list() == salary.to_list()[5:15]
+    assert salary[3:8].to_list() == salary.to_list()[3:8] and salary.limit(4).count() == 4
+    
+    first, token = salary.page(25)
+    expected_next = salary.to_list()[25:50]
+    # Inserção em outra chave não invalida o marcador da próxima página
+    extra = StudentDataGenerator().generate_dataset(1)[0]
+    extra.salario = 999.0
+    system.add_record(extra)
+    following, _ = system.search_by_salary_range(1000, 9000).page(25, after=token)
+    assert following == expected_next
+    
+    # Setor: cursor sobre a lista do índice, sem cópia
+    setor = system.search_by_setor(records[0].codigo_setor)
+    expected = [r for r in system.records if r.codigo_setor == records[0].codigo_setor]
+    assert setor.count() == len(expected) and all_pages(setor, 9) == expected
+    assert not isinstance(setor, list)
+    
+    # Varredura linear: preguiçosa, com contagem sem materializar
+    nome = system.search_by_nome_linear('ana')
+    expected = [r for r in system.records if 'ana' in r.nome.lower()]
+    assert nome.count() == len(expected) and all_pages(nome, 11) == expected
+    assert nome.offset(3).limit(5).to_list() == expected[3:8]
+    assert nome.page(5)[0] == expected[:5]
+    assert not system.search_by_nome_linear('xyz') and system.search_by_nome_linear('xyz').page(5) == ([], None)
+    
+    # offset/limit valem para todas as páginas, em qualquer tipo de cursor
+    assert nome.limit(5).page(10) == (expected[:5], None)
+    for cursor in [nome, system.search_by_setor(records[0].codigo_setor),
+                   system.search_by_salary_range(1000, 9000)]:
+        rows = cursor.to_list()
+        assert all_pages(cursor.offset(2).limit(9), 4) == rows[2:11]
+        assert all_pages(cursor.limit(8), 4) == rows[:8]
+
+
+if __name__ == "__main__":
+    test_salary_range_index_matches_linear_scan()
+    test_trigram_index_finds_substrings_ignoring_accents()
+    test_prefix_searches_use_sorted_indexes()
+    test_declared_indexes_match_scans_and_stay_consistent()
+    test_query_planner_matches_scan_and_picks_cheap_strategies()
+    test_bitmap_index_combines_predicates_and_counts()
+    test_update_and_delete_keep_indexes_consistent()
+    test_incremental_statistics_match_recomputation()
+    test_bulk_load_builds_same_indexes_as_incremental()
+    test_cursors_paginate_lazily()
+    print("Todos os testes passaram.")
@@ -41,6 +41,7 @@ Execução:
 #include <unordered_map>
 #include <unordered_set>
 #include <iterator>
+#include <stdexcept>
 #include <sys/resource.h>
 
 // ================================================================================
@@ -162,6 +163,49 @@ public:
         std::cout << "✓ " << n << " registros gerados com sucesso" << std::endl;
         return records;
     }
+    
+    // Carrega registros exportados por cross_impl.py (matricula,nome,salario,codigo_setor)
+    static std::vector<Record> loadRecords(const std::string& filename) {
+        std::ifstream file(filename);
+        if (!file) {
+            throw std::runtime_error("Não foi possível abrir " + filename);
+        }
+        
+        std::vector<Record> records;
+        std::string line;
+        std::getline(file, line); // Cabeçalho
+        
+        while (std::getline(file, line)) {
+            if (line.empty()) continue;
+            std::stringstream ss(line);
+            std::string matricula, nome, salario, setor;
+            std::getline(ss, matricula, ',');
+            std::getline(ss, nome, ',');
+            std::getline(ss, salario, ',');
+            std::getline(ss, setor, ',');
+            records.emplace_back(std::stoi(matricula), nome, std::stod(salario), std::stoi(setor));
+        }
+        
+        std::cout << "✓ " << records.size() << " registros carregados de " << filename << std::endl;
+        return records;
+    }
+    
+    // Carrega as chaves de busca compartilhadas (uma matrícula por linha)
+    static std::vector<int> loadKeys(const std::string& filename) {
+        std::ifstream file(filename);
+        if (!file) {
+            throw std::runtime_error("Não foi possível abrir " + filename);
+        }
+        
+        std::vector<int> keys;
+        std::string line;
+        std::getline(file, line); // Cabeçalho
+        
+        while (std::getline(file, line)) {
+            if (!line.empty()) keys.push_back(std::stoi(line));
+        }
+        return keys;
+    }
 };
 
 // ================================================================================
@@ -216,21 +260,24 @@ private:
     mutable long iterations;
     size_t size_count;
     
-    std::unique_ptr<BSTNode>& insertRecursive(std::unique_ptr<BSTNode>& node, const Record& record) {
+    // Conta só os nós existentes visitados (o encaixe na posição vazia não
+    // conta), como em binary_search_tree.py
+    void insertRecursive(std::unique_ptr<BSTNode>& node, const Record& record) {
         iterations++;
         
-        if (!node) {
-            node = std::make_unique<BSTNode>(record);
-            return node;
-        }
-        
         if (record.matricula < node->record.matricula) {
-            insertRecursive(node->left, record);
+            if (!node->left) {
+                node->left = std::make_unique<BSTNode>(record);
+            } else {
+                insertRecursive(node->left, record);
+            }
         } else if (record.matricula > node->record.matricula) {
-            insertRecursive(node->right, record);
+            if (!node->right) {
+                node->right = std::make_unique<BSTNode>(record);
+            } else {
+                insertRecursive(node->right, record);
+            }
         }
-        
-        return node;
     }
     
     Record* searchRecursive(const std::unique_ptr<BSTNode>& node, int matricula) const {
@@ -257,7 +304,12 @@ public:
     
     long insert(const Record& record) {
         iterations = 0;
-        insertRecursive(root, record);
+        if (!root) {
+            root = std::make_unique<BSTNode>(record);
+            iterations = 1;
+        } else {
+            insertRecursive(root, record);
+        }
         size_count++;
         return iterations;
     }
@@ -581,6 +633,22 @@ private:
     MetricsCollector collector;
     std::vector<ExperimentResult> results;
     std::mt19937 gen;
+    std::string dataset_dir;
+    
+    // Chaves de busca: arquivo compartilhado ou amostra aleatória dos dados
+    std::vector<int> searchKeys(const std::vector<Record>& data, int size) {
+        if (!dataset_dir.empty()) {
+            return DataGenerator::loadKeys(dataset_dir + "/search_keys_" + std::to_string(size) + ".csv");
+        }
+        std::vector<Record> search_sample;
+        sample_records(data.begin(), data.end(), std::back_inserter(search_sample), 
+                      std::min(1000, static_cast<int>(data.size())), gen);
+        std::vector<int> keys;
+        for (const auto& record : search_sample) {
+            keys.push_back(record.matricula);
+        }
+        return keys;
+    }
     
     void runLinearArrayExperiment(const std::vector<Record>& data, int size) {
         std::cout << "  Array Linear..." << std::endl;
@@ -605,19 +673,17 @@ private:
             insert_result.rounds.push_back(insert_metrics);
             
             // Busca
-            std::vector<Record> search_sample;
-            sample_records(data.begin(), data.end(), std::back_inserter(search_sample), 
-                          std::min(1000, static_cast<int>(data.size())), gen);
+            std::vector<int> search_keys = searchKeys(data, size);
             
             collector.startMeasurement();
             total_iterations = 0;
             
-            for (const auto& record : search_sample) {
-                auto result = array.search(record.matricula);
+            for (int matricula : search_keys) {
+                auto result = array.search(matricula);
                 total_iterations += result.second;
             }
             
-            PerformanceMetrics search_metrics = collector.stopMeasurement(total_iterations / search_sample.size());
+            PerformanceMetrics search_metrics = collector.stopMeasurement(total_iterations);
             search_result.rounds.push_back(search_metrics);
         }
         
@@ -637,9 +703,11 @@ private:
         search_result.parameters["balanced"] = "false";
         
         for (int round = 0; round < num_rounds; ++round) {
-            // Embaralha dados
+            // Embaralha dados (com dataset compartilhado a ordem do arquivo é mantida)
             std::vector<Record> shuffled_data = data;
-            std::shuffle(shuffled_data.begin(), shuffled_data.end(), gen);
+            if (dataset_dir.empty()) {
+                std::shuffle(shuffled_data.begin(), shuffled_data.end(), gen);
+            }
             
             // Inserção
             BinarySearchTree bst;
@@ -655,19 +723,17 @@ private:
             insert_result.rounds.push_back(insert_metrics);
             
             // Busca
-            std::vector<Record> search_sample;
-            sample_records(data.begin(), data.end(), std::back_inserter(search_sample), 
-                          std::min(1000, static_cast<int>(data.size())), gen);
+            std::vector<int> search_keys = searchKeys(data, size);
             
             collector.startMeasurement();
             total_iterations = 0;
             
-            for (const auto& record : search_sample) {
-                auto result = bst.search(record.matricula);
+            for (int matricula : search_keys) {
+                auto result = bst.search(matricula);
                 total_iterations += result.second;
             }
             
-            PerformanceMetrics search_metrics = collector.stopMeasurement(total_iterations / search_sample.size());
+            PerformanceMetrics search_metrics = collector.stopMeasurement(total_iterations);
             search_result.rounds.push_back(search_metrics);
         }
         
@@ -687,9 +753,11 @@ private:
         search_result.parameters["balanced"] = "true";
         
         for (int round = 0; round < num_rounds; ++round) {
-            // Embaralha dados
+            // Embaralha dados (com dataset compartilhado a ordem do arquivo é mantida)
             std::vector<Record> shuffled_data = data;
-            std::shuffle(shuffled_data.begin(), shuffled_data.end(), gen);
+            if (dataset_dir.empty()) {
+                std::shuffle(shuffled_data.begin(), shuffled_data.end(), gen);
+            }
             
             // Inserção
             AVLTree avl;
@@ -705,19 +773,17 @@ private:
             insert_result.rounds.push_back(insert_metrics);
             
             // Busca
-            std::vector<Record> search_sample;
-            sample_records(data.begin(), data.end(), std::back_inserter(search_sample), 
-                          std::min(1000, static_cast<int>(data.size())), gen);
+            std::vector<int> search_keys = searchKeys(data, size);
             
             collector.startMeasurement();
             total_iterations = 0;
             
-            for (const auto& record : search_sample) {
-                auto result = avl.search(record.matricula);
+            for (int matricula : search_keys) {
+                auto result = avl.search(matricula);
                 total_iterations += result.second;
             }
             
-            PerformanceMetrics search_metrics = collector.stopMeasurement(total_iterations / search_sample.size());
+            PerformanceMetrics search_metrics = collector.stopMeasurement(total_iterations);
             search_result.rounds.push_back(search_metrics);
         }
         
@@ -756,19 +822,17 @@ private:
             insert_result.rounds.push_back(insert_metrics);
             
             // Busca
-            std::vector<Record> search_sample;
-            sample_records(data.begin(), data.end(), std::back_inserter(search_sample), 
-                          std::min(1000, static_cast<int>(data.size())), gen);
+            std::vector<int> search_keys = searchKeys(data, size);
             
             collector.startMeasurement();
             total_iterations = 0;
             
-            for (const auto& record : search_sample) {
-                auto result = hash_table.search(record.matricula);
+            for (int matricula : search_keys) {
+                auto result = hash_table.search(matricula);
                 total_iterations += result.second;
             }
             
-            PerformanceMetrics search_metrics = collector.stopMeasurement(total_iterations / search_sample.size());
+            PerformanceMetrics search_metrics = collector.stopMeasurement(total_iterations);
             search_result.rounds.push_back(search_metrics);
         }
         
@@ -777,8 +841,8 @@ private:
     }
     
 public:
-    ExperimentRunner(const std::vector<int>& sizes, int rounds) 
-        : data_sizes(sizes), num_rounds(rounds), gen(42) {}
+    ExperimentRunner(const std::vector<int>& sizes, int rounds, const std::string& dataset = "") 
+        : data_sizes(sizes), num_rounds(rounds), gen(42), dataset_dir(dataset) {}
     
     void runAllExperiments() {
         std::cout << "\n" << std::string(80, '=') << std::endl;
@@ -790,8 +854,10 @@ public:
             std::cout << std::setw(35) << ("Tamanho do Dataset: " + std::to_string(size) + " registros") << std::endl;
             std::cout << std::string(60, '=') << std::endl;
             
-            // Gera dados para este tamanho
-            auto data = DataGenerator::generateRecords(size, 42);
+            // Gera dados para este tamanho (ou carrega o dataset compartilhado)
+            auto data = dataset_dir.empty()
+                ? DataGenerator::generateRecords(size, 42)
+                : DataGenerator::loadRecords(dataset_dir + "/dataset_" + std::to_string(size) + ".csv");
             
             // Executa experimentos
             runLinearArrayExperiment(data, size);
@@ -822,7 +888,7 @@ public:
             file << result.structure_name << ",";
             file << result.data_size << ",";
             file << result.operation << ",";
-            file << std::fixed << std::setprecision(6) << stats.execution_time << ",";
+            file << std::fixed << std::setprecision(9) << stats.execution_time << ",";
             file << std::fixed << std::setprecision(3) << stats.memory_usage_mb << ",";
             file << stats.iterations << ",";
             
@@ -840,7 +906,7 @@ public:
                 }
                 file << ",";
             } else {
-                file << ",,,,,,,";
+                file << ",,,,,,";
                 if (result.structure_name == "BST" || result.structure_name == "AVL") {
                     file << result.parameters.at("balanced") << ",";
                     if (!result.rounds.empty()) {
@@ -880,7 +946,7 @@ public:
                     detailed_file << round.max_chain_length << ",";
                     detailed_file << ",";
                 } else {
-                    detailed_file << ",,,,,,,";
+                    detailed_file << ",,,,,,";
                     if (result.structure_name == "BST" || result.structure_name == "AVL") {
                         detailed_file << result.parameters.at("balanced") << ",";
                         detailed_file << round.tree_height;
@@ -917,16 +983,47 @@ void printHeader() {
     std::cout << std::string(80, '-') << std::endl;
 }
 
-int main() {
+// Converte "1000,5000,10000" em lista de tamanhos
+std::vector<int> parseSizes(const std::string& arg) {
+    std::vector<int> sizes;
+    std::stringstream ss(arg);
+    std::string item;
+    while (std::getline(ss, item, ',')) {
+        if (!item.empty()) sizes.push_back(std::stoi(item));
+    }
+    return sizes;
+}
+
+int main(int argc, char* argv[]) {
     try {
         printHeader();
         
         // Configuração dos experimentos
         std::vector<int> data_sizes = {1000, 5000, 10000};
         int num_rounds = 5;
+        std::string dataset_dir;
+        std::string output = "experiment_results.csv";
+        std::string details = "experiment_details.csv";
+        
+        // Argumentos opcionais (usados por cross_impl.py)
+        //   --dataset-dir DIR  usa dataset_<N>.csv e search_keys_<N>.csv exportados
+        //   --sizes A,B,C      tamanhos dos datasets
+        //   --rounds R         rodadas por experimento
+        //   --output ARQ       arquivo de resumo
+        //   --details ARQ      arquivo detalhado
+        for (int i = 1; i + 1 < argc; i += 2) {
+            std::string flag = argv[i];
+            std::string value = argv[i + 1];
+            if (flag == "--dataset-dir") dataset_dir = value;
+            else if (flag == "--sizes") data_sizes = parseSizes(value);
+            else if (flag == "--rounds") num_rounds = std::stoi(value);
+            else if (flag == "--output") output = value;
+            else if (flag == "--details") details = value;
+            else throw std::runtime_error("Argumento desconhecido: " + flag);
+        }
         
         // Cria executor de experimentos
-        ExperimentRunner runner(data_sizes, num_rounds);
+        ExperimentRunner runner(data_sizes, num_rounds, dataset_dir);
         
         // Executa experimentos
         std::cout << "\nIniciando experimentos..." << std::endl;
@@ -935,7 +1032,7 @@ int main() {
         runner.runAllExperiments();
         
         // Salva resultados
-        runner.saveResults();
+        runner.saveResults(output, details);
         
         std::cout << "\n" << std::string(80, '=') << std::endl;
         std::cout << std::setw(45) << "EXPERIMENTO CONCLUÍDO COM SUCESSO" << std::endl;
@@ -0,0 +1,111 @@
+"""
+Linha do tempo de fases no formato Chrome trace-event.
+
+Spans (eventos "X") marcam as fases da execução — geração de dados, construção
+de cada estrutura, rodadas de inserção/busca, gráficos e gravação de JSON — e
+um contador (evento "C") registra o RSS do processo na entrada e saída de cada
+span. O arquivo gerado abre em chrome://tracing, Perfetto ou speedscope.
+
+O rastreador global começa desligado; desligado, ``span`` devolve um contexto
+vazio e não lê relógio nem memória.
+"""
+
+import os
+import json
+import time
+import functools
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional
+import psutil
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False, record_rss: bool = True):
+        self.enabled = enabled
+        self.record_rss = record_rss
+        self.events: List[Dict[str, Any]] = []
+        self._pid = os.getpid()
+        self._process = psutil.Process(self._pid)
+        self._origin = time.perf_counter()
+        self._named_threads = set()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self.events = []
+        self._named_threads = set()
+        self._origin = time.perf_counter()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def _tid(self) -> int:
+        tid = threading.get_ident()
+        if tid not in self._named_threads:
+            self._named_threads.add(tid)
+            self.events.append({'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid,
+                                'args': {'name': threading.current_thread().name}})
+        return tid
+
+    def counter(self, name: str, **values: float):
+        """Amostra de uma trilha de contador (uma série por chave de ``values``)."""
+        if self.enabled:
+            self.events.append({'name': name, 'ph': 'C', 'ts': self._now_us(),
+                                'pid': self._pid, 'tid': self._tid(), 'args': values})
+
+    def _rss_sample(self):
+        if self.record_rss:
+            self.counter('memória', rss_mb=self._process.memory_info().rss / 1024 / 1024)
+
+    def instant(self, name: str, cat: str = 'marker', **args):
+        if self.enabled:
+            self.events.append({'name': name, 'cat': cat, 'ph': 'i', 's': 't', 'ts': self._now_us(),
+                                'pid': self._pid, 'tid': self._tid(), 'args': args})
+
+    @contextmanager
+    def _span(self, name: str, cat: str, args: Dict[str, Any]):
+        self._rss_sample()
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            end = self._now_us()
+            self.events.append({'name': name, 'cat': cat, 'ph': 'X', 'ts': start, 'dur': end - start,
+                                'pid': self._pid, 'tid': self._tid(),
+                                'args': {k: str(v) if not isinstance(v, (int, float)) else v
+                                         for k, v in args.items()}})
+            self._rss_sample()
+
+    def span(self, name: str, cat: str = 'experiment', **args):
+        """Contexto que registra a duração de uma fase."""
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, cat, args)
+
+    def save(self, filename: str = "trace.json"):
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+        print(f"Trace salvo em: {filename} (abrir em chrome://tracing ou ui.perfetto.dev)")
+
+
+TRACER = Tracer()
+
+
+def traced(name: Optional[str] = None, cat: str = 'experiment'):
+    """Decorador que envolve a função num span do rastreador global."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with TRACER.span(span_name, cat):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,123 @@
+import random
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Sequence
+from models import Record
+
+
+class SearchWorkload:
+    """Gerador de chaves de busca para as fases de busca dos experimentos.
+
+    Distribuições suportadas:
+      - 'uniform': chaves existentes escolhidas uniformemente (comportamento original)
+      - 'zipf': popularidade Zipfiana, matrículas mais recentes (maiores) são as mais acessadas
+      - 'sequential': varredura de chaves consecutivas em ordem de matrícula
+      - 'temporal': localidade temporal, reacessa chaves de uma janela recente
+
+    Em todas as distribuições, uma fração ``miss_ratio`` das buscas usa chaves
+    inexistentes no conjunto de dados.
+    """
+
+    DISTRIBUTIONS = ('uniform', 'zipf', 'sequential', 'temporal')
+
+    def __init__(self, distribution: str = 'uniform', miss_ratio: float = 0.0,
+                 zipf_s: float = 1.0, locality: float = 0.8, window: int = 32,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            distribution: Uma das distribuições em ``DISTRIBUTIONS``
+            miss_ratio: Fração (0 a 1) de buscas por chaves inexistentes
+            zipf_s: Expoente da distribuição Zipf (maior = mais concentrada)
+            locality: Probabilidade de reacessar uma chave recente ('temporal')
+            window: Quantidade de chaves recentes consideradas ('temporal')
+            seed: Semente própria; se None, usa o estado global de ``random``
+        """
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Distribuição desconhecida: {distribution}")
+        if not 0.0 <= miss_ratio <= 1.0:
+            raise ValueError("miss_ratio deve estar entre 0 e 1")
+
+        self.distribution = distribution
+        self.miss_ratio = miss_ratio
+        self.zipf_s = zipf_s
+        self.locality = locality
+        self.window = max(1, window)
+        self.rng = random.Random(seed) if seed is not None else random
+
+    def describe(self) -> Dict[str, Any]:
+        """Parâmetros do workload, usados para identificar os resultados."""
+        params = {'workload': self.distribution, 'miss_ratio': self.miss_ratio}
+        if self.distribution == 'zipf':
+            params['zipf_s'] = self.zipf_s
+        elif self.distribution == 'temporal':
+            params['locality'] = self.locality
+            params['window'] = self.window
+        return params
+
+    def generate_keys(self, data: Sequence[Record], n: int) -> List[int]:
+        """Gera ``n`` matrículas a buscar sobre o conjunto ``data``."""
+        if not data or n <= 0:
+            return []
+
+        if self.distribution == 'uniform':
+            keys = self._uniform_keys(data, n)
+        elif self.distribution == 'zipf':
+            keys = self._zipf_keys(data, n)
+        elif self.distribution == 'sequential':
+            keys = self._sequential_keys(data, n)
+        else:
+            keys = self._temporal_keys(data, n)
+
+        if self.miss_ratio > 0:
+            keys = self._inject_misses(data, keys)
+        return keys
+
+    def _uniform_keys(self, data: Sequence[Record], n: int) -> List[int]:
+        # Mantém o comportamento original (amostra sem reposição) quando possível
+        if n <= len(data):
+            return [r.matricula for r in self.rng.sample(data, n)]
+        return [r.matricula for r in self.rng.choices(data, k=n)]
+
+    def _zipf_keys(self, data: Sequence[Record], n: int) -> List[int]:
+        # Rank 1 = matrícula mais recente (maior valor)
+        ranked = sorted((r.matricula for r in data), reverse=True)
+        cum_weights = list(accumulate(1.0 / (rank ** self.zipf_s)
+                                      for rank in range(1, len(ranked) + 1)))
+        return self.rng.choices(ranked, cum_weights=cum_weights, k=n)
+
+    def _sequential_keys(self, data: Sequence[Record], n: int) -> List[int]:
+        ordered = sorted(r.matricula for r in data)
+        start = self.rng.randrange(len(ordered))
+        return [ordered[(start + i) % len(ordered)] for i in range(n)]
+
+    def _temporal_keys(self, data: Sequence[Record], n: int) -> List[int]:
+        keys: List[int] = []
+        for _ in range(n):
+            if keys and self.rng.random() < self.locality:
+                recent = keys[-self.window:]
+                keys.append(self.rng.choice(recent))
+            else:
+                keys.append(self.rng.choice(data).matricula)
+        return keys
+
+    def _inject_misses(self, data: Sequence[Record], keys: List[int]) -> List[int]:
+        """Substitui uma fração das chaves por matrículas inexistentes."""
+        existing = set(r.matricula for r in data)
+        low, high = min(existing), max(existing)
+        num_misses = round(len(keys) * self.miss_ratio)
+        positions = self.rng.sample(range(len(keys)), num_misses)
+
+        # Se o intervalo estiver saturado, usa chaves acima da maior matrícula
+        dense = (high - low + 1) - len(existing) < num_misses
+        next_outside = high + 1
+
+        for pos in positions:
+            if dense:
+                keys[pos] = next_outside
+                next_outside += 1
+                continue
+            candidate = self.rng.randint(low, high)
+            while candidate in existing:
+                candidate = self.rng.randint(low, high)
+            keys[pos] = candidate
+        return keys
+